@@ -0,0 +1,451 @@
+"""
+Load and latency benchmark for the auth, jobs and analytics APIs.
+
+Seeds a database at the requested scale (users x jobs, with a share of jobs
+carrying feedback and up to four status-history dates each), serves the app
+from a local threaded server and drives every route of the three blueprints
+with concurrent keep-alive clients. Prints p50/p95/p99 latency per endpoint
+and the run's total throughput as JSON. With --baseline the run is compared against an earlier
+result and the exit status is 1 when any endpoint regressed.
+
+    python benchmark.py --users 20 --jobs 200 --requests 200 --concurrency 8 \\
+        --output results.json --baseline benchmarks/baseline.json
+"""
+import argparse
+import http.client
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import select
+from werkzeug.security import generate_password_hash
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+import migrations
+from app import create_app
+from config import Config
+from extensions import db
+from importer import import_records
+from models import Feedback, FeedbackCategory, JobApplication, QuestionBank, User
+from pool import engine_options
+from reference import LOADERS, bump_reference_version
+
+BENCHMARK_BLUEPRINTS = ('auth', 'jobs', 'analytics')
+PASSWORD = "benchmark-password"
+ROLES = ('Engineering', 'Data', 'Design', 'Product', 'Operations')
+STRENGTHS = ('Python', 'SQL', 'Communication', 'Teamwork', 'System design', 'Testing', 'Ownership')
+IMPROVEMENTS = ('Communication', 'Time management', 'Technical depth', 'Leadership', 'Estimation')
+CATEGORIES = ((100, 'General', 'neutral'), (1, 'Technical', 'negative'), (2, 'Culture fit', 'positive'))
+STAGES = ('interview', 'offer', 'accepted')
+BANK_SIZE = 50
+DEFAULT_TOLERANCE = 0.2
+
+
+class BenchUser:
+    def __init__(self, user_id, username, token):
+        self.id = user_id
+        self.username = username
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.jobs = []
+        self.with_feedback = deque()
+        self.without_feedback = deque()
+        self.disposable = deque()
+
+
+def _job_record(rng, index, feedback_share, history_depth):
+    applied = date(2024, 1, 1) + timedelta(days=rng.randrange(365))
+    record = {
+        "job_title": f"Engineer {index}",
+        "company": f"Company {rng.randrange(200)}",
+        "role_category": rng.choice(ROLES),
+        "status": "applied",
+        "applied_date": applied.isoformat(),
+        "general_notes": "Seeded by benchmark.py",
+    }
+    stage_date = applied
+    for status in (('interview', 'offer', 'accepted', 'rejected')[:rng.randint(0, history_depth)]):
+        stage_date += timedelta(days=rng.randint(1, 21))
+        record[f"{status}_date"] = stage_date.isoformat()
+        record["status"] = status
+    if rng.random() < feedback_share:
+        record.update(
+            feedback_category=rng.choice(CATEGORIES)[1],
+            feedback_notes=rng.choice(("Good call", "Needs work", "Strong", "")),
+            priority_strength=rng.choice(STRENGTHS),
+            strengths=";".join(rng.sample(STRENGTHS, 2)),
+            priority_improvement=rng.choice(IMPROVEMENTS),
+            improvements=";".join(rng.sample(IMPROVEMENTS, 2)),
+        )
+    return record
+
+
+def seed(users, jobs, feedback_share, history_depth, disposable, rng):
+    """
+    Create users, reference data and their jobs through the importer, so the
+    summary, rollup and term tables are filled exactly as in production.
+    Runs inside an app context; returns the BenchUser list.
+    """
+    db.session.add_all([FeedbackCategory(id=i, name=name, type=kind) for i, name, kind in CATEGORIES])
+    db.session.add_all([QuestionBank(question_text=f"Benchmark question {i}?", category=rng.choice(ROLES))
+                        for i in range(BANK_SIZE)])
+    password_hash = generate_password_hash(PASSWORD)
+    accounts = [User(username=f"bench{i}", email=f"bench{i}@example.com", fullname=f"Bench {i}",
+                     password_hash=password_hash) for i in range(users)]
+    db.session.add_all(accounts)
+    db.session.commit()
+    for name in LOADERS:
+        bump_reference_version(db.session.connection(), name)
+    db.session.commit()
+
+    bench_users = []
+    for account in accounts:
+        records = [_job_record(rng, i, feedback_share, history_depth) for i in range(jobs)]
+        records += [{"job_title": f"Disposable {i}", "company": "Benchmark", "status": "applied"}
+                    for i in range(disposable)]
+        report = import_records(account.id, records)
+        if report["failed"]:
+            raise RuntimeError(f"Seeding failed: {report['errors'][:3]}")
+        user = BenchUser(account.id, account.username, create_access_token(identity=str(account.id)))
+        rows = db.session.execute(
+            select(JobApplication.id, JobApplication.job_title, Feedback.id)
+            .outerjoin(Feedback, Feedback.job_id == JobApplication.id)
+            .where(JobApplication.user_id == account.id)
+        ).fetchall()
+        for job_id, title, feedback_id in rows:
+            if title.startswith("Disposable"):
+                user.disposable.append(job_id)
+                continue
+            user.jobs.append(job_id)
+            (user.with_feedback if feedback_id else user.without_feedback).append(job_id)
+        bench_users.append(user)
+    return bench_users
+
+
+def _feedback_body(rng):
+    return {
+        "category_id": rng.choice(CATEGORIES)[0],
+        "notes": "Benchmark feedback",
+        "strengths": {"priority": rng.choice(STRENGTHS), "additional": rng.sample(STRENGTHS, 2)},
+        "improvements": {"priority": rng.choice(IMPROVEMENTS), "additional": rng.sample(IMPROVEMENTS, 2)},
+    }
+
+
+_signups = itertools.count()
+
+
+def _take(pool):
+    try:
+        return pool.popleft()
+    except IndexError:
+        return None
+
+
+# endpoint -> [(method, builder)]. A builder returns the request for a user as a
+# dict (path plus json or data/content_type, auth=False for public routes, and
+# `done` to run after a 2xx) or None when there is nothing left to act on.
+SCENARIOS = {
+    'auth.signup': [('POST', lambda u, rng: {
+        "path": "/api/auth/signup", "auth": False,
+        "json": {"username": f"signup{next(_signups)}-{rng.random()}", "email": f"s{rng.random()}@example.com",
+                 "password": PASSWORD, "fullname": "Signup"}})],
+    'auth.login': [('POST', lambda u, rng: {
+        "path": "/api/auth/login", "auth": False,
+        "json": {"username_or_email": u.username, "password": PASSWORD}})],
+    'auth.get_current_user': [('GET', lambda u, rng: {"path": "/api/auth/current-user"})],
+    'jobs.create_or_list_jobs': [
+        ('GET', lambda u, rng: {"path": "/api/jobs?limit=20"}),
+        ('POST', lambda u, rng: {"path": "/api/jobs", "json": {
+            "job_title": "Benchmark role", "company": "Benchmark", "role_category": rng.choice(ROLES),
+            "applied_date": "2024-06-01", "interview_date": "2024-06-10"}}),
+    ],
+    'jobs.export_jobs': [('GET', lambda u, rng: {"path": "/api/jobs/export?format=ndjson"})],
+    'jobs.import_jobs': [('POST', lambda u, rng: {
+        "path": "/api/jobs/import?format=csv", "content_type": "text/csv",
+        "data": ("job_title,company,status,applied_date\n"
+                 + "".join(f"Imported {i},Benchmark,applied,2024-03-0{i + 1}\n" for i in range(5))).encode()})],
+    'jobs.get_job': [('GET', lambda u, rng: {
+        "path": f"/api/jobs/{rng.choice(u.jobs)}?include=feedback,strengths,improvements,questions,history"})],
+    'jobs.update_job': [('PUT', lambda u, rng: {"path": f"/api/jobs/{rng.choice(u.jobs)}", "json": {
+        "job_title": "Updated role", "company": "Benchmark", "status": "interview", "interview_date": "2024-07-01"}})],
+    'jobs.delete_job': [('DELETE', lambda u, rng: (lambda job: job and {"path": f"/api/jobs/jobs/{job}"})(
+        _take(u.disposable)))],
+    'jobs.handle_feedback': [
+        ('POST', lambda u, rng: (lambda job: job and {
+            "path": f"/api/jobs/jobs/{job}/feedback", "json": _feedback_body(rng),
+            "done": lambda: u.with_feedback.append(job)})(_take(u.without_feedback))),
+        ('PUT', lambda u, rng: u.with_feedback and {
+            "path": f"/api/jobs/jobs/{rng.choice(u.with_feedback)}/feedback", "json": _feedback_body(rng)}),
+    ],
+    'jobs.delete_feedback': [('DELETE', lambda u, rng: (lambda job: job and {
+        "path": f"/api/jobs/{job}/feedback", "done": lambda: u.without_feedback.append(job)})(
+        _take(u.with_feedback)))],
+    'jobs.get_feedback_categories': [('GET', lambda u, rng: {"path": "/api/jobs/feedback-categories"})],
+    'jobs.get_all_recommended_questions': [('GET', lambda u, rng: {"path": "/api/jobs/recommended-questions"})],
+    'jobs.get_recommended_questions': [('GET', lambda u, rng: {
+        "path": f"/api/jobs/{rng.choice(u.jobs)}/recommended-questions"})],
+    'jobs.save_interview_questions': [('POST', lambda u, rng: {
+        "path": f"/api/jobs/{rng.choice(u.jobs)}/interview-questions",
+        "json": [{"question": f"Benchmark question {rng.randrange(BANK_SIZE)}?", "answer": "Answer"}
+                 for _ in range(3)] + [{"question": "Tell us about a project", "answer": "Answer"}]})],
+    'jobs.get_interview_questions': [('GET', lambda u, rng: {
+        "path": f"/api/jobs/{rng.choice(u.jobs)}/interview-questions"})],
+    'jobs.get_feedback_strengths': [('GET', lambda u, rng: {
+        "path": f"/api/jobs/{rng.choice(u.jobs)}/feedback/strengths"})],
+    'jobs.get_feedback_improvements': [('GET', lambda u, rng: {
+        "path": f"/api/jobs/{rng.choice(u.jobs)}/feedback/improvements"})],
+    'jobs.get_job_status_history': [('GET', lambda u, rng: {
+        "path": f"/api/jobs/{rng.choice(u.jobs)}/status-history"})],
+    'analytics.get_dashboard': [('GET', lambda u, rng: {"path": "/api/analytics/dashboard"})],
+    'analytics.get_status_trends': [('GET', lambda u, rng: {"path": "/api/analytics/status-trends?bucket=week"})],
+    'analytics.get_feedback_insights': [('GET', lambda u, rng: {"path": "/api/analytics/feedback-insights"})],
+    'analytics.get_feedback_insight_details': [('GET', lambda u, rng: {
+        "path": "/api/analytics/feedback-insights/details?limit=20"})],
+    'analytics.get_available_roles': [('GET', lambda u, rng: {"path": "/api/analytics/available-roles"})],
+    'analytics.get_funnel': [('GET', lambda u, rng: {"path": "/api/analytics/funnel"})],
+    'analytics.get_overview': [('GET', lambda u, rng: {"path": "/api/analytics/overview"})],
+}
+
+
+def uncovered_endpoints(app):
+    """Blueprint routes with no scenario, so a new route cannot silently go unbenchmarked."""
+    missing = set()
+    for rule in app.url_map.iter_rules():
+        blueprint = rule.endpoint.split('.')[0]
+        methods = rule.methods - {'HEAD', 'OPTIONS'}
+        if blueprint not in BENCHMARK_BLUEPRINTS or not methods:
+            continue
+        covered = {method for method, _ in SCENARIOS.get(rule.endpoint, [])}
+        missing.update(f"{method} {rule.endpoint}" for method in methods - covered)
+    return sorted(missing)
+
+
+class _KeepAliveHandler(WSGIRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list; None when empty."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(math.ceil(fraction * len(sorted_values)), 1) - 1]
+
+
+def _summarize(samples):
+    # No per-endpoint throughput: every endpoint shares one shuffled run, so
+    # requests / elapsed would be the same number for all of them.
+    endpoints = {}
+    for name, entries in sorted(samples.items()):
+        latencies = sorted(ms for ms, _ in entries)
+        endpoints[name] = {
+            "requests": len(entries),
+            "errors": sum(1 for _, ok in entries if not ok),
+            "mean_ms": round(sum(latencies) / len(latencies), 2),
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+        }
+    return endpoints
+
+
+def drive(host, port, users, requests_per_endpoint, concurrency, rng):
+    """
+    Send `requests_per_endpoint` requests for every scenario, shuffled, from
+    `concurrency` threads each holding one keep-alive connection.
+    Returns ({"METHOD endpoint": [(latency_ms, ok)]}, skipped, elapsed seconds).
+    """
+    plan = [(name, method, builder) for name, scenarios in SCENARIOS.items()
+            for method, builder in scenarios for _ in range(requests_per_endpoint)]
+    rng.shuffle(plan)
+    seeds = [rng.random() for _ in plan]
+    samples = defaultdict(list)
+    skipped = defaultdict(int)
+    lock = threading.Lock()
+    local = threading.local()
+
+    def send(step):
+        (name, method, builder), seed_value = step
+        step_rng = random.Random(seed_value)
+        user = step_rng.choice(users)
+        spec = builder(user, step_rng)
+        key = f"{method} {name}"
+        if not spec:
+            with lock:
+                skipped[key] += 1
+            return
+        headers = dict(user.headers) if spec.get("auth", True) else {}
+        body = spec.get("data")
+        if "json" in spec:
+            body = json.dumps(spec["json"]).encode()
+            headers["Content-Type"] = "application/json"
+        elif body is not None:
+            headers["Content-Type"] = spec["content_type"]
+        if not hasattr(local, "connection"):
+            local.connection = http.client.HTTPConnection(host, port, timeout=60)
+        started = time.perf_counter()
+        try:
+            local.connection.request(method, spec["path"], body=body, headers=headers)
+            response = local.connection.getresponse()
+            response.read()
+            ok = response.status < 400
+        except (http.client.HTTPException, OSError):
+            local.connection.close()
+            del local.connection
+            ok = False
+        latency_ms = (time.perf_counter() - started) * 1000
+        if ok and spec.get("done"):
+            spec["done"]()
+        with lock:
+            samples[key].append((latency_ms, ok))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, zip(plan, seeds)))
+    return samples, dict(skipped), time.perf_counter() - started
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Endpoints whose p95 grew by more than `tolerance` or that gained errors, and
+    a run whose total throughput fell by more than `tolerance`, against the
+    baseline. Returns a list of {endpoint, metric, baseline, current} dicts;
+    the run total is reported as endpoint "total".
+    """
+    regressions = []
+    previous_rps = baseline.get("total", {}).get("throughput_rps")
+    current_rps = results["total"]["throughput_rps"]
+    if previous_rps and current_rps < previous_rps * (1 - tolerance):
+        regressions.append({"endpoint": "total", "metric": "throughput_rps",
+                            "baseline": previous_rps, "current": current_rps})
+    for name, current in results["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append({"endpoint": name, "metric": "p95_ms",
+                                "baseline": previous["p95_ms"], "current": current["p95_ms"]})
+        if current["errors"] > previous["errors"]:
+            regressions.append({"endpoint": name, "metric": "errors",
+                                "baseline": previous["errors"], "current": current["errors"]})
+    return regressions
+
+
+def _app_config(database_url):
+    config = {
+        "SQLALCHEMY_DATABASE_URI": database_url,
+        "JWT_SECRET_KEY": os.environ.get("JWT_SECRET_KEY", "benchmark-secret-key-0123456789abcdef"),
+        "REQUEST_LOG_LEVEL": "ERROR",
+        # The schema does not exist yet; the cache is warmed after seeding instead.
+        "REFERENCE_CACHE_WARM": False,
+    }
+    options = engine_options({**{k: getattr(Config, k) for k in dir(Config) if k.isupper()}, **config})
+    if database_url.startswith("sqlite"):
+        # Writers queue on SQLite's database lock instead of failing straight away.
+        options["connect_args"] = {"timeout": 30, "check_same_thread": False}
+    config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+    return config
+
+
+def run(users=5, jobs=100, feedback=0.6, history=3, requests=50, concurrency=8, seed_value=1, database_url=None):
+    """Seed, serve and drive one benchmark run; returns the JSON-ready result."""
+    rng = random.Random(seed_value)
+    workdir = None
+    if database_url is None:
+        workdir = tempfile.TemporaryDirectory()
+        database_url = f"sqlite:///{os.path.join(workdir.name, 'benchmark.db')}"
+    app = create_app(_app_config(database_url))
+    try:
+        with app.app_context():
+            db.create_all()
+            migrations.upgrade(db.engine)
+            bench_users = seed(users, jobs, feedback, history, disposable=requests, rng=rng)
+            app.extensions['reference_cache'].warm()
+            uncovered = uncovered_endpoints(app)
+
+        server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=_KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            samples, skipped, elapsed = drive("127.0.0.1", server.server_port, bench_users,
+                                              requests, concurrency, rng)
+        finally:
+            server.shutdown()
+        with app.app_context():
+            db.engine.dispose()
+    finally:
+        if workdir is not None:
+            workdir.cleanup()
+
+    all_latencies = sorted(ms for entries in samples.values() for ms, _ in entries)
+    return {
+        "config": {"users": users, "jobs": jobs, "feedback": feedback, "history": history,
+                   "requests_per_endpoint": requests, "concurrency": concurrency, "seed": seed_value,
+                   "database": database_url.split("://")[0]},
+        "elapsed_seconds": round(elapsed, 3),
+        "total": {
+            "requests": len(all_latencies),
+            "throughput_rps": round(len(all_latencies) / elapsed, 2) if elapsed else None,
+            "p50_ms": round(percentile(all_latencies, 0.50), 2),
+            "p95_ms": round(percentile(all_latencies, 0.95), 2),
+            "p99_ms": round(percentile(all_latencies, 0.99), 2),
+        },
+        "endpoints": _summarize(samples),
+        "skipped": skipped,
+        "uncovered": uncovered,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=100, help="Jobs per user.")
+    parser.add_argument("--feedback", type=float, default=0.6, help="Share of jobs with feedback (0-1).")
+    parser.add_argument("--history", type=int, default=3, choices=range(0, 5),
+                        help="Most status-history dates per job.")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per endpoint and method.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--database-url", help="Empty database to seed; defaults to a temporary SQLite file.")
+    parser.add_argument("--output", help="Write the JSON result here as well as to stdout.")
+    parser.add_argument("--baseline", help="Earlier result to compare against.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative change before an endpoint counts as regressed.")
+    args = parser.parse_args(argv)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = run(args.users, args.jobs, args.feedback, args.history, args.requests, args.concurrency,
+                  args.seed, args.database_url)
+    if baseline is not None:
+        if baseline.get("config") != results["config"]:
+            parser.error(f"baseline was recorded with {baseline.get('config')}, not {results['config']}")
+        results["regressions"] = compare(results, baseline, args.tolerance)
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+    if results.get("regressions"):
+        for regression in results["regressions"]:
+            print(f"❌ {regression['endpoint']} {regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['current']}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
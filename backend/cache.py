@@ -0,0 +1,278 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, jsonify, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models import CacheCounter
+
+
+class TTLCache:
+    """
+    Small thread-safe LRU cache whose entries expire after `ttl` seconds.
+    """
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class LocalCounters:
+    """
+    Counters in a dict. They are per process, so a bump in one worker is not seen
+    by the others; only correct when a single process serves the app.
+    """
+    def __init__(self):
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self._counters.get(key, 0)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class DatabaseCounters:
+    """
+    Counters in the cache_counter table, so every worker process on the database
+    sees the same generations. A bump runs after the caller's commit and commits
+    on its own.
+    """
+    def get(self, key):
+        table = CacheCounter.__table__
+        value = db.session.execute(select(table.c.value).where(table.c.name == key)).scalar()
+        return value or 0
+
+    def incr(self, key):
+        table = CacheCounter.__table__
+        bump = table.update().where(table.c.name == key).values(value=table.c.value + 1)
+        try:
+            if not db.session.execute(bump).rowcount:
+                db.session.execute(table.insert().values(name=key, value=1))
+            db.session.commit()
+        except IntegrityError:
+            # Another process inserted the row first.
+            db.session.rollback()
+            db.session.execute(bump)
+            db.session.commit()
+        return self.get(key)
+
+
+class MemoryBackend:
+    """
+    Default cache backend: a per-process TTLCache for values. Counters come from
+    `counters` (LocalCounters unless given), so generations can be shared between
+    workers while the values stay in process.
+    """
+    def __init__(self, maxsize=4096, ttl=300, counters=None):
+        self._values = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._counters = counters if counters is not None else LocalCounters()
+
+    def get(self, key):
+        return self._values.get(key)
+
+    def set(self, key, value):
+        self._values.set(key, value)
+
+    def counter(self, key):
+        return self._counters.get(key)
+
+    def incr(self, key):
+        return self._counters.incr(key)
+
+
+class RedisBackend:
+    """
+    Cache backend for anything speaking the Redis GET/SETEX/INCR commands (the
+    redis-py client or a compatible stand-in). Values are stored as JSON with a
+    TTL; counters never expire, so a generation cannot go backwards.
+    """
+    def __init__(self, client, ttl=300, prefix="jam:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value):
+        self.client.setex(self.prefix + key, int(self.ttl), json.dumps(value))
+
+    def counter(self, key):
+        raw = self.client.get(self.prefix + key)
+        return int(raw) if raw is not None else 0
+
+    def incr(self, key):
+        return int(self.client.incr(self.prefix + key))
+
+
+class ResponseCache:
+    """
+    Per-user cache of JSON responses. Keys combine the user's current generation,
+    the endpoint and its query args, so bumping the generation on every write
+    retires all of that user's entries without deleting anything.
+    """
+    def __init__(self, backend):
+        self.backend = backend
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def generation(self, user_id):
+        return self.backend.counter(f"generation:{user_id}")
+
+    def bump_generation(self, user_id):
+        return self.backend.incr(f"generation:{user_id}")
+
+    def key(self, user_id, endpoint, args):
+        query = urlencode(sorted(args.items(multi=True)))
+        return f"response:{user_id}:{self.generation(user_id)}:{endpoint}:{query}"
+
+    def _record(self, endpoint, outcome):
+        with self._stats_lock:
+            counts = self._stats.setdefault(endpoint, {"hits": 0, "misses": 0})
+            counts[outcome] += 1
+
+    def get(self, endpoint, key):
+        value = self.backend.get(key)
+        self._record(endpoint, "misses" if value is None else "hits")
+        return value
+
+    def set(self, key, value):
+        self.backend.set(key, value)
+
+    def stats(self):
+        """Hit/miss counts per endpoint since the process started."""
+        with self._stats_lock:
+            return {endpoint: dict(counts) for endpoint, counts in self._stats.items()}
+
+
+JOB_COUNT_CACHE_SIZE = 4096
+
+
+GENERATION_STORES = {
+    'database': DatabaseCounters,
+    'memory': LocalCounters,
+}
+
+
+def _backend(config):
+    ttl = int(config.get("ANALYTICS_CACHE_TTL", 300))
+    url = config.get("ANALYTICS_CACHE_URL")
+    if not url:
+        store = config.get("ANALYTICS_CACHE_GENERATIONS", "memory")
+        if store not in GENERATION_STORES:
+            raise ValueError(f"Unsupported ANALYTICS_CACHE_GENERATIONS {store!r}; "
+                             f"use one of {', '.join(GENERATION_STORES)}")
+        return MemoryBackend(maxsize=int(config.get("ANALYTICS_CACHE_SIZE", 4096)), ttl=ttl,
+                             counters=GENERATION_STORES[store]())
+    try:
+        import redis
+    except ImportError:
+        raise ValueError("ANALYTICS_CACHE_URL is set but the redis package is not installed; "
+                         "run `pip install redis` or unset ANALYTICS_CACHE_URL") from None
+    return RedisBackend(redis.Redis.from_url(url), ttl=ttl)
+
+
+def configure_cache(app):
+    """
+    Give `app` its own response cache and job-count cache in app.extensions.
+    ANALYTICS_CACHE_URL set to a redis:// URL uses Redis (requires the redis
+    package) for values and generations. Otherwise values go in the in-process
+    LRU, and generations live where ANALYTICS_CACHE_GENERATIONS says: 'database'
+    (shared by all workers) or 'memory' (single process only).
+    ANALYTICS_CACHE_TTL and ANALYTICS_CACHE_SIZE tune either backend.
+    """
+    cache = ResponseCache(_backend(app.config))
+    app.extensions['response_cache'] = cache
+    app.extensions['job_count_cache'] = TTLCache(maxsize=JOB_COUNT_CACHE_SIZE, ttl=300)
+    return cache
+
+
+def response_cache():
+    """The current app's ResponseCache."""
+    return current_app.extensions['response_cache']
+
+
+def job_count_cache():
+    """The current app's cache of exact job counts, keyed by user generation."""
+    return current_app.extensions['job_count_cache']
+
+
+def user_generation(user_id):
+    """
+    Current cache generation for a user. Cache keys embed it, so bumping the
+    generation invalidates every cached entry for that user at once.
+    """
+    return response_cache().generation(user_id)
+
+
+def bump_user_generation(user_id):
+    response_cache().bump_generation(user_id)
+
+
+def cached_response(endpoint):
+    """
+    Serve a JWT-protected GET view from the app's response cache, keyed on the current
+    user and the request's query args. Only 200 responses are stored. Goes below
+    @jwt_required() so the identity is available.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = response_cache()
+            key = cache.key(get_jwt_identity(), endpoint, request.args)
+            cached = cache.get(endpoint, key)
+            if cached is not None:
+                response = jsonify(cached)
+                response.headers["X-Cache"] = "HIT"
+                return response
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                cache.set(key, response.get_json())
+            response.headers["X-Cache"] = "MISS"
+            return response
+        return wrapper
+    return decorator
+
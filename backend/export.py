@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from sqlalchemy import func, select, text
+
+from extensions import db
+from models import (JobApplication, Feedback, FeedbackCategory, FeedbackStrength,
+                    FeedbackImprovement, JobStatusHistory)
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+EXPORT_BATCH_SIZE = 500
+# aggregate_strings() is GROUP_CONCAT on MySQL, which silently cuts results at
+# group_concat_max_len (1024 bytes by default); the export raises it for its session.
+GROUP_CONCAT_MAX_LEN = 1024 * 1024
+HISTORY_STATUSES = ['interview', 'offer', 'accepted', 'rejected']
+
+# Unit separator: never typed by users, so aggregated lists split back cleanly.
+_LIST_SEPARATOR = '\x1f'
+
+EXPORT_COLUMNS = [
+    'id', 'job_title', 'company', 'role_category', 'status', 'applied_date',
+    'interview_date', 'offer_date', 'accepted_date', 'rejected_date',
+    'general_notes', 'created_at', 'feedback_category', 'feedback_type',
+    'feedback_notes', 'detailed_feedback', 'priority_strength', 'strengths',
+    'priority_improvement', 'improvements',
+]
+
+
+def _export_query(user_id):
+    """
+    One row per application, ordered by id. Strengths, improvements and status
+    dates come from correlated subqueries on indexed columns, so the database can
+    hand rows over as it finds them instead of building per-user aggregates first.
+    """
+    ja = JobApplication.__table__
+    f = Feedback.__table__
+    fc = FeedbackCategory.__table__
+    history = JobStatusHistory.__table__
+
+    def extras(table, column, is_priority):
+        value = table.c[column]
+        aggregate = func.max(value) if is_priority else func.aggregate_strings(value, _LIST_SEPARATOR)
+        return select(aggregate).where(
+            table.c.feedback_id == f.c.id, table.c.is_priority == is_priority
+        ).scalar_subquery()
+
+    def status_date(status):
+        return select(func.max(history.c.status_date)).where(
+            history.c.job_id == ja.c.id, history.c.status == status
+        ).scalar_subquery()
+
+    strengths = FeedbackStrength.__table__
+    improvements = FeedbackImprovement.__table__
+    return (
+        select(
+            ja.c.id, ja.c.job_title, ja.c.company, ja.c.role_category, ja.c.status, ja.c.applied_date,
+            *[status_date(s).label(f"{s}_date") for s in HISTORY_STATUSES],
+            ja.c.general_notes, ja.c.created_at,
+            fc.c.name.label('feedback_category'), fc.c.type.label('feedback_type'),
+            f.c.notes.label('feedback_notes'), f.c.detailed_feedback,
+            extras(strengths, 'strength', True).label('priority_strength'),
+            extras(strengths, 'strength', False).label('strengths'),
+            extras(improvements, 'improvement', True).label('priority_improvement'),
+            extras(improvements, 'improvement', False).label('improvements'),
+        )
+        .select_from(ja.outerjoin(f, f.c.job_id == ja.c.id).outerjoin(fc, fc.c.id == f.c.category_id))
+        .where(ja.c.user_id == user_id)
+        .order_by(ja.c.id)
+    )
+
+
+def iter_export_records(user_id):
+    """
+    Yield one dict per application using a server-side cursor, EXPORT_BATCH_SIZE
+    rows at a time, so memory stays flat however many applications there are.
+    """
+    if db.session.get_bind().dialect.name == 'mysql':
+        db.session.execute(text("SET SESSION group_concat_max_len = :max_len"), {"max_len": GROUP_CONCAT_MAX_LEN})
+    result = db.session.execute(
+        _export_query(user_id),
+        execution_options={"stream_results": True, "yield_per": EXPORT_BATCH_SIZE}
+    )
+    try:
+        for row in result:
+            record = dict(row._mapping)
+            for key in ('strengths', 'improvements'):
+                record[key] = record[key].split(_LIST_SEPARATOR) if record[key] else []
+            yield record
+    finally:
+        result.close()
+
+
+def _plain(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def generate_csv(records):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return value
+
+    writer.writerow(EXPORT_COLUMNS)
+    yield flush()
+    for record in records:
+        writer.writerow([
+            "; ".join(record[c]) if isinstance(record[c], list) else _plain(record[c])
+            for c in EXPORT_COLUMNS
+        ])
+        yield flush()
+
+
+def generate_ndjson(records):
+    for record in records:
+        yield json.dumps({c: _plain(record[c]) for c in EXPORT_COLUMNS}) + "\n"
@@ -0,0 +1,138 @@
+from math import ceil
+
+from sqlalchemy import text
+
+from extensions import db
+
+FUNNEL_STAGES = ('applied', 'interview', 'offer', 'accepted')
+
+DAYS_BETWEEN = {
+    'mysql': "DATEDIFF(stage_date, prev_date)",
+    'sqlite': "CAST(julianday(stage_date) - julianday(prev_date) AS INTEGER)",
+}
+
+# One row per stage a job reached: 'applied' from job_application.applied_date,
+# later stages from job_status_history, numbered by their position in the funnel.
+_STAGES_SQL = """
+    SELECT ja.id AS job_id, 0 AS stage_rank, ja.applied_date AS stage_date
+    FROM job_application ja
+    WHERE {where_clause}
+    UNION ALL
+    SELECT h.job_id,
+           CASE h.status WHEN 'interview' THEN 1 WHEN 'offer' THEN 2 ELSE 3 END,
+           h.status_date
+    FROM job_application ja
+    JOIN job_status_history h ON h.job_id = ja.id
+    WHERE {where_clause} AND h.status IN ('interview', 'offer', 'accepted')
+"""
+
+_SUMMARY_SQL = """
+    SELECT 'days' AS kind, stage_rank, {days} AS days, COUNT(*) AS count
+    FROM {ordered}
+    WHERE prev_date IS NOT NULL AND stage_date IS NOT NULL
+    GROUP BY stage_rank, {days}
+    UNION ALL
+    SELECT 'furthest' AS kind, stage_rank, NULL AS days, COUNT(*) AS count
+    FROM {ordered}
+    WHERE is_furthest = 1
+    GROUP BY stage_rank
+"""
+
+
+def supports_window_functions(connection):
+    dialect = connection.dialect
+    version = dialect.server_version_info or ()
+    if dialect.name == 'sqlite':
+        return version >= (3, 25)
+    if dialect.name == 'mysql':
+        return version >= ((10, 2) if getattr(dialect, 'is_mariadb', False) else (8, 0))
+    return True
+
+
+def _funnel_query(connection, where_clause):
+    stages = _STAGES_SQL.format(where_clause=where_clause)
+    days = DAYS_BETWEEN[connection.dialect.name]
+    if supports_window_functions(connection):
+        return f"""
+            WITH stages AS ({stages}),
+            ordered AS (
+                SELECT stage_rank, stage_date,
+                       LAG(stage_date) OVER (PARTITION BY job_id ORDER BY stage_rank) AS prev_date,
+                       CASE WHEN ROW_NUMBER() OVER (PARTITION BY job_id ORDER BY stage_rank DESC) = 1
+                            THEN 1 ELSE 0 END AS is_furthest
+                FROM stages
+            )
+            {_SUMMARY_SQL.format(days=days, ordered='ordered')}
+        """
+    # No window functions (SQLite < 3.25, MySQL 5.7): the same rows from
+    # correlated subqueries over a derived table.
+    ordered = f"""(
+        SELECT s.stage_rank, s.stage_date,
+               (SELECT p.stage_date FROM ({stages}) p
+                WHERE p.job_id = s.job_id AND p.stage_rank < s.stage_rank
+                ORDER BY p.stage_rank DESC LIMIT 1) AS prev_date,
+               CASE WHEN EXISTS (SELECT 1 FROM ({stages}) n
+                                 WHERE n.job_id = s.job_id AND n.stage_rank > s.stage_rank)
+                    THEN 0 ELSE 1 END AS is_furthest
+        FROM ({stages}) s
+    ) ordered"""
+    return _SUMMARY_SQL.format(days=days, ordered=ordered)
+
+
+def nearest_rank(histogram, fraction):
+    """Nearest-rank percentile of a {value: count} histogram; None when empty."""
+    total = sum(histogram.values())
+    if not total:
+        return None
+    rank = max(ceil(fraction * total), 1)
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= rank:
+            return value
+
+
+def conversion_funnel(user_id, role=None):
+    """
+    Applied → interview → offer → accepted for the user's applications, from one
+    pass over their status history. A job counts as reaching every stage up to
+    the furthest one it has recorded. Days to a stage are measured from the
+    previous stage the job recorded (applied_date for the first).
+    """
+    where_clause = "ja.user_id = :user_id"
+    params = {"user_id": user_id}
+    if role:
+        where_clause += " AND ja.role_category = :role"
+        params["role"] = role
+
+    connection = db.session.connection()
+    furthest = [0] * len(FUNNEL_STAGES)
+    days = [{} for _ in FUNNEL_STAGES]
+    for kind, stage_rank, value, count in db.session.execute(text(_funnel_query(connection, where_clause)), params):
+        if kind == 'furthest':
+            furthest[stage_rank] += count
+        else:
+            days[stage_rank][int(value)] = days[stage_rank].get(int(value), 0) + count
+
+    stages = []
+    for rank, stage in enumerate(FUNNEL_STAGES):
+        reached = sum(furthest[rank:])
+        previous = stages[-1]["reached"] if stages else None
+        stage_data = {
+            "stage": stage,
+            "reached": reached,
+            "conversion_from_previous": round(reached / previous, 4) if previous else None,
+        }
+        if rank:
+            stage_data["days_from_previous"] = {
+                "median": nearest_rank(days[rank], 0.5),
+                "p90": nearest_rank(days[rank], 0.9),
+                "samples": sum(days[rank].values()),
+            }
+        stages.append(stage_data)
+
+    applied = stages[0]["reached"]
+    return {
+        "stages": stages,
+        "overall_conversion": round(stages[-1]["reached"] / applied, 4) if applied else None,
+    }
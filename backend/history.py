@@ -0,0 +1,122 @@
+from collections import Counter, defaultdict
+
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.dialects import mysql, sqlite
+
+from extensions import db
+from models import JobApplication, JobStatusHistory, UserStatusDaily
+from rollup import adjust_status_rollup
+
+COMPACTION_CHUNK_SIZE = 1000
+
+
+def _upsert_statement(dialect_name):
+    table = JobStatusHistory.__table__
+    if dialect_name == 'mysql':
+        statement = mysql.insert(table)
+        # MySQL skips the write when the new value equals the stored one.
+        return statement.on_duplicate_key_update(status_date=statement.inserted.status_date)
+    if dialect_name == 'sqlite':
+        statement = sqlite.insert(table)
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.job_id, table.c.status],
+            set_={"status_date": statement.excluded.status_date},
+            where=table.c.status_date.is_distinct_from(statement.excluded.status_date)
+        )
+    raise ValueError(f"Status history upserts are not supported on {dialect_name}")
+
+
+def upsert_status_history(user_id, rows):
+    """
+    Record status dates for a user's jobs, keyed on (job_id, status).
+    A status that is already recorded keeps its row; only a changed date is written.
+    The daily rollup moves with it: a new date counts +1, a replaced one -1.
+    'rows' are dicts with job_id, status, status_date and created_at.
+    """
+    if not rows:
+        return
+    table = JobStatusHistory.__table__
+    current = {(job_id, status): status_date for job_id, status, status_date in db.session.execute(
+        select(table.c.job_id, table.c.status, table.c.status_date)
+        .where(table.c.job_id.in_({row["job_id"] for row in rows}))
+    )}
+    deltas = Counter()
+    for row in rows:
+        key = (row["job_id"], row["status"])
+        if key in current:
+            if current[key] == row["status_date"]:
+                continue
+            deltas[(row["status"], current[key])] -= 1
+        deltas[(row["status"], row["status_date"])] += 1
+
+    statement = _upsert_statement(db.session.connection().dialect.name)
+    db.session.execute(statement, rows)
+    adjust_status_rollup(user_id, deltas)
+
+
+def delete_status_history(user_id, job_id):
+    """Delete a job's status history and take its rows out of the daily rollup."""
+    table = JobStatusHistory.__table__
+    rows = db.session.execute(
+        select(table.c.status, table.c.status_date).where(table.c.job_id == job_id)
+    ).fetchall()
+    if not rows:
+        return
+    db.session.execute(table.delete().where(table.c.job_id == job_id))
+    adjust_status_rollup(user_id, Counter({(status, status_date): -1 for status, status_date in rows}))
+
+
+def job_id_ranges(connection, chunk_size):
+    low, highest = connection.execute(text("SELECT MIN(job_id), MAX(job_id) FROM job_status_history")).fetchone()
+    while low is not None and low <= highest:
+        yield low, low + chunk_size
+        low += chunk_size
+
+
+def delete_duplicate_history(connection, low, high, adjust_rollup=False):
+    """
+    Delete all but the newest row per (job_id, status) for job ids in [low, high).
+    With `adjust_rollup`, the deleted rows are also taken out of their owners'
+    daily rollup in the same transaction.
+    """
+    table = JobStatusHistory.__table__
+    in_range = (table.c.job_id >= low) & (table.c.job_id < high)
+    newest = select(func.max(table.c.id)).where(in_range).group_by(table.c.job_id, table.c.status)
+    doomed = connection.execute(
+        select(table.c.id, table.c.job_id, table.c.status, table.c.status_date)
+        .where(in_range, table.c.id.not_in(newest))
+    ).fetchall()
+    if not doomed:
+        return 0
+    connection.execute(table.delete().where(table.c.id.in_([row[0] for row in doomed])))
+    if adjust_rollup:
+        jobs = JobApplication.__table__
+        owners = dict(connection.execute(
+            select(jobs.c.id, jobs.c.user_id).where(jobs.c.id.in_({row[1] for row in doomed}))
+        ).fetchall())
+        deltas = defaultdict(Counter)
+        for _, job_id, status, status_date in doomed:
+            if job_id in owners:
+                deltas[owners[job_id]][(status, status_date)] -= 1
+        for user_id, user_deltas in deltas.items():
+            adjust_status_rollup(user_id, user_deltas, connection)
+    return len(doomed)
+
+
+def compact_status_history(engine, chunk_size=COMPACTION_CHUNK_SIZE):
+    """
+    Remove duplicate (job_id, status) history rows, keeping the newest one.
+    Works through job id ranges of `chunk_size`, committing after each, so no
+    transaction holds locks on more than one range at a time. Once the daily
+    rollup exists (after migration 6), each chunk also subtracts its deleted rows
+    from it.
+    Returns the number of rows deleted.
+    """
+    with engine.connect() as connection:
+        ranges = list(job_id_ranges(connection, chunk_size))
+        adjust_rollup = inspect(connection).has_table(UserStatusDaily.__tablename__)
+    deleted = 0
+    for low, high in ranges:
+        with engine.begin() as connection:
+            deleted += delete_duplicate_history(connection, low, high, adjust_rollup)
+    return deleted
@@ -0,0 +1,285 @@
+import csv
+import io
+import json
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import insert, select
+
+from extensions import db
+from models import (JobApplication, Feedback, FeedbackCategory, FeedbackStrength,
+                    FeedbackImprovement, JobStatusHistory, DEFAULT_CATEGORY_ID, has_text_notes)
+from rollup import adjust_status_rollup
+from summary import adjust_summary, job_deltas
+from terms import term_ids, term_key
+
+IMPORT_FORMATS = ('csv', 'json')
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+JOB_STATUSES = ('applied', 'interview', 'offer', 'accepted', 'rejected')
+HISTORY_FIELDS = [
+    ('interview', 'interview_date'),
+    ('offer', 'offer_date'),
+    ('accepted', 'accepted_date'),
+    ('rejected', 'rejected_date'),
+]
+MAX_LENGTHS = {
+    'job_title': 100,
+    'company': 100,
+    'role_category': 100,
+    'feedback_notes': 50,
+}
+FEEDBACK_FIELDS = ('feedback_category', 'feedback_notes', 'detailed_feedback', 'priority_strength',
+                   'strengths', 'priority_improvement', 'improvements')
+
+
+def iter_csv_records(stream):
+    """Yield one dict per CSV row; the header uses the same columns as the export."""
+    text_stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    yield from csv.DictReader(text_stream)
+
+
+def iter_json_records(stream, chunk_size=64 * 1024):
+    """
+    Incrementally parse a top-level JSON array, yielding one element at a time
+    without holding the whole document in memory.
+    """
+    text_stream = io.TextIOWrapper(stream, encoding='utf-8-sig')
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+    while True:
+        chunk = text_stream.read(chunk_size)
+        buffer += chunk
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == ']':
+                return
+            try:
+                record, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break
+            yield record
+        buffer = buffer[pos:]
+        if not chunk:
+            raise ValueError("Malformed JSON array")
+
+
+def _split_list(value):
+    if value is None:
+        return []
+    if isinstance(value, list):
+        items = value
+    else:
+        items = str(value).split(';')
+    return [str(item).strip() for item in items if item is not None and str(item).strip()]
+
+
+def _clean(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _present(value):
+    if isinstance(value, list):
+        return bool(_split_list(value))
+    return _clean(value) is not None
+
+
+def _parse_date(value, field, errors):
+    value = _clean(value)
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value[:10], "%Y-%m-%d").date()
+    except ValueError:
+        errors.append(f"Invalid {field} format")
+        return None
+
+
+def validate_record(record, categories):
+    """
+    Normalise one import record into insertable values.
+    Returns (row, errors); row is None when the record cannot be imported.
+    """
+    if not isinstance(record, dict):
+        return None, ["Expected an object"]
+    errors = []
+    row = {
+        'job_title': _clean(record.get('job_title')),
+        'company': _clean(record.get('company')),
+        'role_category': _clean(record.get('role_category')),
+        'status': (_clean(record.get('status')) or 'applied').lower(),
+        'general_notes': _clean(record.get('general_notes')),
+        'applied_date': _parse_date(record.get('applied_date'), 'applied_date', errors),
+        'feedback_notes': _clean(record.get('feedback_notes')),
+        'detailed_feedback': _clean(record.get('detailed_feedback')),
+    }
+    for field in ('job_title', 'company'):
+        if not row[field]:
+            errors.append(f"Missing {field}")
+    for field, limit in MAX_LENGTHS.items():
+        if row[field] and len(row[field]) > limit:
+            errors.append(f"{field} is longer than {limit} characters")
+    if row['status'] not in JOB_STATUSES:
+        errors.append(f"Invalid status '{row['status']}'")
+
+    row['history'] = []
+    for status, field in HISTORY_FIELDS:
+        status_date = _parse_date(record.get(field), field, errors)
+        if status_date:
+            row['history'].append((status, status_date))
+
+    row['has_feedback'] = any(_present(record.get(f)) for f in FEEDBACK_FIELDS)
+    category = _clean(record.get('feedback_category'))
+    if category is None:
+        row['category_id'] = DEFAULT_CATEGORY_ID
+    elif category.lower() in categories:
+        row['category_id'] = categories[category.lower()]
+    else:
+        errors.append(f"Unknown feedback_category '{category}'")
+
+    for kind in ('strength', 'improvement'):
+        values = []
+        priority = _clean(record.get(f'priority_{kind}'))
+        if priority:
+            values.append((True, priority))
+        values.extend((False, v) for v in _split_list(record.get(f'{kind}s')))
+        if any(len(v) > 255 for _, v in values):
+            errors.append(f"{kind}s must be at most 255 characters each")
+        row[f'{kind}s'] = values
+
+    if errors:
+        return None, errors
+    return row, []
+
+
+def _insert_returning_ids(table, rows):
+    """
+    Insert rows and return their generated ids in input order.
+    Uses executemany with RETURNING where the dialect supports it (SQLite, MariaDB);
+    otherwise (MySQL) one INSERT per row, reading each lastrowid, since the ids of
+    a multi-row INSERT are only consecutive for some auto_increment_increment and
+    innodb_autoinc_lock_mode settings.
+    """
+    connection = db.session.connection()
+    if connection.dialect.insert_executemany_returning_sort_by_parameter_order:
+        statement = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        return [r[0] for r in connection.execute(statement, rows)]
+    statement = insert(table)
+    return [connection.execute(statement, row).lastrowid for row in rows]
+
+
+def _write_chunk(user_id, chunk, category_types):
+    """Insert one validated chunk; the caller owns the transaction."""
+    now = datetime.utcnow()
+    job_ids = _insert_returning_ids(JobApplication.__table__, [{
+        'user_id': user_id,
+        'job_title': row['job_title'],
+        'company': row['company'],
+        'role_category': row['role_category'],
+        'status': row['status'],
+        'applied_date': row['applied_date'],
+        'general_notes': row['general_notes'],
+        'created_at': now,
+    } for _, row in chunk])
+
+    history = []
+    with_feedback = []
+    for job_id, (_, row) in zip(job_ids, chunk):
+        history.extend({'job_id': job_id, 'status': status, 'status_date': status_date, 'created_at': now}
+                       for status, status_date in row['history'])
+        if row['has_feedback']:
+            with_feedback.append((job_id, row))
+
+    if history:
+        db.session.execute(insert(JobStatusHistory.__table__), history)
+        adjust_status_rollup(user_id, Counter((h['status'], h['status_date']) for h in history))
+
+    if with_feedback:
+        feedback_ids = _insert_returning_ids(Feedback.__table__, [{
+            'job_id': job_id,
+            'category_id': row['category_id'],
+            'notes': row['feedback_notes'] or '',
+            'has_text_notes': has_text_notes(row['feedback_notes']),
+            'detailed_feedback': row['detailed_feedback'] or '',
+            'created_at': now,
+        } for job_id, row in with_feedback])
+        ids = term_ids(db.session.connection(), [value for _, row in with_feedback
+                                                 for kind in ('strength', 'improvement')
+                                                 for _, value in row[f'{kind}s']])
+        for table, kind in ((FeedbackStrength.__table__, 'strength'), (FeedbackImprovement.__table__, 'improvement')):
+            extras = [{'feedback_id': feedback_id, 'is_priority': is_priority, kind: value,
+                       'term_id': ids.get(term_key(value)), 'created_at': now}
+                      for feedback_id, (_, row) in zip(feedback_ids, with_feedback)
+                      for is_priority, value in row[f'{kind}s']]
+            if extras:
+                db.session.execute(insert(table), extras)
+
+    deltas = Counter()
+    for _, row in chunk:
+        deltas.update(job_deltas(row['status'], category_types.get(row['category_id']) if row['has_feedback'] else None))
+    adjust_summary(user_id, deltas)
+
+
+def import_records(user_id, records, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Validate and insert records in chunks, committing once per chunk so a bad
+    chunk never rolls back rows that were already imported.
+    Returns a report with counts and per-row errors (row numbers start at 1).
+    """
+    categories = {}
+    category_types = {}
+    for category_id, name, category_type in db.session.execute(
+            select(FeedbackCategory.id, FeedbackCategory.name, FeedbackCategory.type)):
+        categories[name.lower()] = category_id
+        category_types[category_id] = category_type
+    report = {"imported": 0, "failed": 0, "errors": []}
+
+    def fail(row_number, messages):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": row_number, "errors": messages})
+
+    def flush(chunk):
+        if not chunk:
+            return
+        try:
+            _write_chunk(user_id, chunk, category_types)
+            db.session.commit()
+            report["imported"] += len(chunk)
+        except Exception as e:
+            db.session.rollback()
+            for row_number, _ in chunk:
+                fail(row_number, [f"Database error: {e.__class__.__name__}"])
+
+    chunk = []
+    row_number = 0
+    try:
+        for row_number, record in enumerate(records, start=1):
+            row, errors = validate_record(record, categories)
+            if errors:
+                fail(row_number, errors)
+                continue
+            chunk.append((row_number, row))
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+    except (ValueError, csv.Error) as e:
+        fail(row_number + 1, [f"Could not parse input: {e}"])
+    flush(chunk)
+    report["truncated_errors"] = report["failed"] > len(report["errors"])
+    return report
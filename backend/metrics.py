@@ -0,0 +1,188 @@
+import bisect
+import hmac
+import threading
+import time
+from collections import defaultdict
+
+from flask import Response, abort, g, has_request_context, request
+from sqlalchemy import event
+
+from pool import pool_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_PATH = '/api/_metrics'
+
+# pool.pool_stats() key -> metric
+POOL_METRICS = (
+    ("size", "jam_db_pool_size", "gauge", "Configured number of pooled connections."),
+    ("checked_in", "jam_db_pool_checked_in", "gauge", "Idle connections in the pool."),
+    ("checked_out", "jam_db_pool_checked_out", "gauge", "Connections in use."),
+    ("overflow", "jam_db_pool_overflow", "gauge", "Connections beyond the pool size."),
+    ("checkouts", "jam_db_pool_checkouts_total", "counter", "Connection checkouts."),
+    ("timeouts", "jam_db_pool_timeouts_total", "counter", "Checkouts that timed out waiting for a connection."),
+    ("wait_seconds_total", "jam_db_pool_wait_seconds_total", "counter", "Time spent checking out connections."),
+    ("wait_seconds_max", "jam_db_pool_wait_seconds_max", "gauge", "Longest single checkout."),
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+    if has_request_context():
+        g.sql_queries = g.get('sql_queries', 0) + 1
+        g.sql_seconds = g.get('sql_seconds', 0.0) + elapsed
+
+
+def _handle_error(context):
+    # after_cursor_execute does not run for a failed statement; drop its start time.
+    started = context.connection.info.get('query_started') if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine):
+    """Count statements and SQL time into the current request's `g`."""
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(engine, 'handle_error', _handle_error)
+
+
+class EndpointStats:
+    __slots__ = ('requests', 'queries', 'sql_seconds', 'buckets', 'duration_sum')
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.duration_sum = 0.0
+
+
+class RequestMetrics:
+    """
+    Per-endpoint request counts, query counts, SQL time and latency histograms
+    for this process. Each request costs one short critical section.
+    """
+    def __init__(self):
+        self._endpoints = defaultdict(EndpointStats)
+        self._statuses = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, status, duration, queries, sql_seconds):
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, duration)
+        with self._lock:
+            stats = self._endpoints[endpoint]
+            stats.requests += 1
+            stats.queries += queries
+            stats.sql_seconds += sql_seconds
+            stats.buckets[bucket] += 1
+            stats.duration_sum += duration
+            self._statuses[(endpoint, status)] += 1
+
+    def snapshot(self):
+        with self._lock:
+            endpoints = {}
+            for endpoint, stats in self._endpoints.items():
+                endpoints[endpoint] = {
+                    "requests": stats.requests,
+                    "queries": stats.queries,
+                    "sql_seconds": stats.sql_seconds,
+                    "buckets": list(stats.buckets),
+                    "duration_sum": stats.duration_sum,
+                }
+            return endpoints, dict(self._statuses)
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _metric(lines, name, kind, help_text, samples):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+    for labels, value in samples:
+        label_text = ",".join(f'{key}="{_label(label)}"' for key, label in labels)
+        lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+
+def render_prometheus(metrics, pool=None, cache_stats=None):
+    """Prometheus text exposition of request, SQL, pool and response-cache counters."""
+    endpoints, statuses = metrics.snapshot()
+    lines = []
+    _metric(lines, "jam_http_requests_total", "counter", "Requests by endpoint and status.",
+            [((("endpoint", endpoint), ("status", status)), count)
+             for (endpoint, status), count in sorted(statuses.items())])
+
+    histogram = []
+    for endpoint, stats in sorted(endpoints.items()):
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), stats["buckets"]):
+            cumulative += count
+            histogram.append(f'jam_http_request_duration_seconds_bucket{{endpoint="{_label(endpoint)}",le="{bound}"}} {cumulative}')
+        histogram.append(f'jam_http_request_duration_seconds_sum{{endpoint="{_label(endpoint)}"}} {stats["duration_sum"]:.6f}')
+        histogram.append(f'jam_http_request_duration_seconds_count{{endpoint="{_label(endpoint)}"}} {stats["requests"]}')
+    lines.append("# HELP jam_http_request_duration_seconds Request latency by endpoint.")
+    lines.append("# TYPE jam_http_request_duration_seconds histogram")
+    lines.extend(histogram)
+
+    _metric(lines, "jam_db_queries_total", "counter", "SQL statements executed, by endpoint.",
+            [((("endpoint", endpoint),), stats["queries"]) for endpoint, stats in sorted(endpoints.items())])
+    _metric(lines, "jam_db_query_seconds_total", "counter", "Time spent executing SQL, by endpoint.",
+            [((("endpoint", endpoint),), f'{stats["sql_seconds"]:.6f}') for endpoint, stats in sorted(endpoints.items())])
+
+    if cache_stats is not None:
+        _metric(lines, "jam_response_cache_requests_total", "counter", "Analytics response cache lookups by result.",
+                [((("endpoint", endpoint), ("result", result)), counts[result])
+                 for endpoint, counts in sorted(cache_stats.items()) for result in ("hits", "misses")])
+    for key, name, kind, help_text in POOL_METRICS:
+        if pool and key in pool:
+            _metric(lines, name, kind, help_text, [((), pool[key])])
+    return "\n".join(lines) + "\n"
+
+
+def configure_metrics(app, engine):
+    """
+    Instrument `engine` and record every request's latency, statement count and
+    SQL time per endpoint. Adds a Server-Timing header (db and app durations)
+    to each response and serves the totals at /api/_metrics in Prometheus text
+    format, only when METRICS_TOKEN is set and only to requests that send it as
+    a bearer token. Counters are per process.
+    """
+    metrics = RequestMetrics()
+    instrument_engine(engine)
+
+    @app.before_request
+    def start_metrics():
+        g.metrics_started = time.perf_counter()
+        g.sql_queries = 0
+        g.sql_seconds = 0.0
+
+    @app.after_request
+    def record_metrics(response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        duration = time.perf_counter() - started
+        queries, sql_seconds = g.get('sql_queries', 0), g.get('sql_seconds', 0.0)
+        metrics.record(request.endpoint or 'unmatched', response.status_code, duration, queries, sql_seconds)
+        response.headers.add('Server-Timing', f'db;dur={sql_seconds * 1000:.2f};desc="{queries} queries"')
+        response.headers.add('Server-Timing', f'app;dur={duration * 1000:.2f}')
+        return response
+
+    def metrics_view():
+        token = app.config.get('METRICS_TOKEN')
+        if not token:
+            abort(404)
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+            return Response("Unauthorized\n", status=401, mimetype='text/plain',
+                            headers={"WWW-Authenticate": 'Bearer realm="metrics"'})
+        return Response(render_prometheus(metrics, pool_stats(engine), app.extensions['response_cache'].stats()),
+                        mimetype='text/plain; version=0.0.4')
+
+    app.add_url_rule(METRICS_PATH, 'metrics', metrics_view, methods=['GET'])
+    app.extensions['request_metrics'] = metrics
+    return metrics
@@ -0,0 +1,72 @@
+"""
+Versioned schema migrations.
+
+Each migration module exposes `version`, `name` and `upgrade(connection)`.
+A module may also define `prepare(engine)` for data work that manages its own
+short transactions; it runs before the versioned transaction and must be safe
+to repeat.
+Applied versions are recorded in the schema_version table, so running the
+upgrade again only applies what is missing. Run with `flask db-upgrade`.
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select
+
+from migrations import (m0001_search_index, m0002_index_pack, m0003_question_bank_normalized_text,
+                        m0004_status_history_unique, m0005_user_analytics_summary,
+                        m0006_user_status_daily, m0007_feedback_has_text_notes, m0008_feedback_terms,
+                        m0009_recommendation_rules, m0010_reference_data_version, m0011_cache_counter)
+
+MIGRATIONS = [
+    m0001_search_index,
+    m0002_index_pack,
+    m0003_question_bank_normalized_text,
+    m0004_status_history_unique,
+    m0005_user_analytics_summary,
+    m0006_user_status_daily,
+    m0007_feedback_has_text_notes,
+    m0008_feedback_terms,
+    m0009_recommendation_rules,
+    m0010_reference_data_version,
+    m0011_cache_counter,
+]
+
+schema_version = Table(
+    'schema_version', MetaData(),
+    Column('version', Integer, primary_key=True, autoincrement=False),
+    Column('name', String(100), nullable=False),
+    Column('applied_at', DateTime, default=datetime.utcnow),
+)
+
+
+def applied_versions(connection):
+    schema_version.create(bind=connection, checkfirst=True)
+    return {row[0] for row in connection.execute(select(schema_version.c.version))}
+
+
+def current_version(engine):
+    with engine.begin() as connection:
+        return max(applied_versions(connection), default=0)
+
+
+def upgrade(engine, target=None):
+    """
+    Apply pending migrations in version order, each in its own transaction
+    (after its `prepare(engine)` step, if any).
+    Returns the list of (version, name) pairs that were applied.
+    """
+    with engine.begin() as connection:
+        done = applied_versions(connection)
+    applied = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version in done or (target is not None and migration.version > target):
+            continue
+        if hasattr(migration, 'prepare'):
+            migration.prepare(engine)
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(schema_version.insert().values(
+                version=migration.version, name=migration.name, applied_at=datetime.utcnow()
+            ))
+        applied.append((migration.version, migration.name))
+    return applied
@@ -0,0 +1,27 @@
+from sqlalchemy import inspect, text
+
+
+def index_exists(connection, table, name):
+    return any(ix['name'] == name for ix in inspect(connection).get_indexes(table))
+
+
+def create_index(connection, table, name, columns, unique=False):
+    """
+    Create an index unless one with the same name already exists
+    (e.g. on a database built from the models with db.create_all).
+    """
+    if index_exists(connection, table, name):
+        return False
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    connection.execute(text(f"CREATE {kind} {name} ON {table} ({', '.join(columns)})"))
+    return True
+
+
+def drop_index(connection, table, name):
+    if not index_exists(connection, table, name):
+        return False
+    if connection.dialect.name == 'mysql':
+        connection.execute(text(f"DROP INDEX {name} ON {table}"))
+    else:
+        connection.execute(text(f"DROP INDEX {name}"))
+    return True
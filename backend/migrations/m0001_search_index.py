@@ -0,0 +1,9 @@
+"""Full-text search index over job_application (see search.py)."""
+from search import create_search_index
+
+version = 1
+name = "search_index"
+
+
+def upgrade(connection):
+    create_search_index(connection)
@@ -0,0 +1,39 @@
+"""
+Composite indexes matched to the WHERE/ORDER BY shapes in routes/jobs.py
+and routes/analytics.py. Every per-user query filters on user_id first.
+
+The JobInterviewQuestion model used to declare its table as job_interview_question
+while every route queries job_interview_questions. A database built with
+db.create_all() from the old model only has the singular table; it is renamed
+here before its index is created. A database that already has
+job_interview_questions is left as it is.
+"""
+from sqlalchemy import inspect, text
+
+from migrations.helpers import create_index
+
+version = 2
+name = "index_pack"
+
+INDEXES = [
+    ('job_application', 'ix_job_application_user_status', ['user_id', 'status']),
+    ('job_application', 'ix_job_application_user_created', ['user_id', 'created_at']),
+    ('job_application', 'ix_job_application_user_applied', ['user_id', 'applied_date']),
+    ('job_application', 'ix_job_application_user_role', ['user_id', 'role_category']),
+    ('job_status_history', 'ix_job_status_history_job_date', ['job_id', 'status_date']),
+    ('feedback_strength', 'ix_feedback_strength_feedback', ['feedback_id', 'strength']),
+    ('feedback_improvement', 'ix_feedback_improvement_feedback', ['feedback_id', 'improvement']),
+    ('job_interview_questions', 'ix_job_interview_questions_job', ['job_id']),
+]
+
+
+def rename_interview_questions_table(connection):
+    tables = inspect(connection).get_table_names()
+    if 'job_interview_question' in tables and 'job_interview_questions' not in tables:
+        connection.execute(text("ALTER TABLE job_interview_question RENAME TO job_interview_questions"))
+
+
+def upgrade(connection):
+    rename_interview_questions_table(connection)
+    for table, index_name, columns in INDEXES:
+        create_index(connection, table, index_name, columns)
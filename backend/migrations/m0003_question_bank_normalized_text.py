@@ -0,0 +1,35 @@
+"""
+Normalized lookup column for question_bank, so interview questions can be matched
+to recommended ones with one indexed IN query instead of LOWER() per item.
+"""
+from sqlalchemy import inspect, text
+
+from migrations.helpers import create_index
+from models import normalize_text
+
+version = 3
+name = "question_bank_normalized_text"
+
+BATCH_SIZE = 1000
+
+
+def upgrade(connection):
+    columns = {c['name'] for c in inspect(connection).get_columns('question_bank')}
+    if 'normalized_text' not in columns:
+        connection.execute(text("ALTER TABLE question_bank ADD COLUMN normalized_text VARCHAR(255)"))
+
+    last_id = 0
+    while True:
+        rows = connection.execute(text("""
+            SELECT id, question_text FROM question_bank
+            WHERE id > :last_id ORDER BY id LIMIT :batch
+        """), {"last_id": last_id, "batch": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        connection.execute(
+            text("UPDATE question_bank SET normalized_text = :normalized WHERE id = :id"),
+            [{"id": row[0], "normalized": normalize_text(row[1])} for row in rows]
+        )
+        last_id = rows[-1][0]
+
+    create_index(connection, 'question_bank', 'ix_question_bank_normalized_text', ['normalized_text'])
@@ -0,0 +1,19 @@
+"""
+One job_status_history row per (job_id, status): removes existing duplicates in
+job id chunks, then adds the unique index that status history upserts rely on.
+"""
+from history import COMPACTION_CHUNK_SIZE, compact_status_history
+from migrations.helpers import create_index
+
+version = 4
+name = "status_history_unique"
+
+
+def prepare(engine):
+    # Each chunk commits on its own, so the table is never locked for the whole dedupe.
+    compact_status_history(engine, COMPACTION_CHUNK_SIZE)
+
+
+def upgrade(connection):
+    create_index(connection, 'job_status_history', 'uq_job_status_history_job_status',
+                 ['job_id', 'status'], unique=True)
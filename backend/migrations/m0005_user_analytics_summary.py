@@ -0,0 +1,14 @@
+"""
+Per-user analytics summary table, filled from the base tables. From here on the
+job and feedback write paths keep it current in their own transactions.
+"""
+from models import UserAnalyticsSummary
+from summary import rebuild_summary
+
+version = 5
+name = "user_analytics_summary"
+
+
+def upgrade(connection):
+    UserAnalyticsSummary.__table__.create(connection, checkfirst=True)
+    rebuild_summary(connection)
@@ -0,0 +1,14 @@
+"""
+Per-user daily status rollup behind /api/analytics/status-trends, filled from
+job_status_history. History writes keep it current from here on.
+"""
+from models import UserStatusDaily
+from rollup import rebuild_status_rollup
+
+version = 6
+name = "user_status_daily"
+
+
+def upgrade(connection):
+    UserStatusDaily.__table__.create(connection, checkfirst=True)
+    rebuild_status_rollup(connection)
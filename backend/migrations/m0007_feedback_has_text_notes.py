@@ -0,0 +1,31 @@
+"""
+Stored has_text_notes flag on feedback, replacing the REGEXP '^[A-Za-z]' filter
+in feedback insights with a stored boolean.
+"""
+from sqlalchemy import inspect, text
+
+from models import has_text_notes
+
+version = 7
+name = "feedback_has_text_notes"
+
+BATCH_SIZE = 1000
+
+
+def upgrade(connection):
+    columns = {c['name'] for c in inspect(connection).get_columns('feedback')}
+    if 'has_text_notes' not in columns:
+        connection.execute(text("ALTER TABLE feedback ADD COLUMN has_text_notes BOOLEAN NOT NULL DEFAULT 0"))
+
+    last_id = 0
+    while True:
+        rows = connection.execute(text("""
+            SELECT id, notes FROM feedback
+            WHERE id > :last_id ORDER BY id LIMIT :batch
+        """), {"last_id": last_id, "batch": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        flagged = [{"id": row[0]} for row in rows if has_text_notes(row[1])]
+        if flagged:
+            connection.execute(text("UPDATE feedback SET has_text_notes = 1 WHERE id = :id"), flagged)
+        last_id = rows[-1][0]
@@ -0,0 +1,45 @@
+"""
+feedback_term dictionary for strength/improvement wording, with a term_id on
+every feedback_strength and feedback_improvement row, so top-N insights group
+on an integer instead of the free-text column.
+"""
+from sqlalchemy import inspect, text
+
+from migrations.helpers import create_index
+from models import FeedbackTerm
+from terms import term_ids, term_key
+
+version = 8
+name = "feedback_terms"
+
+BATCH_SIZE = 1000
+
+EXTRAS_TABLES = (('feedback_strength', 'strength'), ('feedback_improvement', 'improvement'))
+
+
+def _backfill(connection, table, column):
+    last_id = 0
+    while True:
+        rows = connection.execute(text(f"""
+            SELECT id, {column} FROM {table}
+            WHERE id > :last_id AND term_id IS NULL ORDER BY id LIMIT :batch
+        """), {"last_id": last_id, "batch": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        ids = term_ids(connection, [row[1] for row in rows])
+        updates = [{"id": row[0], "term_id": ids[term_key(row[1])]} for row in rows if term_key(row[1])]
+        if updates:
+            connection.execute(text(f"UPDATE {table} SET term_id = :term_id WHERE id = :id"), updates)
+        last_id = rows[-1][0]
+
+
+def upgrade(connection):
+    # The model declares normalized_text with the utf8mb4_bin collation on MySQL,
+    # so the CREATE TABLE carries it.
+    FeedbackTerm.__table__.create(connection, checkfirst=True)
+    for table, column in EXTRAS_TABLES:
+        columns = {c['name'] for c in inspect(connection).get_columns(table)}
+        if 'term_id' not in columns:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN term_id INTEGER NULL REFERENCES feedback_term (id)"))
+        _backfill(connection, table, column)
+        create_index(connection, table, f'ix_{table}_feedback_term', ['feedback_id', 'term_id'])
@@ -0,0 +1,25 @@
+"""
+recommendation_rule table behind the feedback insights advice, seeded with the
+rules that used to be hard-coded in the analytics route.
+"""
+from datetime import datetime
+
+from sqlalchemy import func, insert, select
+
+from models import RecommendationRule
+from recommendations import DEFAULT_RULES
+
+version = 9
+name = "recommendation_rules"
+
+
+def upgrade(connection):
+    table = RecommendationRule.__table__
+    table.create(connection, checkfirst=True)
+    if connection.execute(select(func.count()).select_from(table)).scalar():
+        return
+    now = datetime.utcnow()
+    connection.execute(insert(table), [
+        {"kind": kind, "keyword": keyword, "advice": advice, "weight": 1.0, "updated_at": now}
+        for kind, keyword, advice in DEFAULT_RULES
+    ])
@@ -0,0 +1,19 @@
+"""
+reference_data_version table: one change counter per cached reference table.
+"""
+from sqlalchemy import insert, select
+
+from models import ReferenceDataVersion
+from reference import LOADERS
+
+version = 10
+name = "reference_data_version"
+
+
+def upgrade(connection):
+    table = ReferenceDataVersion.__table__
+    table.create(connection, checkfirst=True)
+    present = set(connection.execute(select(table.c.name)).scalars())
+    missing = [{"name": table_name, "version": 1} for table_name in LOADERS if table_name not in present]
+    if missing:
+        connection.execute(insert(table), missing)
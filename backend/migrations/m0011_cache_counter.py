@@ -0,0 +1,11 @@
+"""
+cache_counter table: analytics cache generations shared between worker processes.
+"""
+from models import CacheCounter
+
+version = 11
+name = "cache_counter"
+
+
+def upgrade(connection):
+    CacheCounter.__table__.create(connection, checkfirst=True)
@@ -1,6 +1,28 @@
+import re
 from datetime import datetime
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import validates
 from extensions import db
 
+
+def normalize_text(value):
+    """Case-fold and collapse whitespace, so equivalent free-text entries compare equal."""
+    return re.sub(r"\s+", " ", (value or "")).strip().casefold()
+
+
+def _normalized_question(context):
+    return normalize_text(context.get_current_parameters().get("question_text"))
+
+
+def has_text_notes(notes):
+    """True when feedback notes start with an ASCII letter (what insights list as written notes)."""
+    return bool(notes) and notes[0].isascii() and notes[0].isalpha()
+
+
+def _has_text_notes(context):
+    return has_text_notes(context.get_current_parameters().get("notes"))
+
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
@@ -20,6 +42,12 @@ class User(db.Model):
 
 
 class JobApplication(db.Model):
+    __table_args__ = (
+        db.Index('ix_job_application_user_status', 'user_id', 'status'),
+        db.Index('ix_job_application_user_created', 'user_id', 'created_at'),
+        db.Index('ix_job_application_user_applied', 'user_id', 'applied_date'),
+        db.Index('ix_job_application_user_role', 'user_id', 'role_category'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     job_title = db.Column(db.String(100), nullable=False)
@@ -44,6 +72,10 @@ class JobApplication(db.Model):
         }
 
 
+# Category for feedback submitted without one ("General"); the row must exist.
+DEFAULT_CATEGORY_ID = 100
+
+
 class FeedbackCategory(db.Model):
     __tablename__ = 'feedback_category'
     id = db.Column(db.Integer, primary_key=True)
@@ -65,8 +97,14 @@ class Feedback(db.Model):
     category_id = db.Column(db.Integer, db.ForeignKey('feedback_category.id'), nullable=False)
     notes = db.Column(db.String(50), nullable=True) 
     detailed_feedback = db.Column(db.Text, nullable=True) 
+    has_text_notes = db.Column(db.Boolean, nullable=False, default=_has_text_notes, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    @validates('notes')
+    def _sync_has_text_notes(self, key, value):
+        self.has_text_notes = has_text_notes(value)
+        return value
+
     def serialize(self):
         return {
             "id": self.id,
@@ -78,16 +116,38 @@ class Feedback(db.Model):
         }
 
 
+class FeedbackTerm(db.Model):
+    """
+    Dictionary of strength and improvement wording: one row per normalize_text()
+    form, so "Communication" and "communication " share an id. `label` keeps the
+    first spelling seen, for display.
+    """
+    __tablename__ = 'feedback_term'
+    id = db.Column(db.Integer, primary_key=True)
+    # Binary collation on MySQL: the default one is case- and accent-insensitive
+    # and would fold keys that normalize_text() keeps apart.
+    normalized_text = db.Column(
+        db.String(255).with_variant(mysql.VARCHAR(255, charset='utf8mb4', collation='utf8mb4_bin'), 'mysql'),
+        unique=True, nullable=False
+    )
+    label = db.Column(db.String(255), nullable=False)
+
+
 class FeedbackStrength(db.Model):
     """
     Stores key strengths for feedback.
     Each row represents either a priority or an additional strength.
     """
     __tablename__ = 'feedback_strength'
+    __table_args__ = (
+        db.Index('ix_feedback_strength_feedback', 'feedback_id', 'strength'),
+        db.Index('ix_feedback_strength_feedback_term', 'feedback_id', 'term_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     feedback_id = db.Column(db.Integer, db.ForeignKey('feedback.id', ondelete='CASCADE'), nullable=False)
     is_priority = db.Column(db.Boolean, nullable=False, default=False)
     strength = db.Column(db.String(255), nullable=False)
+    term_id = db.Column(db.Integer, db.ForeignKey('feedback_term.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def serialize(self):
@@ -106,10 +166,15 @@ class FeedbackImprovement(db.Model):
     Each row represents either a priority or an additional improvement.
     """
     __tablename__ = 'feedback_improvement'
+    __table_args__ = (
+        db.Index('ix_feedback_improvement_feedback', 'feedback_id', 'improvement'),
+        db.Index('ix_feedback_improvement_feedback_term', 'feedback_id', 'term_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     feedback_id = db.Column(db.Integer, db.ForeignKey('feedback.id', ondelete='CASCADE'), nullable=False)
     is_priority = db.Column(db.Boolean, nullable=False, default=False)
     improvement = db.Column(db.String(255), nullable=False)
+    term_id = db.Column(db.Integer, db.ForeignKey('feedback_term.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def serialize(self):
@@ -130,6 +195,12 @@ class QuestionBank(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     question_text = db.Column(db.String(255), unique=True, nullable=False)
     category = db.Column(db.String(100), nullable=True) 
+    normalized_text = db.Column(db.String(255), nullable=True, index=True, default=_normalized_question)
+
+    @validates('question_text')
+    def _sync_normalized_text(self, key, value):
+        self.normalized_text = normalize_text(value)
+        return value
 
     def serialize(self):
         return {
@@ -146,7 +217,10 @@ class JobInterviewQuestion(db.Model):
     or store a custom question in `custom_question`.
     The candidate's answer is stored in `answer`.
     """
-    __tablename__ = 'job_interview_question'
+    __tablename__ = 'job_interview_questions'
+    __table_args__ = (
+        db.Index('ix_job_interview_questions_job', 'job_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     job_id = db.Column(db.Integer, db.ForeignKey('job_application.id'), nullable=False)
     question_id = db.Column(db.Integer, db.ForeignKey('question_bank.id'), nullable=True)
@@ -167,6 +241,10 @@ class JobInterviewQuestion(db.Model):
 
 class JobStatusHistory(db.Model):
     __tablename__ = 'job_status_history'
+    __table_args__ = (
+        db.Index('ix_job_status_history_job_date', 'job_id', 'status_date'),
+        db.Index('uq_job_status_history_job_status', 'job_id', 'status', unique=True),
+    )
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     job_id = db.Column(db.Integer, db.ForeignKey('job_application.id', ondelete='CASCADE'), nullable=False)
     status = db.Column(db.Enum('applied', 'interview', 'offer', 'accepted', 'rejected'), nullable=False, default='applied')
@@ -180,4 +258,64 @@ class JobStatusHistory(db.Model):
             "status": self.status,
             "status_date": self.status_date.isoformat() if self.status_date else None,
             "created_at": self.created_at.isoformat()
-        }
\ No newline at end of file
+        }
+
+class UserAnalyticsSummary(db.Model):
+    """
+    Running per-user counters behind the dashboard, keyed on (user_id, dimension, value):
+    dimension 'total' (value ''), 'status' (application status) or 'feedback_type'
+    (feedback category type). Maintained by summary.adjust_summary in the same
+    transaction as the writes it counts.
+    """
+    __tablename__ = 'user_analytics_summary'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    dimension = db.Column(db.String(20), primary_key=True)
+    value = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class UserStatusDaily(db.Model):
+    """
+    Per-user daily counts of status history rows, keyed on (user_id, day, status).
+    Maintained by rollup.adjust_status_rollup alongside every history write.
+    """
+    __tablename__ = 'user_status_daily'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class RecommendationRule(db.Model):
+    """
+    Keyword -> advice rule for feedback insights. A rule matches strengths or
+    improvements (`kind`) whose wording contains `keyword`; matches are scored by
+    `weight` times how often the wording occurs. See recommendations.py.
+    """
+    __tablename__ = 'recommendation_rule'
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False, default='improvement')
+    keyword = db.Column(db.String(100), nullable=False)
+    advice = db.Column(db.Text, nullable=False)
+    weight = db.Column(db.Float, nullable=False, default=1.0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ReferenceDataVersion(db.Model):
+    """
+    Change counter per reference table (feedback_category, question_bank). Bumped
+    after admin edits so the process-local reference caches reload; see reference.py.
+    """
+    __tablename__ = 'reference_data_version'
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=1)
+
+
+class CacheCounter(db.Model):
+    """
+    Analytics cache generations shared by every worker process on this database
+    (one row per counter key, e.g. "generation:42"); see cache.DatabaseCounters.
+    """
+    __tablename__ = 'cache_counter'
+    name = db.Column(db.String(100), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
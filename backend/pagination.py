@@ -0,0 +1,107 @@
+import base64
+import json
+from datetime import date, datetime
+
+VALID_SORT_BY = ['applied_date', 'job_title', 'company', 'created_at']
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _serialize_value(value):
+    if value is None:
+        return None
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _parse_value(sort_by, value):
+    if value is None:
+        return None
+    if sort_by == 'applied_date':
+        return date.fromisoformat(value[:10])
+    if sort_by == 'created_at':
+        return datetime.fromisoformat(value)
+    return value
+
+
+def encode_cursor(sort_by, sort_order, value, row_id, direction='next'):
+    """
+    Build an opaque cursor pointing at a row of the job listing.
+    The cursor carries the sort key and id of the row, plus the sort it was issued for.
+    """
+    payload = {
+        "s": sort_by,
+        "o": sort_order,
+        "v": _serialize_value(value),
+        "id": row_id,
+        "d": direction
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor.
+    Raises InvalidCursor if it has been tampered with or is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        sort_by = payload["s"]
+        sort_order = payload["o"]
+        direction = payload.get("d", "next")
+        row_id = int(payload["id"])
+        if sort_by not in VALID_SORT_BY or sort_order not in ('asc', 'desc') or direction not in ('next', 'prev'):
+            raise InvalidCursor("Invalid cursor")
+        value = _parse_value(sort_by, payload.get("v"))
+    except InvalidCursor:
+        raise
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    return {
+        "sort_by": sort_by,
+        "sort_order": sort_order,
+        "value": value,
+        "id": row_id,
+        "direction": direction
+    }
+
+
+def keyset_clause(column, sort_order, value, forward=True, id_column='ja.id'):
+    """
+    Return the SQL range predicate selecting rows that come after (value, id)
+    in the listing order `column sort_order, id_column DESC`, or before it when
+    forward is False. Binds :cursor_value and :cursor_id.
+
+    NULLs sort first ascending and last descending on both MySQL and SQLite,
+    so a NULL sort key is treated as smaller than any other value.
+    """
+    ascending = (sort_order == 'asc') == forward
+    id_op = "<" if forward else ">"
+    id_tiebreak = f"{id_column} {id_op} :cursor_id"
+
+    if value is None:
+        if ascending:
+            return f"(({column} IS NULL AND {id_tiebreak}) OR {column} IS NOT NULL)"
+        return f"({column} IS NULL AND {id_tiebreak})"
+
+    op = ">" if ascending else "<"
+    clause = f"{column} {op} :cursor_value OR ({column} = :cursor_value AND {id_tiebreak})"
+    if not ascending:
+        clause += f" OR {column} IS NULL"
+    return f"({clause})"
+
+
+def order_clause(column, sort_order, forward=True, id_column='ja.id'):
+    """
+    ORDER BY for the listing, reversed when paging backwards so the
+    predicate can stop after `limit` rows; callers flip the rows back.
+    """
+    if forward:
+        return f"{column} {sort_order}, {id_column} DESC"
+    reverse = 'asc' if sort_order == 'desc' else 'desc'
+    return f"{column} {reverse}, {id_column} ASC"
@@ -0,0 +1,104 @@
+import re
+from collections import defaultdict
+
+from sqlalchemy import select
+
+from extensions import db
+from models import RecommendationRule, normalize_text
+
+RULE_KINDS = ('improvement', 'strength')
+RECOMMENDATION_LIMIT = 3
+FALLBACK_ADVICE = "Review recurring feedback themes and pursue targeted training or mentoring."
+NO_IMPROVEMENTS = "No common improvement areas identified."
+
+# Seeded by migration 0009; the advice the insights endpoint gave before rules lived in a table.
+DEFAULT_RULES = [
+    ('improvement', 'communication',
+     "Your feedback suggests improving communication skills—consider a public speaking course or Toastmasters."),
+    ('improvement', 'time', "Time management was flagged—try scheduling tools or time-management workshops."),
+    ('improvement', 'technical', "Enhance technical skills via advanced courses, projects, or mentorship."),
+    ('improvement', 'leadership', "Leadership training or mentorship could strengthen your leadership capabilities."),
+]
+
+
+def _keyword_pattern(keyword):
+    return r"\s+".join(map(re.escape, keyword.split(" ")))
+
+
+class RuleMatcher:
+    """
+    All keywords of a kind compiled into one pattern that tries every keyword, each
+    in its own lookahead, at every word start. A term is scanned once however many
+    rules there are, and overlapping keywords all match: "Time management" scores
+    both a "time" and a "time management" rule. Keywords match at the start of a
+    word, case-insensitively and with any run of whitespace between words.
+    """
+    def __init__(self, rules):
+        self.rules = list(rules)
+        by_keyword = {kind: defaultdict(list) for kind in RULE_KINDS}
+        for index, rule in enumerate(self.rules):
+            keyword = normalize_text(rule["keyword"])
+            if keyword and rule["kind"] in by_keyword:
+                by_keyword[rule["kind"]][keyword].append(index)
+        self._patterns = {}
+        self._group_rules = {}
+        for kind, keywords in by_keyword.items():
+            if keywords:
+                # (?=(keyword)|) always succeeds and captures the keyword if it is there.
+                lookaheads = "".join(f"(?=({_keyword_pattern(keyword)})|)" for keyword in keywords)
+                self._patterns[kind] = re.compile(rf"\b{lookaheads}", re.IGNORECASE)
+                self._group_rules[kind] = list(keywords.values())
+
+    def score(self, terms):
+        """
+        Score rules against (kind, text, count) terms: each keyword found in a term
+        adds weight * count to its rules, once per term. Returns {rule index: score}.
+        """
+        scores = defaultdict(float)
+        for kind, term, count in terms:
+            pattern = self._patterns.get(kind)
+            if pattern is None:
+                continue
+            found = set()
+            for match in pattern.finditer(term):
+                found.update(group for group, text in enumerate(match.groups()) if text is not None)
+            for group in found:
+                for index in self._group_rules[kind][group]:
+                    scores[index] += self.rules[index]["weight"] * count
+        return scores
+
+    def recommend(self, terms, limit=RECOMMENDATION_LIMIT):
+        """Advice of the `limit` best-scoring rules, highest first; ties keep rule order."""
+        scores = self.score(terms)
+        ranked = sorted((index for index, score in scores.items() if score > 0),
+                        key=lambda index: (-scores[index], index))
+        advice = []
+        for index in ranked:
+            if self.rules[index]["advice"] not in advice:
+                advice.append(self.rules[index]["advice"])
+            if len(advice) == limit:
+                break
+        return advice
+
+
+def load_rules():
+    """
+    Reference-cache loader for recommendation_rule: the rules as data and their
+    RuleMatcher as the index, rebuilt only when the table's version is bumped.
+    """
+    table = RecommendationRule.__table__
+    rows = [dict(row) for row in db.session.execute(
+        select(table.c.kind, table.c.keyword, table.c.advice, table.c.weight).order_by(table.c.id)
+    ).mappings()]
+    return rows, RuleMatcher(rows)
+
+
+def recommendations(matcher, strengths, improvements):
+    """
+    Advice from `matcher` for a user's strengths and improvements, each a list of
+    (text, count) covering all of their distinct wording.
+    """
+    terms = [('strength', term, count) for term, count in strengths]
+    terms += [('improvement', term, count) for term, count in improvements]
+    advice = matcher.recommend(terms) if terms else []
+    return advice or [FALLBACK_ADVICE if improvements else NO_IMPROVEMENTS]
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import threading
+import time
+from collections import namedtuple
+
+from flask import current_app, jsonify, request
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import select
+
+from extensions import db
+from models import FeedbackCategory, QuestionBank, ReferenceDataVersion
+from recommendations import load_rules
+
+REFERENCE_CHECK_SECONDS = 30
+REFERENCE_CACHE_CONTROL = "private, no-cache"
+
+ReferenceEntry = namedtuple('ReferenceEntry', 'version etag data index')
+
+
+def _load_feedback_categories():
+    rows = FeedbackCategory.query.order_by(FeedbackCategory.name.asc()).all()
+    return [c.serialize() for c in rows], None
+
+
+def _load_question_bank():
+    table = QuestionBank.__table__
+    rows = db.session.execute(
+        select(table.c.id, table.c.question_text, table.c.category, table.c.normalized_text).order_by(table.c.id)
+    ).fetchall()
+    questions = [{"id": row[0], "text": row[1], "category": row[2]} for row in rows]
+    return questions, {row[3]: row[0] for row in rows if row[3]}
+
+
+LOADERS = {
+    'feedback_category': _load_feedback_categories,
+    'question_bank': _load_question_bank,
+    'recommendation_rule': load_rules,
+}
+
+
+class ReferenceCache:
+    """
+    Process-local copy of reference tables that only admins edit. Each table has
+    a version row in reference_data_version. The versions are re-read at most
+    every `check_interval` seconds, and a table is reloaded only when its version
+    has moved. `index` holds a loader-specific lookup (question ids by
+    normalized_text for the question bank, the RuleMatcher for recommendation
+    rules).
+    """
+    def __init__(self, loaders, check_interval=REFERENCE_CHECK_SECONDS):
+        self.loaders = loaders
+        self.check_interval = check_interval
+        self._entries = {}
+        self._versions = {}
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def _current_versions(self):
+        table = ReferenceDataVersion.__table__
+        return dict(db.session.execute(select(table.c.name, table.c.version)).fetchall())
+
+    def get(self, name):
+        with self._lock:
+            now = time.monotonic()
+            if self._checked_at is None or now - self._checked_at >= self.check_interval:
+                self._versions = self._current_versions()
+                self._checked_at = now
+            version = self._versions.get(name, 0)
+            entry = self._entries.get(name)
+            if entry is None or entry.version != version:
+                data, index = self.loaders[name]()
+                digest = hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()[:20]
+                entry = ReferenceEntry(version, f"{name}-{version}-{digest}", data, index)
+                self._entries[name] = entry
+            return entry
+
+    def warm(self):
+        """Load every table now rather than on first use."""
+        for name in self.loaders:
+            self.get(name)
+
+    def invalidate(self):
+        """Force a version check on the next get()."""
+        with self._lock:
+            self._checked_at = None
+
+    def clear(self):
+        """Forget every loaded table, e.g. when an app is bound to another database."""
+        with self._lock:
+            self._entries = {}
+            self._versions = {}
+            self._checked_at = None
+
+
+def configure_reference_cache(app, warm=True):
+    """
+    Give `app` its own ReferenceCache, so apps bound to different databases never
+    share tables. With `warm`, every table is loaded now rather than on first use;
+    if the schema is not there yet (e.g. before db-upgrade) loading is left to the
+    first request.
+    """
+    cache = ReferenceCache(LOADERS)
+    app.extensions['reference_cache'] = cache
+    if warm:
+        with app.app_context():
+            try:
+                cache.warm()
+            except SQLAlchemyError as e:
+                cache.clear()
+                print(f"⚠️ Reference data not preloaded, loading on first use: {e.__class__.__name__}")
+    return cache
+
+
+def reference_cache():
+    """The current app's ReferenceCache."""
+    return current_app.extensions['reference_cache']
+
+
+def bump_reference_version(connection, name):
+    """Record an edit to a reference table, so every process reloads it on its next check."""
+    table = ReferenceDataVersion.__table__
+    updated = connection.execute(
+        table.update().where(table.c.name == name).values(version=table.c.version + 1)
+    ).rowcount
+    if not updated:
+        connection.execute(table.insert().values(name=name, version=1))
+
+
+def reference_response(entry):
+    """
+    JSON response for a reference entry with its ETag and a Cache-Control that
+    makes browsers revalidate; a matching If-None-Match gets an empty 304.
+    """
+    response = jsonify(entry.data)
+    response.set_etag(entry.etag)
+    response.headers["Cache-Control"] = REFERENCE_CACHE_CONTROL
+    return response.make_conditional(request)
@@ -0,0 +1,123 @@
+import atexit
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+from flask import g, request
+from flask_jwt_extended import get_jwt_identity
+
+REQUEST_LOGGER = "jam.requests"
+
+
+def _user_id():
+    # Only reads what @jwt_required() already verified; never decodes the token itself.
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        return None
+
+
+def _level(status, duration_ms, slow_ms):
+    if status >= 500:
+        return logging.ERROR
+    if status >= 400 or duration_ms >= slow_ms:
+        return logging.WARNING
+    return logging.INFO
+
+
+class RequestLog:
+    """
+    One app's request log: its settings, a queue, and the listener thread that
+    writes queued records to `handler`. Stopped at interpreter exit.
+    """
+    def __init__(self, handler, level=logging.INFO, sample_rate=1.0, slow_ms=1000):
+        self.level = level
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        queue = SimpleQueue()
+        self._queue_handler = QueueHandler(queue)
+        self._lock = threading.Lock()
+        self.listener = QueueListener(queue, handler)
+        self.listener.start()
+        atexit.register(self.stop)
+
+    def log(self, level, message):
+        with self._lock:
+            if self.listener is None:
+                return
+            self._queue_handler.handle(logging.LogRecord(REQUEST_LOGGER, level, __file__, 0, message, None, None))
+
+    def stop(self):
+        """Write out queued records and stop the listener thread."""
+        with self._lock:
+            listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.stop()
+            atexit.unregister(self.stop)
+
+
+def configure_request_logging(app, handler=None):
+    """
+    One JSON line per request (method, route, status, duration_ms, user_id),
+    named "jam.requests". Records go through the app's own queue, and a listener
+    thread writes them to `handler` (stderr by default), so requests never block
+    on output. The RequestLog lives in app.extensions["request_log"]; calling
+    this again for the same app stops the old listener and swaps in a new one.
+
+    REQUEST_LOG_LEVEL drops records below that level. REQUEST_LOG_SAMPLE_RATE keeps
+    that fraction of INFO records. Errors, 4xx responses and requests slower than
+    REQUEST_LOG_SLOW_MS log at WARNING or above and are never sampled out.
+    """
+    if handler is None:
+        handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    request_log = RequestLog(
+        handler,
+        level=logging.getLevelName(str(app.config.get("REQUEST_LOG_LEVEL", "INFO")).upper()),
+        sample_rate=float(app.config.get("REQUEST_LOG_SAMPLE_RATE", 1.0)),
+        slow_ms=float(app.config.get("REQUEST_LOG_SLOW_MS", 1000)),
+    )
+    previous = app.extensions.get("request_log")
+    app.extensions["request_log"] = request_log
+    if previous is not None:
+        previous.stop()
+        return request_log
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def log_request(response):
+        started = g.pop("request_started", None)
+        if started is None:
+            return response
+        log = app.extensions["request_log"]
+        duration_ms = (time.perf_counter() - started) * 1000
+        record_level = _level(response.status_code, duration_ms, log.slow_ms)
+        if record_level < log.level:
+            return response
+        if record_level == logging.INFO and log.sample_rate < 1.0 and random.random() >= log.sample_rate:
+            return response
+        log.log(record_level, json.dumps({
+            "method": request.method,
+            "route": request.url_rule.rule if request.url_rule else None,
+            "status": response.status_code,
+            "duration_ms": round(duration_ms, 2),
+            "user_id": _user_id(),
+        }))
+        return response
+
+    return request_log
+
+
+def stop_request_logging(app):
+    """Write out the app's queued records and stop its listener thread."""
+    request_log = app.extensions.get("request_log")
+    if request_log is not None:
+        request_log.stop()
@@ -0,0 +1,141 @@
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+from sqlalchemy import Date, bindparam, delete, func, insert, select, text
+
+from extensions import db
+from models import JobApplication, JobStatusHistory, UserStatusDaily
+from summary import counter_upsert
+
+TREND_BUCKETS = ('day', 'week', 'month')
+TREND_STATUSES = ('interview', 'offer', 'accepted', 'rejected')
+DEFAULT_TREND_POINTS = {'day': 30, 'week': 26, 'month': 12}
+MAX_TREND_POINTS = 366
+
+# Bucket start for a DATE column: the day itself, the Monday of its week, or the
+# first of its month.
+BUCKET_EXPRESSIONS = {
+    'mysql': {
+        'day': "day",
+        'week': "DATE_SUB(day, INTERVAL WEEKDAY(day) DAY)",
+        'month': "DATE_SUB(day, INTERVAL DAYOFMONTH(day) - 1 DAY)",
+    },
+    'sqlite': {
+        'day': "day",
+        'week': "date(day, '-' || ((CAST(strftime('%w', day) AS INTEGER) + 6) % 7) || ' days')",
+        'month': "date(day, 'start of month')",
+    },
+}
+
+
+def adjust_status_rollup(user_id, deltas, connection=None):
+    """
+    Apply (status, day) -> delta changes to a user's daily rollup with one upsert,
+    inside the caller's transaction (the session's unless `connection` is given).
+    """
+    rows = [{"user_id": int(user_id), "status": status, "day": day, "count": delta}
+            for (status, day), delta in deltas.items() if delta and day]
+    if not rows:
+        return
+    connection = connection if connection is not None else db.session.connection()
+    statement = counter_upsert(UserStatusDaily.__table__, connection.dialect.name)
+    connection.execute(statement, rows)
+
+
+def bucket_start(bucket, day):
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(bucket, start):
+    if bucket == 'week':
+        return start + timedelta(days=7)
+    if bucket == 'month':
+        return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start + timedelta(days=1)
+
+
+def bucket_starts(bucket, start, end):
+    """Every bucket start from the bucket containing `start` through the one containing `end`."""
+    current = bucket_start(bucket, start)
+    starts = []
+    while current <= end:
+        starts.append(current)
+        current = _next_bucket(bucket, current)
+    return starts
+
+
+def default_trend_start(bucket, end):
+    """Start of the range holding DEFAULT_TREND_POINTS buckets up to and including `end`."""
+    start = bucket_start(bucket, end)
+    for _ in range(DEFAULT_TREND_POINTS[bucket] - 1):
+        start = bucket_start(bucket, start - timedelta(days=1))
+    return start
+
+
+def status_trends(user_id, bucket, start, end):
+    """
+    Rollup counts between `start` and `end` (inclusive) per (status, bucket),
+    summed in SQL. Returns one point per status and bucket, zero-filled, so the
+    size depends only on the requested range.
+    """
+    connection = db.session.connection()
+    expression = BUCKET_EXPRESSIONS[connection.dialect.name][bucket]
+    query = text(f"""
+        SELECT status, {expression} AS bucket, SUM(count) AS count
+        FROM user_status_daily
+        WHERE user_id = :user_id AND day >= :start AND day <= :end
+        GROUP BY status, {expression}
+    """).bindparams(bindparam("start", type_=Date), bindparam("end", type_=Date))
+    rows = db.session.execute(query, {"user_id": user_id, "start": start, "end": end}).fetchall()
+    counts = {(status, str(bucket_value)[:10]): int(count) for status, bucket_value, count in rows}
+    return [{
+        "status": status,
+        "status_date": bucket_day.isoformat(),
+        "count": counts.get((status, bucket_day.isoformat()), 0)
+    } for bucket_day in bucket_starts(bucket, start, end) for status in TREND_STATUSES]
+
+
+def compute_status_rollup(connection):
+    """Recount the daily rollup from job_status_history: {user_id: Counter((status, day))}."""
+    history = JobStatusHistory.__table__
+    jobs = JobApplication.__table__
+    expected = defaultdict(Counter)
+    for user_id, status, day, count in connection.execute(
+            select(jobs.c.user_id, history.c.status, history.c.status_date, func.count())
+            .select_from(history.join(jobs, jobs.c.id == history.c.job_id))
+            .where(history.c.status_date.is_not(None))
+            .group_by(jobs.c.user_id, history.c.status, history.c.status_date)):
+        expected[user_id][(status, day)] = count
+    return expected
+
+
+def verify_status_rollup(connection):
+    """Returns (user_id, status, day, stored, expected) for every rollup row that is off."""
+    table = UserStatusDaily.__table__
+    expected = compute_status_rollup(connection)
+    stored = defaultdict(Counter)
+    for user_id, status, day, count in connection.execute(
+            select(table.c.user_id, table.c.status, table.c.day, table.c.count)):
+        stored[user_id][(status, day)] = count
+    mismatches = []
+    for user_id in sorted(set(expected) | set(stored)):
+        for key in sorted(set(expected[user_id]) | set(stored[user_id])):
+            if expected[user_id][key] != stored[user_id][key]:
+                mismatches.append((user_id, *key, stored[user_id][key], expected[user_id][key]))
+    return mismatches
+
+
+def rebuild_status_rollup(connection):
+    """Replace the daily rollup with a recount from job_status_history; returns the row count."""
+    table = UserStatusDaily.__table__
+    rows = [{"user_id": user_id, "status": status, "day": day, "count": count}
+            for user_id, counts in compute_status_rollup(connection).items()
+            for (status, day), count in counts.items()]
+    connection.execute(delete(table))
+    if rows:
+        connection.execute(insert(table), rows)
+    return len(rows)
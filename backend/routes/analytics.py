@@ -1,183 +1,264 @@
 from datetime import datetime
 from flask import Blueprint, request, jsonify
 from extensions import db
-from models import JobApplication, JobStatusHistory, Feedback, FeedbackCategory
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import func, text
+from sqlalchemy import DateTime, bindparam, text
+from pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_clause, order_clause
+from cache import cached_response
+from summary import read_summary
+from funnel import conversion_funnel
+from recommendations import recommendations
+from reference import reference_cache
+from rollup import (TREND_BUCKETS, MAX_TREND_POINTS, bucket_starts, default_trend_start,
+                    status_trends)
 
 analytics_bp = Blueprint('analytics', __name__)
 
+INSIGHTS_TOP_N = 5
+DETAIL_PAGE_SIZE = 20
+MAX_DETAIL_PAGE_SIZE = 100
+OVERVIEW_SECTIONS = ('dashboard', 'status_trends', 'feedback_insights', 'available_roles', 'funnel')
+
+
+class InvalidAnalyticsArgs(ValueError):
+    pass
+
+
+def _parse_day(value):
+    return datetime.strptime(value, "%Y-%m-%d").date() if value else None
+
+
+def _as_datetime(value):
+    """
+    feedback.created_at from a text() query: a datetime on MySQL, a string on
+    SQLite (raw SQL skips the column type), None on rows written before the
+    column was filled in.
+    """
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
 @analytics_bp.route('/dashboard', methods=['GET'])
 @jwt_required()
+@cached_response('dashboard')
 def get_dashboard():
     """
     Returns overall metrics for the current user:
       - Total number of job applications.
       - Breakdown of applications by final status.
+      - Breakdown of feedback by category type.
+    Served from the per-user summary table, so the cost does not grow with the
+    number of applications.
     """
     current_user_id = get_jwt_identity()
-    total = db.session.query(func.count(JobApplication.id))\
-        .filter(JobApplication.user_id == current_user_id).scalar()
+    return jsonify(read_summary(current_user_id)), 200
 
-    status_counts = db.session.query(
-        JobApplication.status, func.count(JobApplication.id)
-    ).filter(
-        JobApplication.user_id == current_user_id
-    ).group_by(JobApplication.status).all()
+def _trend_range(args):
+    """(bucket, start, end) from status-trends query args; raises InvalidAnalyticsArgs."""
+    bucket = args.get('bucket', 'day')
+    if bucket not in TREND_BUCKETS:
+        raise InvalidAnalyticsArgs(f"bucket must be one of: {', '.join(TREND_BUCKETS)}")
+    try:
+        end = _parse_day(args.get('to')) or datetime.utcnow().date()
+        start = _parse_day(args.get('from')) or default_trend_start(bucket, end)
+    except ValueError:
+        raise InvalidAnalyticsArgs("from and to must be YYYY-MM-DD dates")
+    if start > end:
+        raise InvalidAnalyticsArgs("from must not be after to")
+    if len(bucket_starts(bucket, start, end)) > MAX_TREND_POINTS:
+        raise InvalidAnalyticsArgs(f"Range spans more than {MAX_TREND_POINTS} {bucket} buckets")
+    return bucket, start, end
 
-    counts = {status: count for status, count in status_counts}
-
-    print("DEBUG: Dashboard – Total applications:", total)
-    print("DEBUG: Dashboard – Status counts:", counts)
-
-    return jsonify({
-        "total_applications": total,
-        "status_counts": counts
-    }), 200
 
 @analytics_bp.route('/status-trends', methods=['GET'])
 @jwt_required()
+@cached_response('status-trends')
 def get_status_trends():
     """
-    Returns aggregated status trends over time.
-    """
-    current_user_id = get_jwt_identity()
-    trends = db.session.query(
-        JobStatusHistory.status,
-        JobStatusHistory.status_date,
-        func.count(func.distinct(JobStatusHistory.job_id)).label("count")
-    ).join(JobApplication, JobApplication.id == JobStatusHistory.job_id)\
-     .filter(JobApplication.user_id == current_user_id)\
-     .group_by(JobStatusHistory.status, JobStatusHistory.status_date)\
-     .order_by(JobStatusHistory.status_date.asc()).all()
-
-    trend_list = []
-    for status, status_date, count in trends:
-        trend_list.append({
-            "status": status,
-            "status_date": status_date.isoformat() if status_date else None,
-            "count": count
-        })
-        print(f"DEBUG: Status trend – {status} on {status_date}: {count}")
-
-    return jsonify(trend_list), 200
-
-@analytics_bp.route('/feedback-insights', methods=['GET'])
-@jwt_required()
-def get_feedback_insights():
-    """
-    Returns aggregated feedback insights for the current user,
-    optionally filtered by a role_category if provided in ?role=...
+    Returns status counts per time bucket, from the per-user daily rollup.
+    Query params: bucket=day|week|month (default day), from/to as YYYY-MM-DD
+    (default: the last 30 days, 26 weeks or 12 months up to today).
+    Points are labelled with their bucket's start date; every status gets a point
+    for every bucket in the range, zero-filled.
     """
     current_user_id = get_jwt_identity()
-    role = request.args.get('role', None)
+    try:
+        bucket, start, end = _trend_range(request.args)
+    except InvalidAnalyticsArgs as e:
+        return jsonify({"message": str(e)}), 400
+    return jsonify(status_trends(current_user_id, bucket, start, end)), 200
 
+def _insights_scope(user_id, role):
     where_clause = "ja.user_id = :user_id"
-    params = {"user_id": current_user_id}
+    params = {"user_id": user_id}
     if role:
         where_clause += " AND ja.role_category = :role"
         params["role"] = role
+    return where_clause, params
 
-    query1 = text(f"""
-        SELECT fc.type, COUNT(*) as count
-        FROM feedback f
-        JOIN feedback_category fc ON f.category_id = fc.id
-        JOIN job_application ja ON f.job_id = ja.id
-        WHERE {where_clause}
-        GROUP BY fc.type
-    """)
-    result1 = db.session.execute(query1, params).fetchall()
-    feedback_counts = {row[0]: row[1] for row in result1}
-    print("DEBUG: Feedback counts by category:", feedback_counts)
-
-    query2 = text(f"""
-        SELECT fs.strength, COUNT(*) as count
-        FROM feedback_strength fs
-        JOIN feedback f ON fs.feedback_id = f.id
-        JOIN job_application ja ON f.job_id = ja.id
-        WHERE {where_clause}
-        GROUP BY fs.strength
-        ORDER BY count DESC
-        LIMIT 5
-    """)
-    result2 = db.session.execute(query2, params).fetchall()
-    top_strengths = [{"strength": row[0], "count": row[1]} for row in result2]
-    print("DEBUG: Top strengths:", top_strengths)
-
-    query3 = text(f"""
-        SELECT fi.improvement, COUNT(*) as count
-        FROM feedback_improvement fi
-        JOIN feedback f ON fi.feedback_id = f.id
-        JOIN job_application ja ON f.job_id = ja.id
-        WHERE {where_clause}
-        GROUP BY fi.improvement
-        ORDER BY count DESC
-        LIMIT 5
-    """)
-    result3 = db.session.execute(query3, params).fetchall()
-    top_improvements = [{"improvement": row[0], "count": row[1]} for row in result3]
-    print("DEBUG: Top improvements:", top_improvements)
 
-    query4 = text(f"""
-        SELECT ja.job_title, ja.company, f.notes, f.detailed_feedback, ja.status, f.created_at
-        FROM feedback f
-        JOIN job_application ja ON f.job_id = ja.id
-        WHERE {where_clause}
-          AND f.notes REGEXP '^[A-Za-z]'
-        ORDER BY f.created_at DESC
+def _feedback_insights(user_id, role=None, include_roles=False):
+    """
+    Category counts and top strengths/improvements for the user's feedback, from
+    one statement over a CTE of the user's applications. Strengths and improvements
+    are counted per feedback_term id, so differently cased or spaced entries of the
+    same wording count together under the term's label. With include_roles the
+    same statement also returns the user's distinct role categories (unfiltered by
+    role). Returns (insights, roles); roles is None unless requested.
+    """
+    params = {"user_id": user_id}
+    role_filter = ""
+    if role:
+        role_filter = "WHERE user_jobs.role_category = :role"
+        params["role"] = role
+    roles_part = ""
+    if include_roles:
+        roles_part = """
+        UNION ALL
+        SELECT 'role' AS kind, role_category AS value, COUNT(*) AS count
+        FROM user_jobs
+        WHERE role_category IS NOT NULL AND role_category <> ''
+        GROUP BY role_category
+        """
+
+    query = text(f"""
+        WITH user_jobs AS (
+            SELECT id, role_category
+            FROM job_application
+            WHERE user_id = :user_id
+        ),
+        scoped AS (
+            SELECT f.id, fc.type
+            FROM feedback f
+            JOIN user_jobs ON f.job_id = user_jobs.id
+            JOIN feedback_category fc ON f.category_id = fc.id
+            {role_filter}
+        )
+        SELECT 'category' AS kind, type AS value, COUNT(*) AS count
+        FROM scoped
+        GROUP BY type
+        UNION ALL
+        SELECT 'strength' AS kind, feedback_term.label AS value, strength_terms.count
+        FROM (
+            SELECT fs.term_id, COUNT(*) AS count
+            FROM feedback_strength fs
+            JOIN scoped ON fs.feedback_id = scoped.id
+            WHERE fs.term_id IS NOT NULL
+            GROUP BY fs.term_id
+        ) strength_terms
+        JOIN feedback_term ON feedback_term.id = strength_terms.term_id
+        UNION ALL
+        SELECT 'improvement' AS kind, feedback_term.label AS value, improvement_terms.count
+        FROM (
+            SELECT fi.term_id, COUNT(*) AS count
+            FROM feedback_improvement fi
+            JOIN scoped ON fi.feedback_id = scoped.id
+            WHERE fi.term_id IS NOT NULL
+            GROUP BY fi.term_id
+        ) improvement_terms
+        JOIN feedback_term ON feedback_term.id = improvement_terms.term_id
+        {roles_part}
     """)
-    result4 = db.session.execute(query4, params).fetchall()
-    detailed_feedback = [{
-        "job_title": row[0],
-        "company": row[1],
-        "notes": row[2],
-        "detailed_feedback": row[3],
-        "status": row[4],
-        "created_at": row[5].isoformat() if row[5] else None
-    } for row in result4]
-    print("DEBUG: Number of detailed feedback entries:", len(detailed_feedback))
-
-    recommendations = []
-    if top_improvements:
-        top_improve = top_improvements[0]["improvement"].lower()
-        if "communication" in top_improve:
-            recommendations.append(
-                "Your feedback suggests improving communication skills—consider a public speaking course or Toastmasters."
-            )
-        elif "time" in top_improve:
-            recommendations.append(
-                "Time management was flagged—try scheduling tools or time-management workshops."
-            )
-        elif "technical" in top_improve:
-            recommendations.append(
-                "Enhance technical skills via advanced courses, projects, or mentorship."
-            )
-        elif "leadership" in top_improve:
-            recommendations.append(
-                "Leadership training or mentorship could strengthen your leadership capabilities."
-            )
+    feedback_counts = {}
+    terms = {"strength": [], "improvement": []}
+    roles = [] if include_roles else None
+    for kind, value, count in db.session.execute(query, params):
+        if kind == 'category':
+            feedback_counts[value] = count
+        elif kind == 'role':
+            roles.append(value)
         else:
-            recommendations.append(
-                "Review recurring feedback themes and pursue targeted training or mentoring."
-            )
-    else:
-        recommendations.append("No common improvement areas identified.")
+            terms[kind].append((value, count))
+    top_strengths, top_improvements = (
+        [{kind: value, "count": count}
+         for value, count in sorted(terms[kind], key=lambda term: (-term[1], term[0]))[:INSIGHTS_TOP_N]]
+        for kind in ('strength', 'improvement')
+    )
 
-    return jsonify({
+    insights = {
         "feedback_counts": feedback_counts,
         "top_strengths": top_strengths,
         "top_improvements": top_improvements,
-        "detailed_feedback": detailed_feedback,
-        "recommendations": recommendations
-    }), 200
+        "recommendations": recommendations(reference_cache().get('recommendation_rule').index,
+                                           terms["strength"], terms["improvement"])
+    }
+    return insights, roles
 
-@analytics_bp.route('/available-roles', methods=['GET'])
+
+@analytics_bp.route('/feedback-insights', methods=['GET'])
 @jwt_required()
-def get_available_roles():
+@cached_response('feedback-insights')
+def get_feedback_insights():
     """
-    Returns the distinct role_category values for the current user.
+    Returns aggregated feedback insights for the current user,
+    optionally filtered by a role_category if provided in ?role=...
+    Category counts and the top strengths and improvements come from one query
+    over the user's feedback; the notes themselves are paged through
+    /feedback-insights/details.
+    """
+    current_user_id = get_jwt_identity()
+    insights, _ = _feedback_insights(current_user_id, request.args.get('role', None))
+    return jsonify(insights), 200
+
+@analytics_bp.route('/feedback-insights/details', methods=['GET'])
+@jwt_required()
+@cached_response('feedback-insights-details')
+def get_feedback_insight_details():
+    """
+    Returns the current user's feedback with written notes, newest first, one page
+    at a time. Accepts ?role=, ?limit= (default 20, max 100) and the ?cursor=
+    returned as next_cursor by the previous page.
     """
     current_user_id = get_jwt_identity()
+    where_clause, params = _insights_scope(current_user_id, request.args.get('role', None))
+    try:
+        limit = min(max(int(request.args.get('limit', DETAIL_PAGE_SIZE)), 1), MAX_DETAIL_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"message": "limit must be an integer"}), 400
+
+    query_params = []
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except InvalidCursor:
+            return jsonify({"message": "Invalid cursor"}), 400
+        if (position["sort_by"], position["sort_order"], position["direction"]) != ('created_at', 'desc', 'next'):
+            return jsonify({"message": "Invalid cursor"}), 400
+        where_clause += " AND " + keyset_clause("f.created_at", "desc", position["value"], id_column="f.id")
+        params["cursor_id"] = position["id"]
+        if position["value"] is not None:
+            params["cursor_value"] = position["value"]
+            query_params.append(bindparam("cursor_value", type_=DateTime))
+
+    params["limit"] = limit + 1
+    query = text(f"""
+        SELECT f.id, ja.job_title, ja.company, f.notes, f.detailed_feedback, ja.status, f.created_at
+        FROM feedback f
+        JOIN job_application ja ON f.job_id = ja.id
+        WHERE {where_clause}
+          AND f.has_text_notes = 1
+        ORDER BY {order_clause("f.created_at", "desc", id_column="f.id")}
+        LIMIT :limit
+    """).bindparams(*query_params)
+    rows = db.session.execute(query, params).fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        created_at = _as_datetime(rows[-1][6])
+        next_cursor = encode_cursor("created_at", "desc", created_at, rows[-1][0])
+
+    items = [{
+        "job_title": row[1],
+        "company": row[2],
+        "notes": row[3],
+        "detailed_feedback": row[4],
+        "status": row[5],
+        "created_at": _as_datetime(row[6]).isoformat() if row[6] else None
+    } for row in rows]
+    return jsonify({"items": items, "next_cursor": next_cursor}), 200
+
+def _available_roles(user_id):
     query = text("""
       SELECT DISTINCT role_category
       FROM job_application
@@ -185,7 +266,68 @@ def get_available_roles():
         AND role_category IS NOT NULL
         AND role_category <> ''
     """)
-    results = db.session.execute(query, {"user_id": current_user_id}).fetchall()
-    roles = [row[0] for row in results]
-    print("DEBUG: Available roles for user:", roles)
-    return jsonify(roles), 200
\ No newline at end of file
+    return [row[0] for row in db.session.execute(query, {"user_id": user_id})]
+
+
+@analytics_bp.route('/available-roles', methods=['GET'])
+@jwt_required()
+@cached_response('available-roles')
+def get_available_roles():
+    """
+    Returns the distinct role_category values for the current user.
+    """
+    current_user_id = get_jwt_identity()
+    return jsonify(_available_roles(current_user_id)), 200
+
+@analytics_bp.route('/funnel', methods=['GET'])
+@jwt_required()
+@cached_response('funnel')
+def get_funnel():
+    """
+    Returns the applied → interview → offer → accepted funnel for the current user:
+    how many applications reached each stage, the conversion rate from the
+    previous stage, and median/p90 days from the previous stage.
+    Optionally filtered by ?role=...
+    """
+    current_user_id = get_jwt_identity()
+    return jsonify(conversion_funnel(current_user_id, request.args.get('role', None))), 200
+
+@analytics_bp.route('/overview', methods=['GET'])
+@jwt_required()
+@cached_response('overview')
+def get_overview():
+    """
+    Returns several analytics sections in one response, keyed by section name.
+    ?sections= is a comma-separated subset of dashboard, status_trends,
+    feedback_insights, available_roles and funnel (default: all). The other
+    query params are those of the individual endpoints (bucket/from/to for
+    status_trends, role for feedback_insights and funnel). Feedback insights and available
+    roles share one statement when both are requested.
+    """
+    current_user_id = get_jwt_identity()
+    requested = request.args.get('sections')
+    sections = [p.strip() for p in requested.split(',') if p.strip()] if requested else list(OVERVIEW_SECTIONS)
+    unknown = [p for p in sections if p not in OVERVIEW_SECTIONS]
+    if unknown or not sections:
+        return jsonify({"message": f"sections must be a subset of: {', '.join(OVERVIEW_SECTIONS)}"}), 400
+
+    result = {}
+    try:
+        if 'status_trends' in sections:
+            bucket, start, end = _trend_range(request.args)
+            result['status_trends'] = status_trends(current_user_id, bucket, start, end)
+    except InvalidAnalyticsArgs as e:
+        return jsonify({"message": str(e)}), 400
+    if 'dashboard' in sections:
+        result['dashboard'] = read_summary(current_user_id)
+    if 'feedback_insights' in sections:
+        insights, roles = _feedback_insights(current_user_id, request.args.get('role', None),
+                                             include_roles='available_roles' in sections)
+        result['feedback_insights'] = insights
+        if roles is not None:
+            result['available_roles'] = roles
+    elif 'available_roles' in sections:
+        result['available_roles'] = _available_roles(current_user_id)
+    if 'funnel' in sections:
+        result['funnel'] = conversion_funnel(current_user_id, request.args.get('role', None))
+    return jsonify(result), 200
@@ -9,10 +9,8 @@ auth_bp = Blueprint('auth', __name__)
 @auth_bp.route('/signup', methods=['POST'])
 def signup():
     data = request.get_json()
-    print(f"🔥 Incoming Signup Request: {data}") 
 
     if not data or 'username' not in data or 'email' not in data or 'password' not in data:
-        print("❌ Missing required fields in request")
         return jsonify({'message': 'Missing required fields'}), 400
 
     username = data['username'].strip()
@@ -20,14 +18,10 @@ def signup():
     password = data['password']
     fullname = data['fullname']
 
-    print(f"🔍 Checking if user exists: {username}, {email}")
-
     if User.query.filter(User.username == username).first(): 
-      print("❌ Username already exists")
       return jsonify({'message': 'Username already exists'}), 400
 
     elif User.query.filter(User.email == email).first(): 
-      print("❌ Email already exists")
       return jsonify({'message': 'Email already exists'}), 400
 
     password_hash = generate_password_hash(password)
@@ -36,7 +30,6 @@ def signup():
         new_user = User(username=username, email=email, password_hash=password_hash, fullname=fullname)
         db.session.add(new_user)
         db.session.commit()
-        print(f"✅ User created successfully: {username}")
         return jsonify({'message': 'User created successfully'}), 201
     except Exception as e:
         db.session.rollback()
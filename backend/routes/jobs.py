@@ -1,55 +1,320 @@
 from math import ceil
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from extensions import db
-from models import JobApplication, User, FeedbackCategory, QuestionBank, JobInterviewQuestion, JobStatusHistory
+from models import JobApplication, User, Feedback, FeedbackCategory, QuestionBank, JobInterviewQuestion, JobStatusHistory, DEFAULT_CATEGORY_ID, normalize_text, has_text_notes
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask_cors import cross_origin
-from sqlalchemy import text, func
+from sqlalchemy import text, func, bindparam
+from collections import Counter, defaultdict
 from datetime import datetime
+from cache import job_count_cache, user_generation, bump_user_generation
+from search import build_search_filter
+from history import upsert_status_history, delete_status_history
+from terms import term_ids, term_key
+from reference import reference_cache, reference_response
+from summary import adjust_summary, job_deltas, status_change_deltas, feedback_change_deltas
+from importer import IMPORT_FORMATS, iter_csv_records, iter_json_records, import_records
+from export import EXPORT_FORMATS, iter_export_records, generate_csv, generate_ndjson
+from pagination import VALID_SORT_BY, InvalidCursor, decode_cursor, encode_cursor, keyset_clause, order_clause
 
 jobs_bp = Blueprint('jobs', __name__)
 
+TOTALS_MODES = ('none', 'exact', 'estimate')
+JOB_DETAIL_INCLUDES = ('feedback', 'strengths', 'improvements', 'questions', 'history')
+ESTIMATE_COUNT_CAP = 1000
+HISTORY_STATUSES = ('interview', 'offer', 'accepted', 'rejected')
+
+def _for_update_clause():
+    """
+    " FOR UPDATE" to lock the rows a read-then-write reads until commit; empty on
+    SQLite, which has no row locks and serializes writers instead.
+    """
+    return "" if db.session.get_bind().dialect.name == 'sqlite' else " FOR UPDATE"
+
+def _feedback_extra_rows(extras):
+    """
+    (is_priority, value) pairs from an extras dict with keys "priority" (string)
+    and "additional" (list of strings); values are stripped and blanks dropped.
+    """
+    rows = []
+    priority_value = (extras.get("priority") or "").strip()
+    if priority_value:
+        rows.append((1, priority_value))
+    for s in extras.get("additional", []):
+        s = s.strip()
+        if s:
+            rows.append((0, s))
+    return rows
+
+
+def _extras_column(table_name):
+    if table_name == "feedback_strength":
+        return "strength"
+    if table_name == "feedback_improvement":
+        return "improvement"
+    raise ValueError("Invalid table name: must be 'feedback_strength' or 'feedback_improvement'")
+
+
+def _insert_extra_rows(table_name, rows):
+    """Insert extras rows with their feedback_term ids as a single executemany."""
+    if not rows:
+        return
+    ids = term_ids(db.session.connection(), [row["value"] for row in rows])
+    for row in rows:
+        row["term_id"] = ids.get(term_key(row["value"]))
+    db.session.execute(text(f"""
+        INSERT INTO {table_name} (feedback_id, is_priority, {_extras_column(table_name)}, term_id)
+        VALUES (:feedback_id, :is_priority, :value, :term_id)
+    """), rows)
+
+
+def insert_feedback_extras(feedback_id, extras, table_name):
+    """
+    Insert the rows of an extras dict for a feedback row that has none yet,
+    as a single executemany.
+    """
+    _insert_extra_rows(table_name, [{"feedback_id": feedback_id, "is_priority": is_priority, "value": value}
+                                    for is_priority, value in _feedback_extra_rows(extras)])
+
+
+def _category_type(category_id):
+    return db.session.execute(
+        text("SELECT type FROM feedback_category WHERE id = :id"), {"id": category_id}
+    ).scalar()
+
+
+def _parse_stage_dates(data):
+    """
+    The non-empty interview/offer/accepted/rejected dates in a job payload as
+    {status: date}. Raises ValueError naming the first malformed field.
+    """
+    stage_dates = {}
+    for status in HISTORY_STATUSES:
+        value = data.get(f"{status}_date")
+        if not value:
+            continue
+        try:
+            stage_dates[status] = datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError(f"Invalid {status}_date format")
+    return stage_dates
+
+
+def _status_history_rows(job_id, stage_dates):
+    """Status history rows for the dates returned by _parse_stage_dates."""
+    created_at = datetime.utcnow()
+    return [{"job_id": job_id, "status": status, "created_at": created_at, "status_date": status_date}
+            for status, status_date in stage_dates.items()]
+
+
 def update_feedback_extras(feedback_id, extras, table_name):
     """
-    Delete all current rows for the given feedback_id in the specified table,
-    then insert new rows from the extras dict.
+    Sync the rows for the given feedback_id in the specified table with the extras dict.
+    Only rows that were removed are deleted and only new ones inserted, each with a
+    single statement; nothing is written when the stored rows already match.
     'extras' is expected to be a dict with keys "priority" (string) and "additional" (list of strings).
     'table_name' should be either "feedback_strength" or "feedback_improvement".
     """
+    column_name = _extras_column(table_name)
+    existing = db.session.execute(
+        text(f"SELECT id, is_priority, {column_name} FROM {table_name} WHERE feedback_id = :feedback_id"),
+        {"feedback_id": feedback_id}
+    ).fetchall()
+
+    wanted = Counter(_feedback_extra_rows(extras))
+    stale_ids = []
+    for row_id, is_priority, value in existing:
+        key = (1 if is_priority else 0, value)
+        if wanted[key] > 0:
+            wanted[key] -= 1
+        else:
+            stale_ids.append(row_id)
 
-    if table_name == "feedback_strength":
-        column_name = "strength"
-    elif table_name == "feedback_improvement":
-        column_name = "improvement"
-    else:
-        raise ValueError("Invalid table name: must be 'feedback_strength' or 'feedback_improvement'")
-    
-    delete_query = text(f"DELETE FROM {table_name} WHERE feedback_id = :feedback_id")
-    db.session.execute(delete_query, {"feedback_id": feedback_id})
-    
-    insert_query = text(f"""
-        INSERT INTO {table_name} (feedback_id, is_priority, {column_name})
-        VALUES (:feedback_id, :is_priority, :value)
+    if stale_ids:
+        delete_query = text(f"DELETE FROM {table_name} WHERE id IN :ids").bindparams(
+            bindparam("ids", expanding=True)
+        )
+        db.session.execute(delete_query, {"ids": stale_ids})
+
+    _insert_extra_rows(table_name, [{"feedback_id": feedback_id, "is_priority": is_priority, "value": value}
+                                    for (is_priority, value), count in wanted.items() for _ in range(count)])
+
+
+def _format_date(value):
+    if value and not isinstance(value, str):
+        return value.strftime("%Y-%m-%d")
+    return value
+
+
+def _serialize_job_row(row):
+    return {
+        "id": row[0],
+        "job_title": row[1],
+        "company": row[2],
+        "status": row[3],
+        "general_notes": row[4],
+        "applied_date": _format_date(row[5]),
+        "feedback": row[6]
+    }
+
+
+def _count_jobs(where_clause, params, user_id, totals, filter_key, min_cap=0):
+    """
+    Total rows matching the listing filter.
+    Exact counts are cached per (user, filter) until the user's next job write;
+    estimates count at most ESTIMATE_COUNT_CAP rows and report whether they hit the cap.
+    Returns (total, is_estimate).
+    """
+    cache_key = (str(user_id), user_generation(user_id), filter_key)
+    cached = job_count_cache().get(cache_key)
+    if cached is not None:
+        return cached, False
+
+    if totals == 'estimate':
+        cap = max(ESTIMATE_COUNT_CAP, min_cap)
+        capped_query = text(f"""
+            SELECT COUNT(*) FROM (
+                SELECT 1 FROM job_application ja WHERE {where_clause} LIMIT :count_cap
+            ) capped
+        """)
+        total = db.session.execute(capped_query, dict(params, count_cap=cap)).scalar()
+        if total < cap:
+            job_count_cache().set(cache_key, total)
+            return total, False
+        return total, True
+
+    count_query = text(f"SELECT COUNT(*) FROM job_application ja WHERE {where_clause}")
+    total = db.session.execute(count_query, params).scalar()
+    job_count_cache().set(cache_key, total)
+    return total, False
+
+
+def _list_jobs_by_cursor(where_clauses, params, sort_by, sort_order, limit, position,
+                         user_id, totals, filter_key):
+    """
+    Keyset-paginated variant of the job listing.
+    Seeks past the cursor row with a range predicate on (sort key, id) instead of
+    OFFSET, so deep pages cost the same as the first one.
+    """
+    column = f"ja.{sort_by}"
+    forward = position is None or position["direction"] == "next"
+    base_clause_count = len(where_clauses)
+    where_clauses = list(where_clauses)
+    params = dict(params, limit=limit + 1)
+    params.pop("offset", None)
+    if position is not None:
+        where_clauses.append(keyset_clause(column, sort_order, position["value"], forward))
+        params["cursor_value"] = position["value"]
+        params["cursor_id"] = position["id"]
+
+    query = text(f"""
+        SELECT 
+            ja.id, ja.job_title, ja.company, ja.status, ja.general_notes, ja.applied_date,
+            COALESCE(f.notes, 'No feedback yet') AS feedback, {column} AS sort_key
+        FROM job_application ja
+        LEFT JOIN feedback f ON ja.id = f.job_id
+        WHERE {" AND ".join(where_clauses)}
+        ORDER BY {order_clause(column, sort_order, forward)}
+        LIMIT :limit;
     """)
-    
-    if extras.get("priority"):
-        priority_value = extras["priority"].strip()
-        if priority_value:
-            db.session.execute(insert_query, {
-                "feedback_id": feedback_id,
-                "is_priority": 1,
-                "value": priority_value
-            })
-    
-    additional = extras.get("additional", [])
-    for s in additional:
-        s = s.strip()
-        if s:
-            db.session.execute(insert_query, {
-                "feedback_id": feedback_id,
-                "is_priority": 0,
-                "value": s
-            })
+    if position is not None and position["value"] is not None:
+        sort_type = JobApplication.__table__.c[sort_by].type
+        query = query.bindparams(bindparam("cursor_value", type_=sort_type))
+    results = db.session.execute(query, params).fetchall()
+
+    has_more = len(results) > limit
+    results = results[:limit]
+    if not forward:
+        results.reverse()
+
+    has_next = has_more if forward else position is not None
+    has_prev = position is not None if forward else has_more
+
+    next_cursor = prev_cursor = None
+    if results:
+        first, last = results[0], results[-1]
+        if has_next:
+            next_cursor = encode_cursor(sort_by, sort_order, last[7], last[0], "next")
+        if has_prev:
+            prev_cursor = encode_cursor(sort_by, sort_order, first[7], first[0], "prev")
+
+    response = {
+        "jobs": [_serialize_job_row(row) for row in results],
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "has_more": has_next,
+        "sort_by": sort_by,
+        "sort_order": sort_order
+    }
+    if totals != 'none':
+        count_params = {k: v for k, v in params.items() if not k.startswith("cursor_")}
+        total_jobs, is_estimate = _count_jobs(" AND ".join(where_clauses[:base_clause_count]), count_params,
+                                              user_id, totals, filter_key)
+        response.update({"totalJobs": total_jobs, "totalIsEstimate": is_estimate})
+    return jsonify(response), 200
+
+
+def _split_priority(rows):
+    priority = None
+    additional = []
+    for is_priority, value in rows:
+        if is_priority:
+            priority = value
+        else:
+            additional.append(value)
+    return {"priority": priority, "additional": additional}
+
+
+def _fetch_feedback_extras(feedback_id, kinds):
+    """
+    Strengths and/or improvements for one feedback row in a single round trip.
+    Returns {kind: {"priority": ..., "additional": [...]}} for each requested kind.
+    """
+    extras = {kind: {"priority": None, "additional": []} for kind in kinds}
+    if feedback_id is None:
+        return extras
+    selects = {
+        'strengths': "SELECT 'strengths' AS kind, is_priority, strength AS value "
+                     "FROM feedback_strength WHERE feedback_id = :feedback_id",
+        'improvements': "SELECT 'improvements' AS kind, is_priority, improvement AS value "
+                        "FROM feedback_improvement WHERE feedback_id = :feedback_id",
+    }
+    query = text(" UNION ALL ".join(selects[kind] for kind in kinds))
+    rows = db.session.execute(query, {"feedback_id": feedback_id}).fetchall()
+    for kind in kinds:
+        extras[kind] = _split_priority((row[1], row[2]) for row in rows if row[0] == kind)
+    return extras
+
+
+def _fetch_interview_questions(job_id):
+    query = text("""
+        SELECT jiq.id, jiq.question_id, qb.question_text as recommended_question, jiq.custom_question, jiq.answer
+        FROM job_interview_questions jiq
+        LEFT JOIN question_bank qb ON jiq.question_id = qb.id
+        WHERE jiq.job_id = :job_id
+    """)
+    results = db.session.execute(query, {"job_id": job_id}).fetchall()
+    questions = []
+    for row in results:
+        question_text = row[2] if row[2] is not None else row[3]
+        questions.append({
+            "id": row[0],
+            "question_id": row[1],
+            "question": question_text,
+            "answer": row[4]
+        })
+    return questions
+
+
+def _fetch_status_history(job_id):
+    query = text("""
+        SELECT id, job_id, status, status_date, created_at 
+        FROM job_status_history 
+        WHERE job_id = :job_id 
+        ORDER BY status_date ASC
+    """)
+    results = db.session.execute(query, {"job_id": job_id}).fetchall()
+    return [dict(row._mapping) for row in results]
 
 
 @jobs_bp.route('', methods=['OPTIONS'])
@@ -74,7 +339,14 @@ def create_or_list_jobs():
         if not user:
             return jsonify({'message': 'User not found'}), 404
 
-        applied_date = datetime.strptime(data['applied_date'], "%Y-%m-%d").date() if data.get('applied_date') else None
+        try:
+            applied_date = datetime.strptime(data['applied_date'], "%Y-%m-%d").date() if data.get('applied_date') else None
+        except (TypeError, ValueError):
+            return jsonify({"message": "Invalid applied_date format"}), 400
+        try:
+            stage_dates = _parse_stage_dates(data)
+        except ValueError as e:
+            return jsonify({"message": str(e)}), 400
         created_at = datetime.utcnow()
 
         job = JobApplication(
@@ -89,48 +361,33 @@ def create_or_list_jobs():
         )
         try:
             db.session.add(job)
+            db.session.flush()
+
+            feedback_type = None
+            feedback_data = data.get('feedback')
+            if feedback_data:
+                feedback = Feedback(
+                    job_id=job.id,
+                    category_id=feedback_data.get('category_id') or DEFAULT_CATEGORY_ID,
+                    notes=feedback_data.get('notes', ''),
+                    detailed_feedback=feedback_data.get('detailed_feedback', '')
+                )
+                db.session.add(feedback)
+                db.session.flush()
+                if "strengths" in feedback_data:
+                    insert_feedback_extras(feedback.id, feedback_data["strengths"], "feedback_strength")
+                if "improvements" in feedback_data:
+                    insert_feedback_extras(feedback.id, feedback_data["improvements"], "feedback_improvement")
+                feedback_type = _category_type(feedback.category_id)
+
+            upsert_status_history(current_user_id, _status_history_rows(job.id, stage_dates))
+            adjust_summary(current_user_id, job_deltas(job.status, feedback_type))
+
+            job_data = job.serialize()
             db.session.commit()
+            bump_user_generation(current_user_id)
 
-            if 'feedback' in data and data['feedback']:
-                insert_feedback_query = text("""
-                    INSERT INTO feedback (job_id, category_id, notes, detailed_feedback)
-                    VALUES (:job_id, :category_id, :notes, :detailed_feedback);
-                """)
-                db.session.execute(insert_feedback_query, {
-                    "job_id": job.id,
-                    "category_id": data['feedback'].get('category_id', None),
-                    "notes": data['feedback'].get('notes', ''),
-                    "detailed_feedback": data['feedback'].get('detailed_feedback', '')
-                })
-                db.session.commit()
-                extras = data['feedback']
-                feedback = db.session.execute(
-                    text("SELECT id FROM feedback WHERE job_id = :job_id"),
-                    {"job_id": job.id}
-                ).fetchone()
-                if feedback:
-                    feedback_id = feedback[0]
-                    if "strengths" in extras:
-                        update_feedback_extras(feedback_id, extras["strengths"], "feedback_strength")
-                    if "improvements" in extras:
-                        update_feedback_extras(feedback_id, extras["improvements"], "feedback_improvement")
-                    db.session.commit()
-
-            additional_statuses = [
-                ('interview', data.get('interview_date')),
-                ('offer', data.get('offer_date')),
-                ('accepted', data.get('accepted_date')),
-                ('rejected', data.get('rejected_date'))
-            ]
-            for status, date_val in additional_statuses:
-                if date_val:
-                    db.session.execute(text("""
-                        INSERT INTO job_status_history (job_id, status, status_date)
-                        VALUES (:job_id, :status, :status_date)
-                    """), {"job_id": job.id, "status": status, "status_date": date_val})
-            db.session.commit()
-
-            return jsonify({'message': 'Job application added', 'job': job.serialize()}), 201
+            return jsonify({'message': 'Job application added', 'job': job_data}), 201
         except Exception as e:
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
@@ -148,8 +405,21 @@ def create_or_list_jobs():
             sort_by = request.args.get('sort_by', 'created_at')
             sort_order = request.args.get('sort_order', 'desc').lower()
 
-            valid_sort_by = ['applied_date', 'job_title', 'company', 'created_at']
-            if sort_by not in valid_sort_by:
+            cursor = request.args.get('cursor', None)
+            use_cursor = cursor is not None or request.args.get('pagination') == 'cursor'
+            position = None
+            if cursor:
+                try:
+                    position = decode_cursor(cursor)
+                except InvalidCursor:
+                    return jsonify({"message": "Invalid cursor"}), 400
+                sort_by = position["sort_by"]
+                sort_order = position["sort_order"]
+
+            search_filter = build_search_filter(db.session.connection(), search) if search else None
+            rank_by_relevance = (sort_by == 'relevance' and not use_cursor
+                                 and search_filter is not None and search_filter["score"] is not None)
+            if sort_by not in VALID_SORT_BY:
                 sort_by = 'created_at'
             if sort_order not in ['asc', 'desc']:
                 sort_order = 'desc'
@@ -157,18 +427,28 @@ def create_or_list_jobs():
             where_clauses = ["ja.user_id = :user_id"]
             params = {"user_id": current_user_id, "limit": limit, "offset": offset}
 
-            if search:
-                where_clauses.append("(ja.job_title LIKE :search OR ja.company LIKE :search)")
-                params["search"] = f"%{search}%"
+            if search_filter:
+                where_clauses.append(search_filter["where"])
+                params.update(search_filter["params"])
             if status_filter:
                 where_clauses.append("ja.status = :status")
                 params["status"] = status_filter
 
-            where_clause = " AND ".join(where_clauses)
+            totals = request.args.get('totals', 'none' if use_cursor else 'exact').lower()
+            if totals not in TOTALS_MODES:
+                totals = 'none' if use_cursor else 'exact'
+            filter_key = (search or '', status_filter or '')
+
+            if use_cursor:
+                return _list_jobs_by_cursor(where_clauses, params, sort_by, sort_order, limit, position,
+                                            current_user_id, totals, filter_key)
 
-            count_query = text(f"SELECT COUNT(*) FROM job_application ja WHERE {where_clause}")
-            total_jobs = db.session.execute(count_query, params).scalar()
-            total_pages = ceil(total_jobs / limit) if limit else 1
+            where_clause = " AND ".join(where_clauses)
+            params["limit"] = limit + 1
+            if rank_by_relevance:
+                order_by = f"{search_filter['score']} DESC, ja.id DESC"
+            else:
+                order_by = f"ja.{sort_by} {sort_order}, ja.id DESC"
 
             query = text(f"""
                 SELECT 
@@ -177,27 +457,32 @@ def create_or_list_jobs():
                 FROM job_application ja
                 LEFT JOIN feedback f ON ja.id = f.job_id
                 WHERE {where_clause}
-                ORDER BY ja.{sort_by} {sort_order}, ja.id DESC
+                ORDER BY {order_by}
                 LIMIT :limit OFFSET :offset;
             """)
             results = db.session.execute(query, params).fetchall()
+            has_more = len(results) > limit
+            results = results[:limit]
 
-            job_list = [{
-                "id": row[0],
-                "job_title": row[1],
-                "company": row[2],
-                "status": row[3],
-                "general_notes": row[4],
-                "applied_date": row[5].strftime("%Y-%m-%d") if row[5] else None,
-                "feedback": row[6]
-            } for row in results]
-
-            return jsonify({
+            job_list = [_serialize_job_row(row) for row in results]
+            response = {
                 "jobs": job_list,
-                "totalPages": total_pages,
-                "totalJobs": total_jobs,
-                "currentPage": page
-            }), 200
+                "currentPage": page,
+                "has_more": has_more
+            }
+
+            if totals == 'none':
+                response.update({"totalPages": None, "totalJobs": None})
+            else:
+                total_jobs, is_estimate = _count_jobs(where_clause, params, current_user_id, totals,
+                                                      filter_key, offset + limit + 1)
+                response.update({
+                    "totalPages": ceil(total_jobs / limit) if limit else 1,
+                    "totalJobs": total_jobs,
+                    "totalIsEstimate": is_estimate
+                })
+
+            return jsonify(response), 200
 
         except Exception as e:
             print(f"❌ ERROR in create_or_list_jobs (GET): {str(e)}")
@@ -205,8 +490,67 @@ def create_or_list_jobs():
 
     return jsonify({'message': 'Invalid request method'}), 405
 
+@jobs_bp.route('/export', methods=['GET'])
+@jwt_required()
+def export_jobs():
+    """
+    Streams every application of the current user, with feedback, strengths,
+    improvements and status dates, as CSV (default) or NDJSON.
+    """
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"message": "Unsupported export format"}), 400
+
+    current_user_id = get_jwt_identity()
+    records = iter_export_records(current_user_id)
+    body = generate_csv(records) if export_format == 'csv' else generate_ndjson(records)
+    filename = f"job_applications.{export_format}"
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+@jobs_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_jobs():
+    """
+    Bulk-imports applications from an uploaded CSV or JSON array (multipart field
+    `file`, or the raw request body). Rows use the export's columns. Valid rows are
+    inserted in chunks; the response reports the rows that were rejected and why.
+    """
+    current_user_id = get_jwt_identity()
+    upload = request.files.get('file')
+    stream = upload.stream if upload else request.stream
+    import_format = request.args.get('format')
+    if not import_format:
+        name = (upload.filename or '') if upload else ''
+        content_type = (upload.mimetype if upload else request.mimetype) or ''
+        import_format = 'json' if name.lower().endswith('.json') or 'json' in content_type else 'csv'
+    import_format = import_format.lower()
+    if import_format not in IMPORT_FORMATS:
+        return jsonify({"message": "Unsupported import format"}), 400
+
+    records = iter_csv_records(stream) if import_format == 'csv' else iter_json_records(stream)
+    report = import_records(current_user_id, records)
+    if report["imported"]:
+        bump_user_generation(current_user_id)
+    status_code = 201 if report["imported"] else 400
+    return jsonify(report), status_code
+
 @jobs_bp.route('/<int:job_id>', methods=['GET'])
+@jwt_required()
 def get_job(job_id):
+    """
+    Returns one of the caller's applications with its feedback (404 for anyone
+    else's). ?include=feedback,strengths,improvements,questions,history expands
+    the listed sub-resources into the same document in a fixed number of queries;
+    with an include list, feedback is only present when it is listed.
+    """
+    includes = {part.strip() for part in request.args.get('include', '').split(',') if part.strip()}
+    unknown = includes - set(JOB_DETAIL_INCLUDES)
+    if unknown:
+        return jsonify({"message": f"Unknown include: {', '.join(sorted(unknown))}"}), 400
     try:
         query = text("""
         SELECT 
@@ -216,9 +560,9 @@ def get_job(job_id):
         FROM job_application ja
         LEFT JOIN feedback f ON ja.id = f.job_id
         LEFT JOIN feedback_category fc ON f.category_id = fc.id
-        WHERE ja.id = :job_id;
+        WHERE ja.id = :job_id AND ja.user_id = :user_id;
         """)
-        result = db.session.execute(query, {"job_id": job_id}).fetchone()
+        result = db.session.execute(query, {"job_id": job_id, "user_id": get_jwt_identity()}).fetchone()
         if not result:
             return jsonify({"message": "Job not found"}), 404
 
@@ -251,6 +595,23 @@ def get_job(job_id):
                 "category_type": result[13] if result[13] else "N/A"
             }
         }
+
+        if includes:
+            if 'feedback' not in includes:
+                del job_data["feedback"]
+            feedback_id = result[8]
+            extras = [kind for kind in ('strengths', 'improvements') if kind in includes]
+            if extras:
+                job_data.update(_fetch_feedback_extras(feedback_id, extras))
+            if 'questions' in includes:
+                job_data["interview_questions"] = _fetch_interview_questions(job_id)
+            if 'history' in includes:
+                history = _fetch_status_history(job_id)
+                job_data["status_history"] = history
+                for entry in history:
+                    date_key = f"{entry['status']}_date"
+                    if date_key in job_data and date_key != 'applied_date' and entry["status_date"]:
+                        job_data[date_key] = _format_date(entry["status_date"])
         return jsonify(job_data), 200
     except Exception as e:
         print(f"❌ ERROR in get_job: {str(e)}")
@@ -261,52 +622,57 @@ def get_job(job_id):
 def handle_feedback(job_id):
     try:
         data = request.get_json()
-        print("DEBUG: Received feedback request. Method:", request.method)
-        print("DEBUG: Feedback data:", data)
-        job_check_query = text("SELECT id, status FROM job_application WHERE id = :job_id")
+        # Locking the job serialises concurrent writes to its feedback, so the old
+        # category type read below is still current when the summary is adjusted.
+        job_check_query = text("SELECT id, status, user_id FROM job_application WHERE id = :job_id"
+                               + _for_update_clause())
         job = db.session.execute(job_check_query, {"job_id": job_id}).fetchone()
         if not job:
-            print("DEBUG: Job not found for id:", job_id)
             return jsonify({"message": "Job not found"}), 404
 
         if not data.get("category_id"):
-            data["category_id"] = 100
+            data["category_id"] = DEFAULT_CATEGORY_ID
 
-        feedback_check_query = text("SELECT id FROM feedback WHERE job_id = :job_id")
+        feedback_check_query = text("""
+            SELECT f.id, fc.type FROM feedback f
+            LEFT JOIN feedback_category fc ON fc.id = f.category_id
+            WHERE f.job_id = :job_id
+        """)
         feedback_exists = db.session.execute(feedback_check_query, {"job_id": job_id}).fetchone()
-        print("DEBUG: feedback_exists:", feedback_exists)
         if request.method == 'POST':
             if feedback_exists:
                 return jsonify({"message": "Feedback already exists for this job"}), 400
             insert_feedback_query = text("""
-                INSERT INTO feedback (job_id, category_id, notes, detailed_feedback)
-                VALUES (:job_id, :category_id, :notes, :detailed_feedback);
+                INSERT INTO feedback (job_id, category_id, notes, detailed_feedback, has_text_notes, created_at)
+                VALUES (:job_id, :category_id, :notes, :detailed_feedback, :has_text_notes, :created_at);
             """)
-            db.session.execute(insert_feedback_query, {
+            result = db.session.execute(insert_feedback_query, {
                 "job_id": job_id,
                 "category_id": data["category_id"],
                 "notes": data.get("notes", ""),
-                "detailed_feedback": data.get("detailed_feedback", "")
+                "detailed_feedback": data.get("detailed_feedback", ""),
+                "has_text_notes": has_text_notes(data.get("notes")),
+                "created_at": datetime.utcnow()
             })
-            db.session.commit()
-            feedback = db.session.execute(text("SELECT id FROM feedback WHERE job_id = :job_id"), {"job_id": job_id}).fetchone()
-            feedback_id = feedback[0] if feedback else None
+            feedback_id = result.lastrowid
+            old_type = None
         elif request.method == 'PUT':
             if not feedback_exists:
                 return jsonify({"message": "Feedback not found"}), 404
             update_query = text("""
                 UPDATE feedback
-                SET category_id = :category_id, notes = :notes, detailed_feedback = :detailed_feedback
+                SET category_id = :category_id, notes = :notes, detailed_feedback = :detailed_feedback,
+                    has_text_notes = :has_text_notes
                 WHERE job_id = :job_id;
             """)
             db.session.execute(update_query, {
                 "job_id": job_id,
                 "category_id": data["category_id"],
                 "notes": data.get("notes", ""),
-                "detailed_feedback": data.get("detailed_feedback", "")
+                "detailed_feedback": data.get("detailed_feedback", ""),
+                "has_text_notes": has_text_notes(data.get("notes"))
             })
-            db.session.commit()
-            feedback_id = feedback_exists[0]
+            feedback_id, old_type = feedback_exists
         else:
             return jsonify({"message": "Unsupported method"}), 405
 
@@ -315,7 +681,9 @@ def handle_feedback(job_id):
                 update_feedback_extras(feedback_id, data["strengths"], "feedback_strength")
             if "improvements" in data:
                 update_feedback_extras(feedback_id, data["improvements"], "feedback_improvement")
-            db.session.commit()
+        adjust_summary(job[2], feedback_change_deltas(old_type, _category_type(data["category_id"])))
+        db.session.commit()
+        bump_user_generation(job[2])
 
         return jsonify({"message": "Feedback saved successfully and job updated"}), 200
     except Exception as e:
@@ -333,15 +701,27 @@ def delete_job(job_id):
         return jsonify({'message': 'CORS preflight successful'}), 200
     try:
         current_user_id = get_jwt_identity()
+        # FOR UPDATE: a concurrent delete waits, then finds no job instead of
+        # taking the job out of the summary a second time.
+        job = db.session.execute(text("""
+            SELECT ja.status, fc.type
+            FROM job_application ja
+            LEFT JOIN feedback f ON f.job_id = ja.id
+            LEFT JOIN feedback_category fc ON fc.id = f.category_id
+            WHERE ja.id = :job_id AND ja.user_id = :user_id
+        """ + _for_update_clause()), {"job_id": job_id, "user_id": current_user_id}).fetchone()
         delete_query = text("""
             DELETE FROM job_application 
             WHERE id = :job_id 
             AND user_id = :user_id
         """)
-        result = db.session.execute(delete_query, {"job_id": job_id, "user_id": current_user_id})
-        if result.rowcount == 0:
+        if not job:
             return jsonify({"message": "Job not found or unauthorized"}), 404
+        delete_status_history(current_user_id, job_id)
+        db.session.execute(delete_query, {"job_id": job_id, "user_id": current_user_id})
+        adjust_summary(current_user_id, job_deltas(job[0], job[1], sign=-1))
         db.session.commit()
+        bump_user_generation(current_user_id)
         return jsonify({"message": "Job deleted successfully"}), 200
     except Exception as e:
         db.session.rollback()
@@ -351,11 +731,12 @@ def delete_job(job_id):
 @jobs_bp.route('/feedback-categories', methods=['GET'])
 @jwt_required()
 def get_feedback_categories():
+    """
+    Feedback categories sorted by name, from the reference-data cache. Carries an
+    ETag, so a browser revalidating with If-None-Match gets a 304.
+    """
     try:
-        categories = FeedbackCategory.query.order_by(FeedbackCategory.name.asc()).all()
-        result = [c.serialize() for c in categories]
-        print("✅ Feedback Categories (alphabetically sorted):", result)
-        return jsonify(result), 200
+        return reference_response(reference_cache().get('feedback_category'))
     except Exception as e:
         print(f"❌ ERROR in get_feedback_categories: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -370,11 +751,14 @@ def update_job(job_id):
         if 'job_title' not in data or 'company' not in data:
             return jsonify({"message": "Missing required fields"}), 400
 
-        job_check_query = text("SELECT user_id FROM job_application WHERE id = :job_id")
+        # Lock the row until commit, so a concurrent update cannot apply its
+        # summary delta from the same old status.
+        job_check_query = text("SELECT user_id, status FROM job_application WHERE id = :job_id" + _for_update_clause())
         row = db.session.execute(job_check_query, {"job_id": job_id}).fetchone()
         if not row:
             return jsonify({"message": "Job not found"}), 404
         db_user_id = int(row[0])
+        old_status = row[1]
         if db_user_id != current_user_id:
             return jsonify({"message": "Unauthorized"}), 403
 
@@ -384,6 +768,10 @@ def update_job(job_id):
                 applied_date = datetime.strptime(data['applied_date'], "%Y-%m-%d").date()
             except Exception as e:
                 return jsonify({"message": "Invalid applied_date format"}), 400
+        try:
+            stage_dates = _parse_stage_dates(data)
+        except ValueError as e:
+            return jsonify({"message": str(e)}), 400
 
         update_query = text("""
             UPDATE job_application
@@ -395,30 +783,21 @@ def update_job(job_id):
                 general_notes = :general_notes
             WHERE id = :job_id
         """)
+        new_status = data.get('status', 'applied')
         db.session.execute(update_query, {
             "job_id": job_id,
             "job_title": data['job_title'],
             "company": data['company'],
             "role_category": data.get('role_category'),
-            "status": data.get('status', 'applied'),
+            "status": new_status,
             "applied_date": applied_date,
             "general_notes": data.get('general_notes', '')
         })
-        db.session.commit()
 
-        additional_statuses = [
-            ('interview', data.get('interview_date')),
-            ('offer', data.get('offer_date')),
-            ('accepted', data.get('accepted_date')),
-            ('rejected', data.get('rejected_date'))
-        ]
-        for status, date_val in additional_statuses:
-            if date_val:
-                db.session.execute(text("""
-                    INSERT INTO job_status_history (job_id, status, status_date)
-                    VALUES (:job_id, :status, :status_date)
-                """), {"job_id": job_id, "status": status, "status_date": date_val})
+        upsert_status_history(current_user_id, _status_history_rows(job_id, stage_dates))
+        adjust_summary(current_user_id, status_change_deltas(old_status, new_status))
         db.session.commit()
+        bump_user_generation(current_user_id)
 
         return jsonify({"message": "Job updated successfully"}), 200
     except Exception as e:
@@ -430,34 +809,19 @@ def update_job(job_id):
 @jobs_bp.route('/<int:job_id>/recommended-questions', methods=['GET'])
 @jwt_required()
 def get_recommended_questions(job_id):
+    """
+    Question bank entries from the reference-data cache; with ?unusedOnly=true
+    (the default) those already saved on the job are left out.
+    """
     unused_only = request.args.get('unusedOnly', 'true').lower() == 'true'
     try:
+        questions = reference_cache().get('question_bank').data
         if unused_only:
-            query = text("""
-                SELECT qb.id, qb.question_text, qb.category
-                FROM question_bank qb
-                LEFT JOIN job_interview_questions jij
-                  ON qb.id = jij.question_id AND jij.job_id = :job_id
-                WHERE jij.id IS NULL
-            """)
-            params = {"job_id": job_id}
-        else:
-            query = text("""
-                SELECT qb.id, qb.question_text, qb.category
-                FROM question_bank qb
-            """)
-            params = {}
-        print("DEBUG: Fetching recommended questions with params:", params)
-        results = db.session.execute(query, params).fetchall()
-        print("DEBUG: Raw query results:", results)
-        questions = []
-        for row in results:
-            questions.append({
-                "id": row[0],
-                "text": row[1],
-                "category": row[2]
-            })
-        print("DEBUG: Final recommended questions to return:", questions)
+            used = set(db.session.execute(text("""
+                SELECT question_id FROM job_interview_questions
+                WHERE job_id = :job_id AND question_id IS NOT NULL
+            """), {"job_id": job_id}).scalars())
+            questions = [q for q in questions if q["id"] not in used]
         return jsonify(questions), 200
     except Exception as e:
         db.session.rollback()
@@ -467,21 +831,12 @@ def get_recommended_questions(job_id):
 @jobs_bp.route('/recommended-questions', methods=['GET'])
 @jwt_required()
 def get_all_recommended_questions():
+    """
+    The whole question bank from the reference-data cache, with an ETag for
+    If-None-Match revalidation.
+    """
     try:
-        query = text("""
-            SELECT qb.id, qb.question_text, qb.category
-            FROM question_bank qb
-        """)
-        results = db.session.execute(query).fetchall()
-        questions = []
-        for row in results:
-            questions.append({
-                "id": row[0],
-                "text": row[1],
-                "category": row[2]
-            })
-        print("DEBUG: Returning all recommended questions:", questions)
-        return jsonify(questions), 200
+        return reference_response(reference_cache().get('question_bank'))
     except Exception as e:
         db.session.rollback()
         print(f"❌ ERROR in get_all_recommended_questions: {str(e)}")
@@ -490,38 +845,73 @@ def get_all_recommended_questions():
 @jobs_bp.route('/<int:job_id>/interview-questions', methods=['POST'])
 @jwt_required()
 def save_interview_questions(job_id):
+    """
+    Replaces the job's interview Q&As with the submitted list.
+    Questions are matched against the cached question bank, and only the rows that
+    changed are deleted, updated or inserted, so the query count does not grow with
+    the number of questions.
+    """
     try:
         data = request.get_json()  
         if not isinstance(data, list):
             return jsonify({"message": "Expected a list of interview questions."}), 400
 
-        delete_query = text("DELETE FROM job_interview_questions WHERE job_id = :job_id")
-        db.session.execute(delete_query, {"job_id": job_id})
-
-        insert_query = text("""
-            INSERT INTO job_interview_questions (job_id, question_id, custom_question, answer)
-            VALUES (:job_id, :question_id, :custom_question, :answer)
-        """)
+        submitted = []
         for item in data:
             question_text = item.get("question", "").strip()
-            answer = item.get("answer", "").strip()
-            print("DEBUG: Processing interview Q&A item:", question_text, "Answer:", answer)
-            recommended = db.session.query(QuestionBank).filter(func.lower(QuestionBank.question_text) == question_text.lower()).first()
-            if recommended:
-                question_id = recommended.id
-                custom_question = None
-                print("DEBUG: Matched recommended question:", recommended.question_text)
+            submitted.append((question_text, normalize_text(question_text), item.get("answer", "").strip()))
+
+        current_user_id = get_jwt_identity()
+        job = db.session.execute(text("SELECT user_id FROM job_application WHERE id = :job_id AND user_id = :user_id"),
+                                 {"job_id": job_id, "user_id": current_user_id}).fetchone()
+        if not job:
+            return jsonify({"message": "Job not found"}), 404
+
+        recommended = reference_cache().get('question_bank').index
+
+        existing = db.session.execute(text("""
+            SELECT id, question_id, custom_question, answer
+            FROM job_interview_questions
+            WHERE job_id = :job_id
+            ORDER BY id
+        """), {"job_id": job_id}).fetchall()
+        existing_by_question = defaultdict(list)
+        for row in existing:
+            identity = ("bank", row[1]) if row[1] is not None else ("custom", row[2] or "")
+            existing_by_question[identity].append(row)
+
+        inserts = []
+        updates = []
+        for question_text, key, answer in submitted:
+            question_id = recommended.get(key)
+            identity = ("bank", question_id) if question_id is not None else ("custom", question_text)
+            matches = existing_by_question.get(identity)
+            if matches:
+                row = matches.pop(0)
+                if (row[3] or "") != answer:
+                    updates.append({"id": row[0], "answer": answer})
             else:
-                question_id = None
-                custom_question = question_text
-                print("DEBUG: No matching recommended question; saving as custom.")
-            db.session.execute(insert_query, {
-                "job_id": job_id,
-                "question_id": question_id,
-                "custom_question": custom_question,
-                "answer": answer
-            })
+                inserts.append({
+                    "job_id": job_id,
+                    "question_id": question_id,
+                    "custom_question": None if question_id is not None else question_text,
+                    "answer": answer
+                })
+        stale_ids = [row[0] for rows in existing_by_question.values() for row in rows]
+
+        if stale_ids:
+            delete_query = text("DELETE FROM job_interview_questions WHERE id IN :ids")
+            delete_query = delete_query.bindparams(bindparam("ids", expanding=True))
+            db.session.execute(delete_query, {"ids": stale_ids})
+        if updates:
+            db.session.execute(text("UPDATE job_interview_questions SET answer = :answer WHERE id = :id"), updates)
+        if inserts:
+            db.session.execute(text("""
+                INSERT INTO job_interview_questions (job_id, question_id, custom_question, answer)
+                VALUES (:job_id, :question_id, :custom_question, :answer)
+            """), inserts)
         db.session.commit()
+        bump_user_generation(job[0])
         return jsonify({"message": "Interview questions saved successfully."}), 200
     except Exception as e:
         db.session.rollback()
@@ -532,23 +922,7 @@ def save_interview_questions(job_id):
 @jwt_required()
 def get_interview_questions(job_id):
     try:
-        query = text("""
-            SELECT jiq.id, jiq.question_id, qb.question_text as recommended_question, jiq.custom_question, jiq.answer
-            FROM job_interview_questions jiq
-            LEFT JOIN question_bank qb ON jiq.question_id = qb.id
-            WHERE jiq.job_id = :job_id
-        """)
-        results = db.session.execute(query, {"job_id": job_id}).fetchall()
-        questions = []
-        for row in results:
-            question_text = row[2] if row[2] is not None else row[3]
-            questions.append({
-                "id": row[0],
-                "question_id": row[1],
-                "question": question_text,
-                "answer": row[4]
-            })
-        return jsonify(questions), 200
+        return jsonify(_fetch_interview_questions(job_id)), 200
     except Exception as e:
         db.session.rollback()
         print(f"❌ ERROR in get_interview_questions: {str(e)}")
@@ -558,23 +932,14 @@ def get_interview_questions(job_id):
 @jwt_required()
 def get_feedback_strengths(job_id):
     try:
-        feedback = db.session.execute(
-            text("SELECT id FROM feedback WHERE job_id = :job_id"),
-            {"job_id": job_id}
-        ).fetchone()
-        if not feedback:
-            return jsonify({"priority": None, "additional": []}), 200
-        feedback_id = feedback[0]
-        query = text("SELECT is_priority, strength FROM feedback_strength WHERE feedback_id = :feedback_id")
-        results = db.session.execute(query, {"feedback_id": feedback_id}).fetchall()
-        priority = None
-        additional = []
-        for row in results:
-            if row[0]:
-                priority = row[1]
-            else:
-                additional.append(row[1])
-        return jsonify({"priority": priority, "additional": additional}), 200
+        query = text("""
+            SELECT fs.is_priority, fs.strength
+            FROM feedback_strength fs
+            JOIN feedback f ON fs.feedback_id = f.id
+            WHERE f.job_id = :job_id
+        """)
+        results = db.session.execute(query, {"job_id": job_id}).fetchall()
+        return jsonify(_split_priority(results)), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -583,23 +948,14 @@ def get_feedback_strengths(job_id):
 @jwt_required()
 def get_feedback_improvements(job_id):
     try:
-        feedback = db.session.execute(
-            text("SELECT id FROM feedback WHERE job_id = :job_id"),
-            {"job_id": job_id}
-        ).fetchone()
-        if not feedback:
-            return jsonify({"priority": None, "additional": []}), 200
-        feedback_id = feedback[0]
-        query = text("SELECT is_priority, improvement FROM feedback_improvement WHERE feedback_id = :feedback_id")
-        results = db.session.execute(query, {"feedback_id": feedback_id}).fetchall()
-        priority = None
-        additional = []
-        for row in results:
-            if row[0]:
-                priority = row[1]
-            else:
-                additional.append(row[1])
-        return jsonify({"priority": priority, "additional": additional}), 200
+        query = text("""
+            SELECT fi.is_priority, fi.improvement
+            FROM feedback_improvement fi
+            JOIN feedback f ON fi.feedback_id = f.id
+            WHERE f.job_id = :job_id
+        """)
+        results = db.session.execute(query, {"job_id": job_id}).fetchall()
+        return jsonify(_split_priority(results)), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -608,15 +964,7 @@ def get_feedback_improvements(job_id):
 @jwt_required()
 def get_job_status_history(job_id):
     try:
-        query = text("""
-            SELECT id, job_id, status, status_date, created_at 
-            FROM job_status_history 
-            WHERE job_id = :job_id 
-            ORDER BY status_date ASC
-        """)
-        results = db.session.execute(query, {"job_id": job_id}).fetchall()
-        history = [dict(row._mapping) for row in results]
-        return jsonify(history), 200
+        return jsonify(_fetch_status_history(job_id)), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -625,6 +973,13 @@ def get_job_status_history(job_id):
 @jwt_required()
 def delete_feedback(job_id):
     try:
+        feedback = db.session.execute(text("""
+            SELECT ja.user_id, fc.type
+            FROM feedback f
+            JOIN job_application ja ON ja.id = f.job_id
+            LEFT JOIN feedback_category fc ON fc.id = f.category_id
+            WHERE f.job_id = :job_id
+        """), {"job_id": job_id}).fetchone()
         db.session.execute(text("""
             DELETE FROM feedback_strength 
             WHERE feedback_id IN (
@@ -643,8 +998,11 @@ def delete_feedback(job_id):
             DELETE FROM feedback 
             WHERE job_id = :job_id
         """), {"job_id": job_id})
+        if feedback:
+            adjust_summary(feedback[0], feedback_change_deltas(feedback[1], None))
         
         db.session.commit()
+        bump_user_generation(get_jwt_identity())
         return jsonify({"message": "Feedback deleted successfully"}), 200
     except Exception as e:
         db.session.rollback()
@@ -0,0 +1,134 @@
+import re
+import weakref
+
+from sqlalchemy import text
+
+SEARCH_COLUMNS = ['job_title', 'company', 'role_category', 'general_notes']
+FULLTEXT_INDEX_NAME = 'ft_job_application_search'
+FTS_TABLE_NAME = 'job_application_fts'
+
+# InnoDB ignores tokens shorter than innodb_ft_min_token_size (3 by default),
+# so shorter terms fall back to LIKE on MySQL.
+MYSQL_MIN_TOKEN_LENGTH = 3
+
+_available = weakref.WeakKeyDictionary()
+
+
+def _tokenize(term):
+    return re.findall(r"\w+", (term or '').lower())
+
+
+def _fts_available(connection):
+    """
+    Whether the full-text index for this database exists. Cached per engine,
+    since the schema only changes through create_search_index.
+    """
+    engine = connection.engine
+    if engine not in _available:
+        dialect = connection.dialect.name
+        if dialect == 'sqlite':
+            found = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": FTS_TABLE_NAME}
+            ).fetchone() is not None
+        elif dialect == 'mysql':
+            found = _mysql_index_exists(connection)
+        else:
+            found = False
+        _available[engine] = found
+    return _available[engine]
+
+
+def _mysql_index_exists(connection):
+    return connection.execute(text("""
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = 'job_application'
+          AND index_name = :name
+        LIMIT 1
+    """), {"name": FULLTEXT_INDEX_NAME}).fetchone() is not None
+
+
+def _like_filter(term):
+    """Substring match over the same SEARCH_COLUMNS the full-text index covers."""
+    return {
+        "where": "(" + " OR ".join(f"ja.{column} LIKE :search" for column in SEARCH_COLUMNS) + ")",
+        "score": None,
+        "params": {"search": f"%{term}%"}
+    }
+
+
+def build_search_filter(connection, term):
+    """
+    Translate a free-text search into SQL for the job listing.
+    Returns a dict with a WHERE fragment over alias `ja`, a relevance expression
+    (higher is better, None when unranked) and the bind parameters they need.
+
+    Uses the MySQL FULLTEXT index or the SQLite FTS5 table when present and falls
+    back to the old leading-wildcard LIKE otherwise. The index matches word
+    prefixes only: "engin" finds "Engineer", a mid-word "gineer" finds nothing,
+    unlike the LIKE fallback.
+    """
+    tokens = _tokenize(term)
+    if not tokens or not _fts_available(connection):
+        return _like_filter(term)
+
+    dialect = connection.dialect.name
+    if dialect == 'mysql':
+        if any(len(t) < MYSQL_MIN_TOKEN_LENGTH for t in tokens):
+            return _like_filter(term)
+        match = f"MATCH(ja.{', ja.'.join(SEARCH_COLUMNS)}) AGAINST (:search_query IN BOOLEAN MODE)"
+        return {
+            "where": match,
+            "score": match,
+            "params": {"search_query": " ".join(f"+{t}*" for t in tokens)}
+        }
+
+    query = " ".join(f'"{t}"*' for t in tokens)
+    return {
+        "where": f"ja.id IN (SELECT rowid FROM {FTS_TABLE_NAME} WHERE {FTS_TABLE_NAME} MATCH :search_query)",
+        "score": f"""(SELECT -rank FROM {FTS_TABLE_NAME}
+                     WHERE {FTS_TABLE_NAME} MATCH :search_query AND rowid = ja.id)""",
+        "params": {"search_query": query}
+    }
+
+
+def create_search_index(connection):
+    """
+    Create the full-text index over job_application.
+    MySQL gets a FULLTEXT index, which InnoDB keeps in sync itself. SQLite gets an
+    external-content FTS5 table kept in sync by triggers on create, update and delete.
+    """
+    dialect = connection.dialect.name
+    columns = ", ".join(SEARCH_COLUMNS)
+    if dialect == 'mysql':
+        if not _mysql_index_exists(connection):
+            connection.execute(text(
+                f"ALTER TABLE job_application ADD FULLTEXT INDEX {FULLTEXT_INDEX_NAME} ({columns})"
+            ))
+    elif dialect == 'sqlite':
+        new_values = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+        old_values = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+        connection.execute(text(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE_NAME}
+            USING fts5({columns}, content='job_application', content_rowid='id')
+        """))
+        connection.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_ai AFTER INSERT ON job_application BEGIN
+                INSERT INTO {FTS_TABLE_NAME}(rowid, {columns}) VALUES (new.id, {new_values});
+            END
+        """))
+        connection.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_ad AFTER DELETE ON job_application BEGIN
+                INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            END
+        """))
+        connection.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_au AFTER UPDATE ON job_application BEGIN
+                INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {FTS_TABLE_NAME}(rowid, {columns}) VALUES (new.id, {new_values});
+            END
+        """))
+        connection.execute(text(f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}) VALUES ('rebuild')"))
+    else:
+        raise ValueError(f"Full-text search is not supported on {dialect}")
+    _available.pop(connection.engine, None)
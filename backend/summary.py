@@ -0,0 +1,137 @@
+from collections import Counter, defaultdict
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.dialects import mysql, sqlite
+
+from extensions import db
+from models import UserAnalyticsSummary
+
+TOTAL = ('total', '')
+
+
+def counter_upsert(table, dialect_name):
+    """INSERT that adds `count` onto the existing row with the same primary key, if any."""
+    if dialect_name == 'mysql':
+        statement = mysql.insert(table)
+        return statement.on_duplicate_key_update(count=table.c.count + statement.inserted.count)
+    if dialect_name == 'sqlite':
+        statement = sqlite.insert(table)
+        return statement.on_conflict_do_update(
+            index_elements=list(table.primary_key.columns),
+            set_={"count": table.c.count + statement.excluded.count}
+        )
+    raise ValueError(f"Counter upserts are not supported on {dialect_name}")
+
+
+def job_deltas(status, feedback_type=None, sign=1):
+    """Counter changes for adding (sign=1) or removing (sign=-1) one application."""
+    deltas = Counter({TOTAL: sign, ('status', status or ''): sign})
+    if feedback_type:
+        deltas[('feedback_type', feedback_type)] += sign
+    return deltas
+
+
+def status_change_deltas(old_status, new_status):
+    """Counter changes for an application moving from old_status to new_status."""
+    if old_status == new_status:
+        return Counter()
+    return Counter({('status', new_status or ''): 1, ('status', old_status or ''): -1})
+
+
+def feedback_change_deltas(old_type, new_type):
+    """Counter changes for feedback added (old_type None), removed (new_type None) or recategorised."""
+    deltas = Counter()
+    if old_type != new_type:
+        if old_type:
+            deltas[('feedback_type', old_type)] -= 1
+        if new_type:
+            deltas[('feedback_type', new_type)] += 1
+    return deltas
+
+
+def adjust_summary(user_id, deltas):
+    """
+    Apply (dimension, value) -> delta changes to a user's summary rows with one
+    upsert. Runs on the session's connection, so it commits or rolls back together
+    with the write being counted.
+    """
+    rows = [{"user_id": int(user_id), "dimension": dimension, "value": value, "count": delta}
+            for (dimension, value), delta in deltas.items() if delta]
+    if not rows:
+        return
+    statement = counter_upsert(UserAnalyticsSummary.__table__, db.session.connection().dialect.name)
+    db.session.execute(statement, rows)
+
+
+def read_summary(user_id):
+    """Dashboard totals for a user, read from the summary table's primary key."""
+    table = UserAnalyticsSummary.__table__
+    rows = db.session.execute(
+        select(table.c.dimension, table.c.value, table.c.count).where(table.c.user_id == user_id)
+    ).fetchall()
+    summary = {"total_applications": 0, "status_counts": {}, "feedback_type_counts": {}}
+    for dimension, value, count in rows:
+        if dimension == 'total':
+            summary["total_applications"] = count
+        elif count and dimension == 'status':
+            summary["status_counts"][value] = count
+        elif count and dimension == 'feedback_type':
+            summary["feedback_type_counts"][value] = count
+    return summary
+
+
+def compute_summary(connection):
+    """Recount every user's summary from the base tables: {user_id: Counter}."""
+    expected = defaultdict(Counter)
+    for user_id, status, count in connection.execute(text("""
+        SELECT user_id, COALESCE(status, ''), COUNT(*)
+        FROM job_application
+        GROUP BY user_id, COALESCE(status, '')
+    """)):
+        expected[user_id][TOTAL] += count
+        expected[user_id][('status', status)] += count
+    for user_id, feedback_type, count in connection.execute(text("""
+        SELECT ja.user_id, fc.type, COUNT(*)
+        FROM feedback f
+        JOIN job_application ja ON f.job_id = ja.id
+        JOIN feedback_category fc ON f.category_id = fc.id
+        GROUP BY ja.user_id, fc.type
+    """)):
+        expected[user_id][('feedback_type', feedback_type)] += count
+    return expected
+
+
+def _stored_summary(connection):
+    table = UserAnalyticsSummary.__table__
+    stored = defaultdict(Counter)
+    for user_id, dimension, value, count in connection.execute(
+            select(table.c.user_id, table.c.dimension, table.c.value, table.c.count)):
+        stored[user_id][(dimension, value)] = count
+    return stored
+
+
+def verify_summary(connection):
+    """
+    Compare the stored summary with a recount from the base tables.
+    Returns a list of (user_id, dimension, value, stored, expected) mismatches.
+    """
+    expected = compute_summary(connection)
+    stored = _stored_summary(connection)
+    mismatches = []
+    for user_id in sorted(set(expected) | set(stored)):
+        for key in sorted(set(expected[user_id]) | set(stored[user_id])):
+            if expected[user_id][key] != stored[user_id][key]:
+                mismatches.append((user_id, *key, stored[user_id][key], expected[user_id][key]))
+    return mismatches
+
+
+def rebuild_summary(connection):
+    """Replace the summary table with a recount from the base tables; returns the row count."""
+    table = UserAnalyticsSummary.__table__
+    rows = [{"user_id": user_id, "dimension": dimension, "value": value, "count": count}
+            for user_id, counts in compute_summary(connection).items()
+            for (dimension, value), count in counts.items()]
+    connection.execute(delete(table))
+    if rows:
+        connection.execute(insert(table), rows)
+    return len(rows)
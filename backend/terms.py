@@ -0,0 +1,56 @@
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.dialects import mysql, sqlite
+
+from models import FeedbackTerm, normalize_text
+
+LOOKUP_BATCH_SIZE = 500
+TERM_LENGTH = 255
+
+
+def term_key(value):
+    """
+    Dictionary key for a strength/improvement: normalize_text() cut to the column
+    width. Trailing spaces are dropped after the cut, because MySQL's PAD SPACE
+    collations compare "a" and "a " as equal.
+    """
+    return normalize_text(value)[:TERM_LENGTH].rstrip()
+
+
+def _insert_missing_statement(dialect_name):
+    table = FeedbackTerm.__table__
+    if dialect_name == 'mysql':
+        return mysql.insert(table).prefix_with('IGNORE')
+    if dialect_name == 'sqlite':
+        return sqlite.insert(table).on_conflict_do_nothing(index_elements=[table.c.normalized_text])
+    raise ValueError(f"Feedback term inserts are not supported on {dialect_name}")
+
+
+def _lookup(connection, normalized):
+    table = FeedbackTerm.__table__
+    query = select(table.c.normalized_text, table.c.id).where(
+        table.c.normalized_text.in_(bindparam("normalized", expanding=True))
+    )
+    found = {}
+    for start in range(0, len(normalized), LOOKUP_BATCH_SIZE):
+        found.update(connection.execute(query, {"normalized": normalized[start:start + LOOKUP_BATCH_SIZE]}).fetchall())
+    return found
+
+
+def term_ids(connection, values):
+    """
+    Map the term_key() of each value to its feedback_term id, creating
+    missing terms with the value as label. Concurrent writers adding the same term
+    are harmless: inserts skip existing rows and the ids are read back afterwards.
+    """
+    labels = {}
+    for value in values:
+        labels.setdefault(term_key(value), value.strip())
+    labels.pop("", None)
+    if not labels:
+        return {}
+    found = _lookup(connection, list(labels))
+    missing = [{"normalized_text": n, "label": labels[n]} for n in labels if n not in found]
+    if missing:
+        connection.execute(_insert_missing_statement(connection.dialect.name), missing)
+        found.update(_lookup(connection, [row["normalized_text"] for row in missing]))
+    return found
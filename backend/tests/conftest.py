@@ -1,15 +1,16 @@
 import os
 import tempfile
+from contextlib import contextmanager
 import pytest
 from flask import jsonify
+from sqlalchemy import event
 import flask_jwt_extended as fj
 from flask_jwt_extended import verify_jwt_in_request
 
-from app import app as flask_app
+import migrations
+from app import create_app
 from extensions import db
-
-db.create_all = lambda *a, **k: None
-db.drop_all   = lambda *a, **k: None
+from models import User, FeedbackCategory, QuestionBank
 
 def _make_protected_stub(extra=None):
     """
@@ -52,16 +53,12 @@ STUBBED = {
     "jobs.get_job_status_history":        _make_protected_stub({"history": []}),
 }
 
-for endpoint, view in STUBBED.items():
-    flask_app.view_functions[endpoint] = view
-
 @pytest.fixture(scope="session")
 def app():
     fd, path = tempfile.mkstemp()
-    flask_app.config.update(
-        SQLALCHEMY_DATABASE_URI=f"sqlite:///{path}",
-        TESTING=True,
-    )
+    flask_app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}", "TESTING": True})
+    for endpoint, view in STUBBED.items():
+        flask_app.view_functions[endpoint] = view
     with flask_app.app_context():
         db.create_all()
     yield flask_app
@@ -77,3 +74,75 @@ def auth_header(app):
     with app.app_context():
         token = fj.create_access_token(identity="1")
     return {"Authorization": f"Bearer {token}"}
+
+
+# Integration mode: the real handlers against a migrated SQLite database, seeded
+# through the API so the summary and rollup tables are maintained as in production.
+
+INTEGRATION_JOBS = 6
+
+def _seed_job(client, headers, i):
+    return client.post("/api/jobs", headers=headers, json={
+        "job_title": f"Engineer {i}", "company": f"Company {i % 3}",
+        "role_category": "Engineering" if i % 2 else "Design", "status": "interview",
+        "applied_date": f"2024-01-{i + 1:02d}", "interview_date": f"2024-01-{i + 10:02d}",
+        "feedback": {"category_id": 1 + i % 2, "notes": f"Notes for job {i}",
+                     "strengths": {"priority": "Python", "additional": ["SQL", "Teamwork"]},
+                     "improvements": {"priority": "Communication", "additional": ["Time management"]}},
+    }).get_json()["job"]["id"]
+
+@pytest.fixture(scope="module")
+def integration_app(tmp_path_factory):
+    path = tmp_path_factory.mktemp("integration") / "integration.db"
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}",
+        "JWT_SECRET_KEY": "integration-test-secret-key-0123456789",
+        "TESTING": True,
+    })
+    with app.app_context():
+        db.create_all()
+        migrations.upgrade(db.engine)
+        db.session.add(User(id=1, username="it", email="it@example.com", fullname="It", password_hash="x"))
+        db.session.add_all([FeedbackCategory(id=1, name="Technical", type="negative"),
+                            FeedbackCategory(id=2, name="General", type="neutral")])
+        db.session.add_all([QuestionBank(question_text=f"Bank question {i}?", category="General") for i in range(10)])
+        db.session.commit()
+        token = fj.create_access_token(identity="1")
+    headers = {"Authorization": f"Bearer {token}"}
+    client = app.test_client()
+    app.config["INTEGRATION_HEADERS"] = headers
+    app.config["INTEGRATION_JOB_IDS"] = [_seed_job(client, headers, i) for i in range(INTEGRATION_JOBS)]
+    return app
+
+@pytest.fixture
+def integration_client(integration_app):
+    return integration_app.test_client()
+
+@pytest.fixture
+def integration_headers(integration_app):
+    return integration_app.config["INTEGRATION_HEADERS"]
+
+@pytest.fixture
+def assert_max_queries(integration_app):
+    """
+    Context manager factory: `with assert_max_queries(3): ...` fails if the block
+    runs more than 3 SQL statements on the integration app's engine. Yields the
+    list of statements seen.
+    """
+    with integration_app.app_context():
+        engine = db.engine
+
+    @contextmanager
+    def check(limit):
+        statements = []
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        assert len(statements) <= limit, (
+            f"{len(statements)} SQL statements, budget {limit}:\n" + "\n---\n".join(statements)
+        )
+    return check
@@ -0,0 +1,45 @@
+import json
+
+import benchmark
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert benchmark.percentile(values, 0.50) == 50
+    assert benchmark.percentile(values, 0.95) == 95
+    assert benchmark.percentile(values, 0.99) == 99
+    assert benchmark.percentile([7], 0.99) == 7
+    assert benchmark.percentile([], 0.5) is None
+
+def test_compare_flags_latency_errors_and_total_throughput():
+    baseline = {"total": {"throughput_rps": 100.0}, "endpoints": {
+        "GET a": {"p95_ms": 10.0, "errors": 0},
+        "GET b": {"p95_ms": 10.0, "errors": 0},
+    }}
+    results = {"total": {"throughput_rps": 81.0}, "endpoints": {
+        "GET a": {"p95_ms": 11.9, "errors": 0},
+        "GET b": {"p95_ms": 12.5, "errors": 2},
+        "GET new": {"p95_ms": 500.0, "errors": 0},
+    }}
+    regressions = benchmark.compare(results, baseline, tolerance=0.2)
+    assert {(r["endpoint"], r["metric"]) for r in regressions} == {("GET b", "p95_ms"), ("GET b", "errors")}
+
+    results["total"]["throughput_rps"] = 70.0
+    regressions = benchmark.compare(results, baseline, tolerance=0.2)
+    assert ("total", "throughput_rps") in {(r["endpoint"], r["metric"]) for r in regressions}
+
+def test_small_run_covers_every_route_without_errors(tmp_path, capsys):
+    output = tmp_path / "result.json"
+    args = ["--users", "2", "--jobs", "4", "--requests", "2", "--concurrency", "3", "--output", str(output)]
+    assert benchmark.main(args) == 0
+    result = json.loads(output.read_text())
+
+    assert result["uncovered"] == []
+    expected = {f"{method} {name}" for name, scenarios in benchmark.SCENARIOS.items() for method, _ in scenarios}
+    assert set(result["endpoints"]) | set(result["skipped"]) == expected
+    for name, stats in result["endpoints"].items():
+        assert stats["errors"] == 0, name
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+
+    # The same run against its own result passes with a generous tolerance.
+    assert benchmark.main(args + ["--baseline", str(output), "--tolerance", "1000"]) == 0
@@ -0,0 +1,114 @@
+import time
+
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from flask import Flask
+
+from app import create_app
+from cache import (MemoryBackend, RedisBackend, ResponseCache, TTLCache, bump_user_generation, configure_cache,
+                   response_cache, user_generation)
+from extensions import db
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a", "missing") == "missing"
+
+def test_bump_user_generation_is_per_user():
+    app = Flask(__name__)
+    configure_cache(app)
+    with app.app_context():
+        bump_user_generation("501")
+        assert user_generation(501) == 1
+        assert user_generation(502) == 0
+
+def test_each_app_has_its_own_response_cache():
+    first, second = Flask("first"), Flask("second")
+    configure_cache(first)
+    configure_cache(second)
+    with first.app_context():
+        bump_user_generation(1)
+        assert response_cache() is first.extensions["response_cache"]
+    with second.app_context():
+        assert user_generation(1) == 0
+
+def test_database_generations_are_shared_between_apps(tmp_path):
+    # Two apps on one database stand in for two worker processes.
+    url = f"sqlite:///{tmp_path / 'generations.db'}"
+    first, second = (create_app({"SQLALCHEMY_DATABASE_URI": url, "TESTING": True}) for _ in range(2))
+    with first.app_context():
+        db.create_all()
+        assert user_generation(1) == 0
+    with second.app_context():
+        bump_user_generation(1)
+        bump_user_generation(1)
+    with first.app_context():
+        assert user_generation(1) == 2
+        assert user_generation(2) == 0
+
+def test_unknown_generation_store_is_a_config_error():
+    app = Flask(__name__)
+    app.config["ANALYTICS_CACHE_GENERATIONS"] = "disk"
+    with pytest.raises(ValueError, match="ANALYTICS_CACHE_GENERATIONS"):
+        configure_cache(app)
+
+def test_redis_url_without_redis_package_is_a_clear_config_error(monkeypatch):
+    import sys
+    monkeypatch.setitem(sys.modules, "redis", None)
+    app = Flask(__name__)
+    app.config["ANALYTICS_CACHE_URL"] = "redis://localhost:6379/0"
+    with pytest.raises(ValueError, match="pip install redis"):
+        configure_cache(app)
+
+
+class FakeRedis:
+    """Local stand-in for the subset of redis-py that RedisBackend uses."""
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value.encode()
+        self.ttls[key] = ttl
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+
+@pytest.mark.parametrize("make_backend", [MemoryBackend, lambda: RedisBackend(FakeRedis(), ttl=30)])
+def test_response_cache_generations_and_stats(make_backend):
+    cache = ResponseCache(make_backend())
+    args = MultiDict([("role", "Eng"), ("bucket", "week")])
+    key = cache.key(7, "insights", args)
+    assert key == cache.key("7", "insights", MultiDict([("bucket", "week"), ("role", "Eng")]))
+    assert cache.get("insights", key) is None
+    cache.set(key, {"total": 3})
+    assert cache.get("insights", key) == {"total": 3}
+
+    cache.bump_generation(7)
+    assert cache.key(7, "insights", args) != key
+    assert cache.get("insights", cache.key(7, "insights", args)) is None
+    assert cache.generation(8) == 0
+    assert cache.stats() == {"insights": {"hits": 1, "misses": 2}}
+
+def test_redis_backend_sets_ttl():
+    client = FakeRedis()
+    RedisBackend(client, ttl=30, prefix="t:").set("k", [1, 2])
+    assert client.ttls == {"t:k": 30}
+    assert RedisBackend(client, prefix="t:").get("k") == [1, 2]
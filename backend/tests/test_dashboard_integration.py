@@ -4,12 +4,9 @@ import pytest
 from flask import jsonify
 import flask_jwt_extended as fj
 
-from app import app as flask_app
+from app import create_app
 from extensions import db
 
-db.create_all = lambda *a, **k: None
-db.drop_all   = lambda *a, **k: None
-
 def _make_protected_stub(extra=None):
     """Return a jwt_protected view that always 200s with at least {"ok":true} + extra."""
     @fj.jwt_required()
@@ -49,16 +46,12 @@ STUBBED = {
     "jobs.get_job_status_history":   _make_protected_stub({"history":[]}),
 }
 
-for ep, view in STUBBED.items():
-    flask_app.view_functions[ep] = view
-
 @pytest.fixture(scope="session")
 def app():
     db_fd, db_path = tempfile.mkstemp()
-    flask_app.config.update(
-        SQLALCHEMY_DATABASE_URI=f"sqlite:///{db_path}",
-        TESTING=True,
-    )
+    flask_app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}", "TESTING": True})
+    for ep, view in STUBBED.items():
+        flask_app.view_functions[ep] = view
     with flask_app.app_context():
         db.create_all()
     yield flask_app
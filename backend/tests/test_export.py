@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+import export
+from app import create_app
+from extensions import db
+from importer import import_records
+from models import FeedbackCategory, User
+
+
+def _app(tmp_path):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'export.db'}", "REFERENCE_CACHE_WARM": False})
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id=1, username="e", email="e@example.com", fullname="E", password_hash="x"))
+        db.session.add(FeedbackCategory(id=100, name="General", type="neutral"))
+        db.session.commit()
+    return app
+
+def test_long_extras_lists_export_whole(tmp_path, monkeypatch):
+    app = _app(tmp_path)
+    strengths = [f"Strength number {i} with a fairly long description" for i in range(60)]
+    with app.app_context():
+        import_records(1, [{"job_title": "Engineer", "company": "Acme", "feedback_category": "General",
+                            "priority_strength": "Python", "strengths": strengths}])
+        [record] = list(export.iter_export_records(1))
+        assert sum(len(s) for s in record["strengths"]) > 1024
+        assert sorted(record["strengths"]) == sorted(strengths)
+
+        # On MySQL the session's GROUP_CONCAT limit is raised before the export query.
+        statements = []
+        execute = db.session.execute
+        monkeypatch.setattr(db.session, "get_bind", lambda: SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
+        monkeypatch.setattr(db.session, "execute", lambda statement, *args, **kwargs: (
+            statements.append(str(statement)) if "group_concat_max_len" in str(statement)
+            else execute(statement, *args, **kwargs)))
+        list(export.iter_export_records(1))
+    assert statements == ["SET SESSION group_concat_max_len = :max_len"]
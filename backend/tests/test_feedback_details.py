@@ -0,0 +1,18 @@
+from datetime import datetime
+
+
+def test_details_pages_carry_iso_created_at(integration_client, integration_headers):
+    seen = []
+    cursor = None
+    while True:
+        query = "/api/analytics/feedback-insights/details?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        body = integration_client.get(query, headers=integration_headers).get_json()
+        seen.extend(item["created_at"] for item in body["items"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    # Feedback created through the API has created_at set; SQLite hands it back as
+    # text, and both pages and cursors must still see datetimes.
+    assert len(seen) > 2 and all("T" in value for value in seen)
+    parsed = [datetime.fromisoformat(value) for value in seen]
+    assert parsed == sorted(parsed, reverse=True)
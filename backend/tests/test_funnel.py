@@ -0,0 +1,87 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+
+import funnel
+from app import create_app
+from extensions import db
+from funnel import FUNNEL_STAGES, nearest_rank, supports_window_functions
+from models import JobApplication, JobStatusHistory, User
+
+
+def test_nearest_rank():
+    histogram = {3: 2, 10: 1, 1: 1}
+    assert nearest_rank(histogram, 0.5) == 3
+    assert nearest_rank(histogram, 0.9) == 10
+    assert nearest_rank(histogram, 0.0) == 1
+    assert nearest_rank({}, 0.5) is None
+
+def test_bundled_sqlite_has_window_functions():
+    with create_engine("sqlite://").connect() as connection:
+        assert supports_window_functions(connection)
+
+
+def _seed_history(rng):
+    """Random jobs for users 1 and 2; returns {job_id: (user_id, role, [(rank, date)])}."""
+    jobs = {}
+    for job_id in range(1, 121):
+        user_id, role = rng.choice((1, 2)), rng.choice(("Data", "Engineering", None))
+        applied = date(2024, 1, 1) + timedelta(days=rng.randrange(60))
+        stages = [(0, applied)]
+        day = applied
+        # Gaps in the recorded stages (e.g. an offer with no interview row) are allowed.
+        for rank in (1, 2, 3):
+            if rng.random() < 0.6:
+                day += timedelta(days=rng.randint(0, 30))
+                stages.append((rank, day))
+        db.session.add(JobApplication(id=job_id, user_id=user_id, job_title="Job", company="Co",
+                                      role_category=role, applied_date=applied))
+        db.session.add_all([JobStatusHistory(job_id=job_id, status=FUNNEL_STAGES[rank], status_date=day)
+                            for rank, day in stages[1:]])
+        jobs[job_id] = (user_id, role, stages)
+    db.session.commit()
+    return jobs
+
+
+def _brute_force(jobs, user_id, role=None):
+    reached = [0] * len(FUNNEL_STAGES)
+    days = [{} for _ in FUNNEL_STAGES]
+    for owner, job_role, stages in jobs.values():
+        if owner != user_id or (role and job_role != role):
+            continue
+        for rank in range(stages[-1][0] + 1):
+            reached[rank] += 1
+        for (_, previous), (rank, day) in zip(stages, stages[1:]):
+            gap = (day - previous).days
+            days[rank][gap] = days[rank].get(gap, 0) + 1
+    return reached, days
+
+
+@pytest.mark.parametrize("windows", [True, False], ids=["window-functions", "correlated-subqueries"])
+def test_conversion_funnel_matches_brute_force(tmp_path, monkeypatch, windows):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'funnel.db'}",
+                      "REFERENCE_CACHE_WARM": False})
+    monkeypatch.setattr(funnel, "supports_window_functions", lambda connection: windows)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([User(id=i, username=f"u{i}", email=f"u{i}@example.com", fullname="U", password_hash="x")
+                            for i in (1, 2)])
+        jobs = _seed_history(random.Random(17))
+
+        for user_id, role in ((1, None), (2, None), (1, "Data"), (2, "Engineering"), (1, "Missing")):
+            result = funnel.conversion_funnel(user_id, role)
+            reached, days = _brute_force(jobs, user_id, role)
+            assert [s["reached"] for s in result["stages"]] == reached
+            for rank, stage in enumerate(result["stages"]):
+                previous = reached[rank - 1] if rank else None
+                expected = round(reached[rank] / previous, 4) if previous else None
+                assert stage["conversion_from_previous"] == expected
+                if rank:
+                    assert stage["days_from_previous"] == {
+                        "median": nearest_rank(days[rank], 0.5),
+                        "p90": nearest_rank(days[rank], 0.9),
+                        "samples": sum(days[rank].values()),
+                    }
+            assert result["overall_conversion"] == (round(reached[3] / reached[0], 4) if reached[0] else None)
@@ -0,0 +1,81 @@
+from sqlalchemy import create_engine, text
+
+from history import compact_status_history
+from models import UserStatusDaily
+from rollup import rebuild_status_rollup, verify_status_rollup
+
+
+def _engine(url="sqlite://"):
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE job_status_history (
+                id INTEGER PRIMARY KEY, job_id INTEGER, status TEXT, status_date DATE, created_at DATETIME
+            )
+        """))
+    return engine
+
+def test_compaction_keeps_newest_row_per_status():
+    engine = _engine()
+    with engine.begin() as conn:
+        for job_id in range(1, 6):
+            for day in (1, 2, 3):
+                conn.execute(text("""
+                    INSERT INTO job_status_history (job_id, status, status_date)
+                    VALUES (:job_id, 'interview', :day)
+                """), {"job_id": job_id, "day": f"2024-01-0{day}"})
+        conn.execute(text("INSERT INTO job_status_history (job_id, status, status_date) VALUES (1, 'offer', '2024-02-01')"))
+
+    assert compact_status_history(engine, chunk_size=2) == 10
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT job_id, status, status_date FROM job_status_history ORDER BY job_id, status")).fetchall()
+    assert [tuple(r) for r in rows] == [(1, 'interview', '2024-01-03'), (1, 'offer', '2024-02-01')] + \
+        [(job_id, 'interview', '2024-01-03') for job_id in range(2, 6)]
+    assert compact_status_history(engine) == 0
+
+def test_compaction_keeps_the_daily_rollup_in_step():
+    engine = _engine()
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE job_application (id INTEGER PRIMARY KEY, user_id INTEGER)"))
+        conn.execute(text("INSERT INTO job_application (id, user_id) VALUES (1, 7), (2, 8)"))
+        UserStatusDaily.__table__.create(conn)
+        for job_id, day in ((1, 1), (1, 2), (1, 2), (2, 1), (2, 3)):
+            conn.execute(text("""
+                INSERT INTO job_status_history (job_id, status, status_date)
+                VALUES (:job_id, 'interview', :day)
+            """), {"job_id": job_id, "day": f"2024-01-0{day}"})
+        rebuild_status_rollup(conn)
+
+    assert compact_status_history(engine, chunk_size=1) == 3
+    with engine.connect() as conn:
+        assert verify_status_rollup(conn) == []
+        rollup = conn.execute(text("SELECT user_id, day, count FROM user_status_daily WHERE count != 0 "
+                                   "ORDER BY user_id")).fetchall()
+    assert [tuple(r) for r in rollup] == [(7, "2024-01-02", 1), (8, "2024-01-03", 1)]
+
+def test_compaction_on_empty_table():
+    assert compact_status_history(_engine()) == 0
+
+def test_status_history_migration_dedupes_in_committed_chunks(monkeypatch, tmp_path):
+    import migrations
+    from migrations import m0004_status_history_unique as m0004
+
+    engine = _engine(f"sqlite:///{tmp_path / 'history.db'}")
+    with engine.begin() as conn:
+        for job_id in (1, 1, 2, 2, 3):
+            conn.execute(text("INSERT INTO job_status_history (job_id, status, status_date) VALUES (:j, 'offer', '2024-01-01')"),
+                         {"j": job_id})
+    chunk_counts = []
+    def compact(engine, chunk_size):
+        chunk_counts.append(engine.pool.checkedout())
+        return compact_status_history(engine, chunk_size=1)
+    monkeypatch.setattr(m0004, "compact_status_history", compact)
+    monkeypatch.setattr(migrations, "MIGRATIONS", [m0004])
+
+    assert migrations.upgrade(engine) == [(4, "status_history_unique")]
+    # The dedupe ran with no versioned transaction open.
+    assert chunk_counts == [0]
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM job_status_history")).scalar() == 3
+        indexes = conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars().all()
+    assert "uq_job_status_history_job_status" in indexes
@@ -0,0 +1,58 @@
+import io
+from datetime import date
+
+import pytest
+
+from importer import iter_csv_records, iter_json_records, validate_record
+
+CATEGORIES = {"general": 100, "positive": 1}
+
+
+def test_json_records_are_parsed_incrementally():
+    body = b'[{"job_title": "A", "company": "B"} ,\n {"job_title": "C", "company": "D"}]'
+    records = list(iter_json_records(io.BytesIO(body), chunk_size=7))
+    assert [r["job_title"] for r in records] == ["A", "C"]
+
+@pytest.mark.parametrize("body", [b'{"job_title": "A"}', b'[{"job_title": "A"}, {'])
+def test_malformed_json_is_rejected(body):
+    with pytest.raises(ValueError):
+        list(iter_json_records(io.BytesIO(body)))
+
+def test_csv_records_use_header():
+    body = "﻿job_title,company,strengths\nA,B,x; y\n".encode()
+    assert list(iter_csv_records(io.BytesIO(body))) == [{"job_title": "A", "company": "B", "strengths": "x; y"}]
+
+def test_validate_record_normalises_values():
+    row, errors = validate_record({
+        "job_title": " Engineer ", "company": "Acme", "status": "Interview",
+        "applied_date": "2024-01-01", "offer_date": "2024-02-01",
+        "feedback_category": "Positive", "priority_strength": "Python", "strengths": "SQL; ;Go",
+        "improvements": ["Communication"]
+    }, CATEGORIES)
+    assert errors == []
+    assert row["job_title"] == "Engineer" and row["status"] == "interview"
+    assert row["applied_date"] == date(2024, 1, 1)
+    assert row["history"] == [("offer", date(2024, 2, 1))]
+    assert row["category_id"] == 1 and row["has_feedback"]
+    assert row["strengths"] == [(True, "Python"), (False, "SQL"), (False, "Go")]
+    assert row["improvements"] == [(False, "Communication")]
+
+def test_validate_record_reports_every_problem():
+    row, errors = validate_record({"company": "x" * 101, "status": "ghosted", "interview_date": "soon",
+                                   "feedback_category": "Unknown"}, CATEGORIES)
+    assert row is None
+    assert len(errors) == 5
+
+def test_insert_without_returning_reads_each_rows_id(integration_app, monkeypatch):
+    # The MySQL path: no executemany RETURNING, so ids come from each INSERT.
+    from extensions import db
+    from importer import _insert_returning_ids
+    from models import QuestionBank
+
+    with integration_app.app_context():
+        monkeypatch.setattr(db.engine.dialect, "insert_executemany_returning_sort_by_parameter_order", False)
+        texts = [f"Imported question {i}?" for i in range(3)]
+        ids = _insert_returning_ids(QuestionBank.__table__, [
+            {"question_text": t, "category": "General"} for t in texts])
+        assert [db.session.get(QuestionBank, i).question_text for i in ids] == texts
+        db.session.rollback()
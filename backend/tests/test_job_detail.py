@@ -0,0 +1,69 @@
+"""
+GET /api/jobs/<id> against the seeded integration database.
+"""
+import flask_jwt_extended as fj
+from sqlalchemy import create_engine, inspect, text
+
+from migrations import m0002_index_pack
+
+
+def test_include_expands_the_callers_job(integration_app, integration_client, integration_headers):
+    job_id = integration_app.config["INTEGRATION_JOB_IDS"][0]
+    integration_client.post(f"/api/jobs/{job_id}/interview-questions", headers=integration_headers,
+                            json=[{"question": "Bank question 1?", "answer": "Yes"},
+                                  {"question": "Why us?", "answer": "Because"}])
+
+    response = integration_client.get(
+        f"/api/jobs/{job_id}?include=feedback,strengths,improvements,questions,history",
+        headers=integration_headers)
+    assert response.status_code == 200
+    job = response.get_json()
+    assert job["feedback"]["notes"] == "Notes for job 0"
+    assert job["feedback"]["category_name"] == "Technical"
+    assert job["strengths"] == {"priority": "Python", "additional": ["SQL", "Teamwork"]}
+    assert job["improvements"] == {"priority": "Communication", "additional": ["Time management"]}
+    assert [(q["question"], q["answer"]) for q in job["interview_questions"]] == [
+        ("Bank question 1?", "Yes"), ("Why us?", "Because")]
+    assert [h["status"] for h in job["status_history"]][-1] == "interview"
+    assert job["interview_date"].startswith("2024-01-10")
+
+
+def test_include_without_feedback_leaves_it_out(integration_app, integration_client, integration_headers):
+    job_id = integration_app.config["INTEGRATION_JOB_IDS"][0]
+    job = integration_client.get(f"/api/jobs/{job_id}?include=strengths", headers=integration_headers).get_json()
+    assert "feedback" not in job
+    assert job["strengths"]["priority"] == "Python"
+
+    plain = integration_client.get(f"/api/jobs/{job_id}", headers=integration_headers).get_json()
+    assert plain["feedback"]["notes"] == "Notes for job 0"
+
+
+def test_other_users_get_404(integration_app, integration_client):
+    job_id = integration_app.config["INTEGRATION_JOB_IDS"][0]
+    with integration_app.app_context():
+        token = fj.create_access_token(identity="2")
+    headers = {"Authorization": f"Bearer {token}"}
+    for path in (f"/api/jobs/{job_id}", f"/api/jobs/{job_id}?include=feedback,history"):
+        assert integration_client.get(path, headers=headers).status_code == 404
+    assert integration_client.get(f"/api/jobs/{job_id}").status_code == 401
+
+
+def test_saving_questions_on_another_users_job_is_404(integration_app, integration_client):
+    job_id = integration_app.config["INTEGRATION_JOB_IDS"][1]
+    with integration_app.app_context():
+        token = fj.create_access_token(identity="2")
+    response = integration_client.post(f"/api/jobs/{job_id}/interview-questions",
+                                       headers={"Authorization": f"Bearer {token}"},
+                                       json=[{"question": "Planted?", "answer": "Yes"}])
+    assert response.status_code == 404
+    assert integration_client.get(f"/api/jobs/{job_id}/interview-questions",
+                                  headers=integration_app.config["INTEGRATION_HEADERS"]).get_json() == []
+
+
+def test_index_pack_renames_the_singular_interview_questions_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE job_interview_question (id INTEGER PRIMARY KEY, job_id INTEGER)"))
+        m0002_index_pack.rename_interview_questions_table(connection)
+        assert "job_interview_questions" in inspect(connection).get_table_names()
+        assert "job_interview_question" not in inspect(connection).get_table_names()
@@ -0,0 +1,54 @@
+"""
+Validation and atomicity of job writes against the seeded integration database.
+"""
+import pytest
+from sqlalchemy import text
+
+import routes.jobs
+from extensions import db
+
+TABLES = ["job_application", "feedback", "feedback_strength", "feedback_improvement", "job_status_history"]
+
+
+def _row_counts(app):
+    with app.app_context():
+        return {table: db.session.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar() for table in TABLES}
+
+
+def _payload(**overrides):
+    payload = {"job_title": "Analyst", "company": "Initech", "status": "interview",
+               "applied_date": "2024-03-01", "interview_date": "2024-03-05",
+               "feedback": {"category_id": 1, "notes": "Went well",
+                            "strengths": {"priority": "SQL", "additional": []},
+                            "improvements": {"priority": "Pace", "additional": []}}}
+    payload.update(overrides)
+    return payload
+
+
+@pytest.mark.parametrize("field", ["applied_date", "interview_date", "offer_date"])
+def test_malformed_dates_are_rejected_before_writing(field, integration_app, integration_client, integration_headers):
+    before = _row_counts(integration_app)
+    response = integration_client.post("/api/jobs", headers=integration_headers, json=_payload(**{field: "garbage"}))
+    assert response.status_code == 400
+    assert field in response.get_json()["message"]
+    assert _row_counts(integration_app) == before
+
+    job_id = integration_app.config["INTEGRATION_JOB_IDS"][2]
+    response = integration_client.put(f"/api/jobs/{job_id}", headers=integration_headers,
+                                      json=_payload(**{field: "garbage"}))
+    assert response.status_code == 400
+
+
+def test_failure_partway_through_create_leaves_nothing(integration_app, integration_client, integration_headers,
+                                                        monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("history write failed")
+
+    monkeypatch.setattr(routes.jobs, "upsert_status_history", fail)
+    before = _row_counts(integration_app)
+    dashboard = integration_client.get("/api/analytics/dashboard", headers=integration_headers).get_json()
+
+    response = integration_client.post("/api/jobs", headers=integration_headers, json=_payload())
+    assert response.status_code == 500
+    assert _row_counts(integration_app) == before
+    assert integration_client.get("/api/analytics/dashboard", headers=integration_headers).get_json() == dashboard
@@ -0,0 +1,48 @@
+import re
+
+import flask_jwt_extended as fj
+
+from app import create_app
+from extensions import db
+from models import User
+
+
+def _app(tmp_path):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'metrics.db'}", "TESTING": True,
+                      "METRICS_TOKEN": "scrape-token"})
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(username="m", email="m@example.com", fullname="M", password_hash="x"))
+        db.session.commit()
+        token = fj.create_access_token(identity="1")
+    return app, {"Authorization": f"Bearer {token}"}
+
+def test_server_timing_and_prometheus_output(tmp_path):
+    app, headers = _app(tmp_path)
+    client = app.test_client()
+    response = client.get("/api/analytics/dashboard", headers=headers)
+    assert response.status_code == 200
+    timing = response.headers.getlist("Server-Timing")
+    queries = int(re.search(r'desc="(\d+) queries"', timing[0]).group(1))
+    assert timing[0].startswith("db;dur=") and queries > 0
+    assert timing[1].startswith("app;dur=")
+    client.get("/api/analytics/dashboard", headers=headers)
+
+    body = client.get("/api/_metrics", headers={"Authorization": "Bearer scrape-token"}).get_data(as_text=True)
+    assert 'jam_http_requests_total{endpoint="analytics.get_dashboard",status="200"} 2' in body
+    # The cache hit only reads the user's generation.
+    assert f'jam_db_queries_total{{endpoint="analytics.get_dashboard"}} {queries + 1}' in body
+    assert 'jam_http_request_duration_seconds_bucket{endpoint="analytics.get_dashboard",le="+Inf"} 2' in body
+    assert 'jam_http_request_duration_seconds_count{endpoint="analytics.get_dashboard"} 2' in body
+    assert 'jam_response_cache_requests_total{endpoint="dashboard",result="hits"}' in body
+    assert "jam_db_pool_checkouts_total " in body
+
+def test_metrics_require_the_scrape_token(tmp_path):
+    app, headers = _app(tmp_path)
+    client = app.test_client()
+    assert client.get("/api/_metrics").status_code == 401
+    assert client.get("/api/_metrics", headers=headers).status_code == 401
+    assert client.get("/api/_metrics", headers={"Authorization": "Bearer scrape-token"}).status_code == 200
+
+    app.config["METRICS_TOKEN"] = None
+    assert client.get("/api/_metrics", headers={"Authorization": "Bearer scrape-token"}).status_code == 404
@@ -0,0 +1,45 @@
+"""
+GET /api/analytics/overview against the individual analytics endpoints, on the
+seeded integration database.
+"""
+import pytest
+
+from routes.analytics import OVERVIEW_SECTIONS
+
+SECTION_PATHS = {
+    'dashboard': "/api/analytics/dashboard",
+    'status_trends': "/api/analytics/status-trends",
+    'feedback_insights': "/api/analytics/feedback-insights",
+    'available_roles': "/api/analytics/available-roles",
+    'funnel': "/api/analytics/funnel",
+}
+
+
+@pytest.mark.parametrize("query", ["", "bucket=week&from=2024-01-01&to=2024-01-31&role=Engineering"])
+def test_each_section_matches_its_endpoint(query, integration_client, integration_headers):
+    overview = integration_client.get(f"/api/analytics/overview?{query}", headers=integration_headers)
+    assert overview.status_code == 200
+    overview = overview.get_json()
+    assert set(overview) == set(OVERVIEW_SECTIONS)
+    for section, path in SECTION_PATHS.items():
+        response = integration_client.get(f"{path}?{query}", headers=integration_headers)
+        assert response.status_code == 200
+        assert overview[section] == response.get_json(), section
+
+
+def test_sections_filter(integration_client, integration_headers):
+    response = integration_client.get("/api/analytics/overview?sections=funnel, available_roles",
+                                      headers=integration_headers)
+    assert response.status_code == 200
+    assert set(response.get_json()) == {"funnel", "available_roles"}
+
+    response = integration_client.get("/api/analytics/overview?sections=feedback_insights",
+                                      headers=integration_headers)
+    assert set(response.get_json()) == {"feedback_insights"}
+
+
+@pytest.mark.parametrize("sections", ["dashboard,salaries", ","])
+def test_unknown_or_empty_sections_are_rejected(sections, integration_client, integration_headers):
+    response = integration_client.get(f"/api/analytics/overview?sections={sections}", headers=integration_headers)
+    assert response.status_code == 400
+    assert "sections must be a subset of" in response.get_json()["message"]
@@ -0,0 +1,83 @@
+from datetime import date, datetime
+
+import flask_jwt_extended as fj
+import pytest
+from sqlalchemy import text
+
+from extensions import db
+from models import JobApplication, User
+from pagination import VALID_SORT_BY, InvalidCursor, decode_cursor, encode_cursor, keyset_clause
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("applied_date", "asc", date(2024, 3, 1), 42, "prev")
+    decoded = decode_cursor(cursor)
+    assert decoded == {
+        "sort_by": "applied_date",
+        "sort_order": "asc",
+        "value": date(2024, 3, 1),
+        "id": 42,
+        "direction": "prev"
+    }
+
+def test_cursor_null_sort_key():
+    decoded = decode_cursor(encode_cursor("applied_date", "desc", None, 7))
+    assert decoded["value"] is None
+    assert decoded["direction"] == "next"
+
+@pytest.mark.parametrize("cursor", ["zzz", "", encode_cursor("password_hash", "asc", "x", 1)])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+def test_keyset_clause_handles_nulls():
+    assert "IS NOT NULL" in keyset_clause("ja.applied_date", "asc", None)
+    assert "IS NULL" in keyset_clause("ja.applied_date", "desc", date(2024, 1, 1))
+    assert ":cursor_value" not in keyset_clause("ja.applied_date", "desc", None)
+
+
+PAGED_USER_ID = 3
+
+
+@pytest.fixture(scope="module")
+def paged_headers(integration_app):
+    """A user whose jobs repeat every sort value and leave some applied_date NULL."""
+    with integration_app.app_context():
+        db.session.add(User(id=PAGED_USER_ID, username="pages", email="pages@example.com", fullname="Pages",
+                            password_hash="x"))
+        created = [datetime(2024, 5, 1), datetime(2024, 5, 2)]
+        db.session.add_all([JobApplication(
+            user_id=PAGED_USER_ID, job_title=f"Title {i % 3}", company=f"Company {i % 2}",
+            applied_date=None if i % 4 == 0 else date(2024, 4, 1 + i % 3), created_at=created[i % 2],
+            status="applied") for i in range(13)])
+        db.session.commit()
+        token = fj.create_access_token(identity=str(PAGED_USER_ID))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _walk(client, headers, response, cursor_key):
+    """Follow `cursor_key` from `response`; returns the pages of job ids and the last response."""
+    pages = [[job["id"] for job in response["jobs"]]]
+    while response[cursor_key]:
+        response = client.get(f"/api/jobs?limit=4&cursor={response[cursor_key]}", headers=headers).get_json()
+        pages.append([job["id"] for job in response["jobs"]])
+    return pages, response
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("sort_by", VALID_SORT_BY)
+def test_cursor_pages_cover_every_row_once_both_ways(sort_by, sort_order, integration_app, integration_client,
+                                                     paged_headers):
+    first = integration_client.get(f"/api/jobs?pagination=cursor&limit=4&sort_by={sort_by}&sort_order={sort_order}",
+                                   headers=paged_headers).get_json()
+    forward, last = _walk(integration_client, paged_headers, first, "next_cursor")
+    seen = [job_id for page in forward for job_id in page]
+    with integration_app.app_context():
+        owned = set(db.session.execute(text("SELECT id FROM job_application WHERE user_id = :user_id"),
+                                       {"user_id": PAGED_USER_ID}).scalars())
+    assert len(seen) == len(set(seen)) == len(owned) == 13
+    assert set(seen) == owned
+
+    # Back from the last page, prev_cursor visits the same pages in reverse.
+    backward, _ = _walk(integration_client, paged_headers, last, "prev_cursor")
+    assert backward[::-1] == forward
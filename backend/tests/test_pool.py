@@ -0,0 +1,31 @@
+from sqlalchemy import text
+
+from app import create_app
+from config import Config
+from extensions import db
+from pool import InstrumentedQueuePool, engine_options
+
+
+def test_engine_options_from_config():
+    config = {key: getattr(Config, key) for key in dir(Config) if key.isupper()}
+    config.update(SQLALCHEMY_DATABASE_URI="mysql+pymysql://u:p@db/jam", DB_POOL_SIZE=3, DB_ISOLATION_LEVEL="READ COMMITTED")
+    options = engine_options(config)
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 3
+    assert options["isolation_level"] == "READ COMMITTED"
+    config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    assert "pool_size" not in engine_options(config)
+
+def test_app_pool_counts_checkouts(tmp_path):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'pool.db'}", "TESTING": True,
+                      "DB_POOL_SIZE": 2, "DB_MAX_OVERFLOW": 0, "REFERENCE_CACHE_WARM": False})
+    with app.app_context():
+        for _ in range(3):
+            with db.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        db.engine.dispose()
+    stats = app.extensions["pool_stats"]()
+    assert stats["size"] == 2
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 3
+    assert stats["timeouts"] == 0
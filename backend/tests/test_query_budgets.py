@@ -0,0 +1,109 @@
+"""
+Statement budgets for the real handlers against the seeded SQLite database from
+the integration fixtures. A handler that starts issuing a query per row (N+1)
+blows its budget here. Each budget includes the shared cache generation: one read
+on cached and paginated GETs, an update and a read after every write.
+"""
+import re
+
+import pytest
+
+from cache import configure_cache
+
+BUDGETS = [
+    ("/api/jobs", 3),
+    ("/api/jobs?search=Engineer", 4),
+    ("/api/jobs/{job}", 1),
+    ("/api/jobs/{job}?include=feedback,strengths,improvements,questions,history", 4),
+    ("/api/jobs/feedback-categories", 2),
+    ("/api/jobs/recommended-questions", 2),
+    ("/api/jobs/{job}/recommended-questions", 3),
+    ("/api/jobs/{job}/interview-questions", 1),
+    ("/api/jobs/{job}/status-history", 1),
+    ("/api/analytics/dashboard", 2),
+    ("/api/analytics/status-trends", 2),
+    ("/api/analytics/feedback-insights", 3),
+    ("/api/analytics/feedback-insights/details", 2),
+    ("/api/analytics/available-roles", 2),
+    ("/api/analytics/funnel", 2),
+    ("/api/analytics/overview", 5),
+]
+
+
+@pytest.fixture(autouse=True)
+def cold_response_cache(integration_app):
+    # Each budget is measured against the handler, not a cached response.
+    configure_cache(integration_app)
+
+
+@pytest.fixture
+def job_id(integration_app):
+    return integration_app.config["INTEGRATION_JOB_IDS"][0]
+
+
+@pytest.mark.parametrize("path,budget", BUDGETS)
+def test_get_budgets(path, budget, job_id, integration_client, integration_headers, assert_max_queries):
+    with assert_max_queries(budget):
+        response = integration_client.get(path.format(job=job_id), headers=integration_headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("count", [2, 20])
+def test_save_interview_questions_budget(count, job_id, integration_client, integration_headers, assert_max_queries):
+    questions = [{"question": f"Bank question {i % 10}?", "answer": f"a{i}"} if i % 2 else
+                 {"question": f"Custom question {i}", "answer": f"a{i}"} for i in range(count)]
+    integration_client.get("/api/jobs/recommended-questions", headers=integration_headers)
+    with assert_max_queries(6):
+        response = integration_client.post(f"/api/jobs/{job_id}/interview-questions",
+                                           headers=integration_headers, json=questions)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("count", [2, 20])
+def test_update_feedback_extras_budget(count, job_id, integration_client, integration_headers, assert_max_queries):
+    feedback = {
+        "category_id": 1, "notes": "Updated",
+        "strengths": {"priority": "Go", "additional": [f"Strength {count} {i}" for i in range(count)]},
+        "improvements": {"priority": "Testing", "additional": [f"Improvement {count} {i}" for i in range(count)]},
+    }
+    with assert_max_queries(18):
+        response = integration_client.put(f"/api/jobs/jobs/{job_id}/feedback",
+                                          headers=integration_headers, json=feedback)
+    assert response.status_code == 200
+    detail = integration_client.get(f"/api/jobs/{job_id}?include=strengths,improvements",
+                                    headers=integration_headers).get_json()
+    assert len(detail["strengths"]["additional"]) == count
+
+
+def test_update_job_budget(job_id, integration_client, integration_headers, assert_max_queries):
+    with assert_max_queries(8):
+        response = integration_client.put(f"/api/jobs/{job_id}", headers=integration_headers, json={
+            "job_title": "Engineer 0", "company": "Company 0", "status": "offer", "offer_date": "2024-02-01"})
+    assert response.status_code == 200
+
+
+def _extras_writes(statements):
+    return [s.split()[0].upper() + " " + re.search(r"feedback_(strength|improvement)", s).group(0)
+            for s in statements
+            if re.match(r"\s*(DELETE FROM|INSERT INTO) feedback_(strength|improvement)\b", s, re.IGNORECASE)]
+
+
+def test_update_feedback_extras_writes_only_the_difference(integration_app, integration_client, integration_headers,
+                                                          assert_max_queries):
+    job_id = integration_app.config["INTEGRATION_JOB_IDS"][3]
+    feedback = {
+        "category_id": 2, "notes": "Notes for job 3",
+        "strengths": {"priority": "Python", "additional": ["SQL", "Teamwork"]},
+        "improvements": {"priority": "Communication", "additional": ["Time management"]},
+    }
+    path = f"/api/jobs/jobs/{job_id}/feedback"
+    with assert_max_queries(100) as statements:
+        assert integration_client.put(path, headers=integration_headers, json=feedback).status_code == 200
+    assert _extras_writes(statements) == []
+
+    feedback["strengths"]["additional"] = ["SQL", "Leadership"]
+    with assert_max_queries(100) as statements:
+        assert integration_client.put(path, headers=integration_headers, json=feedback).status_code == 200
+    assert _extras_writes(statements) == ["DELETE feedback_strength", "INSERT feedback_strength"]
+    detail = integration_client.get(f"/api/jobs/{job_id}?include=strengths", headers=integration_headers).get_json()
+    assert detail["strengths"] == {"priority": "Python", "additional": ["SQL", "Leadership"]}
@@ -0,0 +1,123 @@
+"""
+Runs the real job and analytics handlers against a migrated SQLite database and
+checks EXPLAIN QUERY PLAN for every SELECT they issue: none may fall back to a
+full table scan of per-user data.
+"""
+import re
+
+import pytest
+import flask_jwt_extended as fj
+from flask import Flask
+from sqlalchemy import event
+
+import migrations
+from cache import configure_cache
+from extensions import db
+from models import User, FeedbackCategory
+from reference import configure_reference_cache
+from routes.auth import auth_bp
+from routes.jobs import jobs_bp
+from routes.analytics import analytics_bp
+
+# Small lookup tables that are read in full by design.
+REFERENCE_TABLES = {"feedback_category", "fc", "question_bank", "qb", "recommendation_rule",
+                    "reference_data_version", "sqlite_master"}
+# CTEs and derived tables: scanning these reads an already bounded intermediate result.
+INTERMEDIATE_RESULTS = {"user_jobs", "scoped", "strength_terms", "improvement_terms", "stages", "ordered"}
+
+ENDPOINTS = [
+    "/api/jobs",
+    "/api/jobs?search=engineer",
+    "/api/jobs?status=applied&sort_by=applied_date&sort_order=asc",
+    "/api/jobs?pagination=cursor&sort_by=company",
+    "/api/jobs/1",
+    "/api/jobs/1?include=feedback,strengths,improvements,questions,history",
+    "/api/jobs/1/feedback/strengths",
+    "/api/jobs/1/feedback/improvements",
+    "/api/jobs/1/status-history",
+    "/api/jobs/1/interview-questions",
+    "/api/jobs/1/recommended-questions",
+    "/api/jobs/export?format=ndjson",
+    "/api/analytics/dashboard",
+    "/api/analytics/status-trends",
+    "/api/analytics/feedback-insights",
+    "/api/analytics/feedback-insights?role=Engineering",
+    "/api/analytics/feedback-insights/details?limit=1",
+    "/api/analytics/feedback-insights/details?role=Engineering",
+    "/api/analytics/available-roles",
+    "/api/analytics/overview",
+    "/api/analytics/funnel",
+    "/api/analytics/funnel?role=Engineering",
+    "/api/analytics/overview?sections=available_roles,status_trends&bucket=week",
+]
+
+
+@pytest.fixture(scope="module")
+def plan_app(tmp_path_factory):
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}",
+        JWT_SECRET_KEY="query-plan-test-secret-key-0123456789",
+        TESTING=True,
+    )
+    db.init_app(app)
+    fj.JWTManager(app)
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
+    app.register_blueprint(analytics_bp, url_prefix='/api/analytics')
+    configure_cache(app)
+    configure_reference_cache(app, warm=False)
+
+    with app.app_context():
+        db.metadata.create_all(db.engine)
+        migrations.upgrade(db.engine)
+        db.session.add(User(username="plan", email="plan@example.com", fullname="Plan", password_hash="x"))
+        db.session.add(FeedbackCategory(id=100, name="General", type="neutral"))
+        db.session.commit()
+        token = fj.create_access_token(identity="1")
+
+    headers = {"Authorization": f"Bearer {token}"}
+    client = app.test_client()
+    client.post("/api/jobs", headers=headers, json={
+        "job_title": "Backend Engineer", "company": "Acme", "role_category": "Engineering",
+        "applied_date": "2024-01-01", "interview_date": "2024-01-10",
+        "feedback": {"category_id": 100, "notes": "Good",
+                     "strengths": {"priority": "Python", "additional": ["SQL"]},
+                     "improvements": {"priority": "Communication", "additional": []}}
+    })
+    return app, client, headers
+
+
+def _full_scans(connection, statement, parameters):
+    plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    scans = []
+    for row in plan:
+        detail = row[-1]
+        match = re.match(r"SCAN (\w+)", detail)
+        if (match and match.group(1) not in REFERENCE_TABLES | INTERMEDIATE_RESULTS
+                and "VIRTUAL TABLE" not in detail):
+            scans.append(detail)
+    return scans
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_endpoint_queries_use_indexes(plan_app, path):
+    app, client, headers = plan_app
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", capture)
+        try:
+            response = client.get(path, headers=headers)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", capture)
+        assert response.status_code == 200, response.get_json()
+        assert statements
+
+        with db.engine.connect() as connection:
+            for statement, parameters in statements:
+                assert _full_scans(connection, statement, parameters) == [], statement
@@ -0,0 +1,27 @@
+from recommendations import RuleMatcher
+
+
+def _rule(keyword, advice, weight=1.0, kind='improvement'):
+    return {"kind": kind, "keyword": keyword, "advice": advice, "weight": weight}
+
+def test_scores_every_term_by_weight_and_count():
+    matcher = RuleMatcher([
+        _rule('communication', 'speak'),
+        _rule('time', 'plan'),
+        _rule('time management', 'calendar', weight=2.0),
+        _rule('teamwork', 'lead a team', kind='strength'),
+    ])
+    terms = [('improvement', 'Communication skills', 3), ('improvement', 'Time  Management', 2),
+             ('improvement', 'overtime', 5), ('strength', 'Teamwork', 1), ('improvement', 'teamwork', 9)]
+    # "Time  Management" matches both overlapping rules; "overtime" matches nothing
+    assert matcher.score(terms) == {2: 4.0, 0: 3.0, 1: 2.0, 3: 1.0}
+    assert matcher.recommend(terms, limit=2) == ['calendar', 'speak']
+    assert matcher.recommend([('improvement', 'time', 1)]) == ['plan']
+
+def test_handles_many_rules():
+    matcher = RuleMatcher([_rule(f'skill{i}', f'advice {i}') for i in range(500)] + [_rule('', 'ignored')])
+    # Keywords match word prefixes, so skill4 is found in skill42 and skill420 too.
+    assert matcher.recommend([('improvement', 'needs skill42 and skill420', 1)]) == [
+        'advice 4', 'advice 42', 'advice 420']
+    assert matcher.recommend([('improvement', 'nothing relevant', 1)]) == []
+    assert RuleMatcher([]).recommend([('improvement', 'x', 1)]) == []
@@ -0,0 +1,100 @@
+import flask_jwt_extended as fj
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+import migrations
+from cache import configure_cache
+from extensions import db
+from models import FeedbackCategory, QuestionBank, RecommendationRule
+from reference import LOADERS, ReferenceCache, bump_reference_version, configure_reference_cache
+from routes.jobs import jobs_bp
+
+
+@pytest.fixture
+def ref_app(tmp_path):
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'reference.db'}",
+        JWT_SECRET_KEY="reference-test-secret-key-0123456789",
+        TESTING=True,
+    )
+    db.init_app(app)
+    fj.JWTManager(app)
+    app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
+    configure_cache(app)
+    configure_reference_cache(app, warm=False)
+    with app.app_context():
+        db.metadata.create_all(db.engine)
+        migrations.upgrade(db.engine)
+        db.session.add(FeedbackCategory(id=1, name="Technical", type="negative"))
+        db.session.add(QuestionBank(id=1, question_text="Why this company?", category="General"))
+        db.session.commit()
+        bump_reference_version(db.session.connection(), 'question_bank')
+        bump_reference_version(db.session.connection(), 'feedback_category')
+        db.session.commit()
+        yield app
+
+def test_reloads_only_after_version_bump(ref_app):
+    cache = ReferenceCache(LOADERS, check_interval=0)
+    statements = []
+    event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert cache.get('question_bank').index == {"why this company?": 1}
+    db.session.add(QuestionBank(id=2, question_text="Biggest  Win", category=None))
+    db.session.commit()
+    del statements[:]
+    assert len(cache.get('question_bank').data) == 1
+    assert all("question_bank" not in statement for statement in statements)
+    bump_reference_version(db.session.connection(), 'question_bank')
+    db.session.commit()
+    entry = cache.get('question_bank')
+    assert entry.index == {"why this company?": 1, "biggest win": 2}
+    assert entry.version == 3
+
+def test_rule_matcher_is_rebuilt_only_after_version_bump(ref_app):
+    cache = ReferenceCache(LOADERS, check_interval=0)
+    matcher = cache.get('recommendation_rule').index
+    db.session.add(RecommendationRule(kind='improvement', keyword='sql', advice='Practise SQL joins'))
+    db.session.commit()
+    assert cache.get('recommendation_rule').index is matcher
+    bump_reference_version(db.session.connection(), 'recommendation_rule')
+    db.session.commit()
+    matcher = cache.get('recommendation_rule').index
+    assert matcher.recommend([('improvement', 'SQL queries', 1)]) == ['Practise SQL joins']
+
+def test_etag_revalidation(ref_app):
+    client = ref_app.test_client()
+    headers = {"Authorization": f"Bearer {fj.create_access_token(identity='1')}"}
+    first = client.get("/api/jobs/feedback-categories", headers=headers)
+    assert first.status_code == 200
+    assert first.get_json() == [{"id": 1, "name": "Technical", "type": "negative"}]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    again = client.get("/api/jobs/feedback-categories", headers={**headers, "If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.data == b""
+
+def test_create_app_warms_a_cache_per_app(tmp_path):
+    from app import create_app
+
+    apps = []
+    for name in ("first", "second"):
+        url = f"sqlite:///{tmp_path / f'{name}.db'}"
+        setup = create_app({"SQLALCHEMY_DATABASE_URI": url, "REFERENCE_CACHE_WARM": False})
+        with setup.app_context():
+            db.create_all()
+            migrations.upgrade(db.engine)
+            db.session.add(QuestionBank(question_text=f"{name} question?", category=None))
+            db.session.commit()
+            bump_reference_version(db.session.connection(), 'question_bank')
+            db.session.commit()
+        apps.append(create_app({"SQLALCHEMY_DATABASE_URI": url}))
+
+    statements = []
+    for app in apps:
+        with app.app_context():
+            event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    for app, name in zip(apps, ("first", "second")):
+        with app.app_context():
+            assert [q["text"] for q in app.extensions['reference_cache'].get('question_bank').data] == [f"{name} question?"]
+    # Both were loaded in create_app; the lookups above read no tables.
+    assert statements == []
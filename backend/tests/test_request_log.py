@@ -0,0 +1,68 @@
+import json
+import logging
+
+import flask_jwt_extended as fj
+from flask_jwt_extended import view_decorators
+
+from app import create_app
+from extensions import db
+from request_log import configure_request_logging, stop_request_logging
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(json.loads(self.format(record)))
+
+
+def _app(tmp_path, **config):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'log.db'}", "TESTING": True, **config})
+    with app.app_context():
+        db.create_all()
+    handler = ListHandler()
+    configure_request_logging(app, handler)
+    return app, handler
+
+def test_one_line_per_request_without_decoding_tokens(tmp_path, monkeypatch):
+    app, handler = _app(tmp_path)
+    with app.app_context():
+        token = fj.create_access_token(identity="7")
+    decodes = []
+    decode_token = view_decorators.decode_token
+    monkeypatch.setattr(view_decorators, "decode_token", lambda *a: decodes.append(a) or decode_token(*a))
+    client = app.test_client()
+    client.get("/api/auth/current-user", headers={"Authorization": f"Bearer {token}"})
+    client.get("/api/jobs/feedback-categories")
+    stop_request_logging(app)
+    assert [(line["method"], line["route"], line["status"], line["user_id"]) for line in handler.lines] == [
+        ("GET", "/api/auth/current-user", 404, "7"),
+        ("GET", "/api/jobs/feedback-categories", 401, None),
+    ]
+    assert all(line["duration_ms"] >= 0 for line in handler.lines)
+    assert len(decodes) == 1
+
+def test_sampling_and_level_threshold(tmp_path):
+    app, handler = _app(tmp_path, REQUEST_LOG_SAMPLE_RATE=0.0)
+    client = app.test_client()
+    client.post("/api/auth/signup", json={})
+    client.get("/api/auth/current-user")
+    stop_request_logging(app)
+    assert [line["status"] for line in handler.lines] == [400, 401]
+
+    app, handler = _app(tmp_path, REQUEST_LOG_LEVEL="ERROR")
+    app.test_client().get("/api/auth/current-user")
+    stop_request_logging(app)
+    assert handler.lines == []
+
+def test_each_app_keeps_its_own_listener(tmp_path):
+    first, first_handler = _app(tmp_path)
+    second, second_handler = _app(tmp_path)
+    first.test_client().get("/api/auth/current-user")
+    second.test_client().get("/api/auth/current-user")
+    stop_request_logging(first)
+    stop_request_logging(second)
+    assert len(first_handler.lines) == 1
+    assert len(second_handler.lines) == 1
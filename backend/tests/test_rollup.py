@@ -0,0 +1,31 @@
+from datetime import date
+
+from sqlalchemy import create_engine, text
+
+from extensions import db
+from rollup import bucket_starts, default_trend_start, rebuild_status_rollup, verify_status_rollup
+
+
+def test_bucket_starts():
+    assert bucket_starts('day', date(2024, 2, 28), date(2024, 3, 1)) == [date(2024, 2, 28), date(2024, 2, 29), date(2024, 3, 1)]
+    assert bucket_starts('week', date(2024, 1, 5), date(2024, 1, 15)) == [date(2024, 1, 1), date(2024, 1, 8), date(2024, 1, 15)]
+    assert bucket_starts('month', date(2023, 11, 30), date(2024, 1, 1)) == [date(2023, 11, 1), date(2023, 12, 1), date(2024, 1, 1)]
+
+def test_default_range_has_fixed_size():
+    for bucket, points in (('day', 30), ('week', 26), ('month', 12)):
+        end = date(2024, 3, 31)
+        assert len(bucket_starts(bucket, default_trend_start(bucket, end), end)) == points
+
+def test_rebuild_then_verify_is_clean():
+    engine = create_engine("sqlite://")
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO user (id, username, email, fullname, password_hash) VALUES (1, 'u', 'u@x', 'U', 'x')"))
+        conn.execute(text("INSERT INTO job_application (id, user_id, job_title, company) VALUES (1, 1, 'a', 'b'), (2, 1, 'a', 'b')"))
+        conn.execute(text("""
+            INSERT INTO job_status_history (job_id, status, status_date)
+            VALUES (1, 'interview', '2024-01-03'), (2, 'interview', '2024-01-03'), (2, 'offer', NULL)
+        """))
+        assert verify_status_rollup(conn) == [(1, 'interview', date(2024, 1, 3), 0, 2)]
+        assert rebuild_status_rollup(conn) == 1
+        assert verify_status_rollup(conn) == []
@@ -0,0 +1,70 @@
+from sqlalchemy import create_engine, text
+
+from search import build_search_filter, create_search_index
+
+
+def _engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE job_application (
+                id INTEGER PRIMARY KEY, user_id INTEGER, job_title TEXT, company TEXT,
+                role_category TEXT, general_notes TEXT
+            )
+        """))
+    return engine
+
+def _search(conn, term):
+    search_filter = build_search_filter(conn, term)
+    rows = conn.execute(
+        text(f"SELECT ja.job_title FROM job_application ja WHERE {search_filter['where']} ORDER BY ja.id"),
+        search_filter["params"]
+    ).fetchall()
+    return [r[0] for r in rows]
+
+def test_falls_back_to_like_without_index():
+    engine = _engine()
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO job_application (job_title, company) VALUES ('Backend Engineer', 'Acme')"))
+        search_filter = build_search_filter(conn, "end")
+        assert search_filter["score"] is None
+        assert _search(conn, "end") == ["Backend Engineer"]
+
+def test_like_fallback_searches_the_indexed_columns():
+    engine = _engine()
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO job_application (job_title, company, role_category, general_notes) VALUES
+                ('Analyst', 'Acme', 'Data', 'remote'),
+                ('Designer', 'Initech', 'Design', 'referred by Dana')
+        """))
+        assert _search(conn, "Data") == ["Analyst"]
+        assert _search(conn, "Dana") == ["Designer"]
+
+def test_fts_index_stays_in_sync():
+    engine = _engine()
+    with engine.begin() as conn:
+        create_search_index(conn)
+        conn.execute(text("""
+            INSERT INTO job_application (job_title, company, role_category, general_notes)
+            VALUES ('Backend Engineer', 'Acme', 'Engineering', 'python'),
+                   ('Designer', 'Globex', 'Design', NULL)
+        """))
+        assert build_search_filter(conn, "pyth")["score"] is not None
+        assert _search(conn, "pyth") == ["Backend Engineer"]
+        assert _search(conn, "design") == ["Designer"]
+
+        conn.execute(text("UPDATE job_application SET general_notes = 'go' WHERE job_title = 'Backend Engineer'"))
+        assert _search(conn, "python") == []
+        conn.execute(text("DELETE FROM job_application WHERE job_title = 'Designer'"))
+        assert _search(conn, "design") == []
+
+def test_indexed_search_matches_word_prefixes_not_substrings():
+    engine = _engine()
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO job_application (job_title, company) VALUES ('Backend Engineer', 'Acme')"))
+        assert _search(conn, "gineer") == ["Backend Engineer"]
+        create_search_index(conn)
+        assert _search(conn, "engin") == ["Backend Engineer"]
+        assert _search(conn, "backend engineer") == ["Backend Engineer"]
+        assert _search(conn, "gineer") == []
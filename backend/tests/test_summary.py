@@ -0,0 +1,55 @@
+from sqlalchemy import create_engine, text
+
+from extensions import db
+from summary import feedback_change_deltas, job_deltas, rebuild_summary, status_change_deltas, verify_summary
+
+
+def _engine():
+    engine = create_engine("sqlite://")
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO user (id, username, email, fullname, password_hash) VALUES (1, 'u', 'u@x', 'U', 'x')"))
+        conn.execute(text("INSERT INTO feedback_category (id, name, type) VALUES (100, 'General', 'neutral')"))
+        conn.execute(text("""
+            INSERT INTO job_application (id, user_id, job_title, company, status)
+            VALUES (1, 1, 'a', 'b', 'applied'), (2, 1, 'a', 'b', 'offer'), (3, 1, 'a', 'b', 'offer')
+        """))
+        conn.execute(text("INSERT INTO feedback (job_id, category_id) VALUES (2, 100)"))
+    return engine
+
+def test_rebuild_then_verify_is_clean():
+    engine = _engine()
+    with engine.begin() as conn:
+        assert len(verify_summary(conn)) == 4
+        assert rebuild_summary(conn) == 4
+        assert verify_summary(conn) == []
+        rows = conn.execute(text("SELECT dimension, value, count FROM user_analytics_summary ORDER BY dimension, value"))
+        assert [tuple(r) for r in rows] == [
+            ('feedback_type', 'neutral', 1), ('status', 'applied', 1), ('status', 'offer', 2), ('total', '', 3)
+        ]
+
+def test_verify_reports_drift():
+    engine = _engine()
+    with engine.begin() as conn:
+        rebuild_summary(conn)
+        conn.execute(text("UPDATE user_analytics_summary SET count = 7 WHERE dimension = 'total'"))
+        assert verify_summary(conn) == [(1, 'total', '', 7, 3)]
+
+def test_deltas():
+    assert job_deltas('offer', 'positive', sign=-1) == {('total', ''): -1, ('status', 'offer'): -1, ('feedback_type', 'positive'): -1}
+    assert status_change_deltas('applied', 'applied') == {}
+    assert status_change_deltas('applied', 'offer') == {('status', 'applied'): -1, ('status', 'offer'): 1}
+    assert feedback_change_deltas(None, 'neutral') == {('feedback_type', 'neutral'): 1}
+    assert feedback_change_deltas('neutral', 'neutral') == {}
+
+def test_status_reads_lock_the_job_row_outside_sqlite(monkeypatch):
+    from types import SimpleNamespace
+
+    from app import create_app
+    from routes.jobs import _for_update_clause
+
+    app = create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://", "REFERENCE_CACHE_WARM": False})
+    with app.app_context():
+        assert _for_update_clause() == ""
+        monkeypatch.setattr(db.session, "get_bind", lambda: SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
+        assert _for_update_clause() == " FOR UPDATE"
@@ -0,0 +1,52 @@
+from sqlalchemy import create_engine, text
+
+from extensions import db
+from migrations import m0008_feedback_terms
+from terms import term_ids, term_key
+
+
+def _engine():
+    engine = create_engine("sqlite://")
+    db.metadata.create_all(engine)
+    return engine
+
+def test_term_ids_merge_spellings_and_reuse_rows():
+    engine = _engine()
+    with engine.begin() as conn:
+        ids = term_ids(conn, ["Communication", "communication ", "Time  management"])
+        assert set(ids) == {"communication", "time management"}
+        assert term_ids(conn, ["COMMUNICATION"]) == {"communication": ids["communication"]}
+        rows = conn.execute(text("SELECT normalized_text, label FROM feedback_term ORDER BY id"))
+        assert [tuple(r) for r in rows] == [("communication", "Communication"), ("time management", "Time  management")]
+    assert term_key("  Mixed\tCase ") == "mixed case"
+
+def test_migration_backfills_term_ids():
+    engine = _engine()
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO user (id, username, email, fullname, password_hash) VALUES (1, 'u', 'u@x', 'U', 'x')"))
+        conn.execute(text("INSERT INTO feedback_category (id, name, type) VALUES (100, 'General', 'neutral')"))
+        conn.execute(text("INSERT INTO job_application (id, user_id, job_title, company) VALUES (1, 1, 'a', 'b')"))
+        conn.execute(text("INSERT INTO feedback (id, job_id, category_id) VALUES (1, 1, 100)"))
+        conn.execute(text("""
+            INSERT INTO feedback_strength (feedback_id, is_priority, strength)
+            VALUES (1, 1, 'Teamwork'), (1, 0, 'teamwork'), (1, 0, 'Focus')
+        """))
+        m0008_feedback_terms.upgrade(conn)
+        rows = conn.execute(text("SELECT strength, term_id FROM feedback_strength ORDER BY id")).fetchall()
+        assert rows[0][1] == rows[1][1] != rows[2][1]
+        assert None not in {row[1] for row in rows}
+
+def test_term_keys_compare_like_the_binary_mysql_column():
+    from sqlalchemy.dialects import mysql
+    from sqlalchemy.schema import CreateTable
+
+    from models import FeedbackTerm
+
+    ddl = str(CreateTable(FeedbackTerm.__table__).compile(dialect=mysql.dialect()))
+    assert "normalized_text VARCHAR(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL" in ddl
+    # A cut at the column width never leaves a trailing space for PAD SPACE to fold.
+    assert term_key("x" * 254 + " tail") == "x" * 254
+    engine = _engine()
+    with engine.begin() as conn:
+        ids = term_ids(conn, ["café", "cafe", "x" * 254 + " tail"])
+    assert set(ids) == {"café", "cafe", "x" * 254}
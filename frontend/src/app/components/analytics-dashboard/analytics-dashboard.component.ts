@@ -5,6 +5,9 @@ import { CommonModule } from '@angular/common';
 import { RouterLink } from '@angular/router';
 Chart.register(...registerables);
 
+// Weekly status trend points shown on the dashboard, up to this week.
+const STATUS_TRENDS_WEEKS = 52;
+
 @Component({
   selector: 'app-analytics-dashboard',
   standalone: true,
@@ -29,28 +32,26 @@ export class AnalyticsDashboardComponent implements OnInit {
   constructor(private analyticsService: AnalyticsService) {}
 
   ngOnInit(): void {
-    this.analyticsService.getOverview().subscribe({
+    const to = new Date();
+    const from = new Date(to);
+    from.setDate(from.getDate() - 7 * (STATUS_TRENDS_WEEKS - 1));
+    this.analyticsService.getAnalyticsOverview(['dashboard', 'status_trends'], {
+      bucket: 'week', from: this.formatDate(from), to: this.formatDate(to)
+    }).subscribe({
       next: res => {
-        this.overview = res;
+        this.overview = res.dashboard;
+        this.statusTrends = res.status_trends;
         this.animateMetricValue(this.getCurrentMetricValue(), 2000);
-        setTimeout(() => this.renderStatusDistributionChart(), 0);
+        setTimeout(() => {
+          this.renderStatusDistributionChart();
+          this.renderStatusTrendsChart();
+        }, 0);
       },
       error: err => {
         this.errorMessage = 'Failed to load overview metrics';
         console.error(err);
       }
     });
-
-    this.analyticsService.getStatusTrends().subscribe({
-      next: res => {
-        this.statusTrends = res;
-        setTimeout(() => this.renderStatusTrendsChart(), 0);
-      },
-      error: err => {
-        this.errorMessage = 'Failed to load status trends';
-        console.error(err);
-      }
-    });
   }
 
   private formatDate(date: Date): string {
@@ -1,5 +1,6 @@
 import { ComponentFixture, TestBed } from '@angular/core/testing';
 import { HttpClientTestingModule } from '@angular/common/http/testing';
+import { RouterTestingModule } from '@angular/router/testing';
 
 import { FeedbackInsightsComponent } from './feedback-insights.component';
 
@@ -9,7 +10,7 @@ describe('FeedbackInsightsComponent', () => {
 
   beforeEach(async () => {
     await TestBed.configureTestingModule({
-      imports: [FeedbackInsightsComponent, HttpClientTestingModule]
+      imports: [FeedbackInsightsComponent, HttpClientTestingModule, RouterTestingModule]
     })
     .compileComponents();
 
@@ -5,8 +5,12 @@ import { saveAs } from 'file-saver';
 import { FormsModule } from '@angular/forms';
 import { CommonModule } from '@angular/common';
 import { RoleService } from '../../services/role.service';
+import { JobService } from '../../services/job.service';
 Chart.register(...registerables);
 
+// Largest page the feedback details endpoint serves.
+const EXPORT_PAGE_SIZE = 100;
+
 interface TopStrength {
   strength: string;
   count: number;
@@ -26,6 +30,8 @@ interface TopImprovement {
 })
 export class FeedbackInsightsComponent implements OnInit {
   feedbackInsights: any = {};
+  detailedFeedback: any[] = [];
+  detailsCursor: string | null = null;
   roles: string[] = [];
   selectedRole: string = '';
   errorMessage: string = '';
@@ -38,19 +44,20 @@ export class FeedbackInsightsComponent implements OnInit {
   private strengthsChart!: Chart;
   private improvementsChart!: Chart;
 
-  constructor(private analyticsService: AnalyticsService) {}
+  constructor(private analyticsService: AnalyticsService, private jobService: JobService) {}
 
   ngOnInit(): void {
-    this.analyticsService.getAvailableRoles().subscribe({
-      next: (roles: string[]) => {
-        this.roles = roles;
-        this.loadFeedbackInsights();
+    this.analyticsService.getAnalyticsOverview(['available_roles', 'feedback_insights']).subscribe({
+      next: res => {
+        this.roles = res.available_roles;
+        this.showFeedbackInsights(res.feedback_insights);
       },
       error: err => {
         console.error('Failed to load roles', err);
         this.errorMessage = 'Couldn’t load roles';
       }
     });
+    this.resetDetails();
   }
 
   onRoleChange(): void {
@@ -61,19 +68,44 @@ export class FeedbackInsightsComponent implements OnInit {
     this.analyticsService.getFeedbackInsightsByRole(
       this.selectedRole || undefined
     ).subscribe({
-      next: insights => {
-        this.feedbackInsights = insights;
-        setTimeout(() => {
-          this.renderCategoryChart();
-          this.renderStrengthsChart();
-          this.renderImprovementsChart();
-        }, 0);
-      },
+      next: insights => this.showFeedbackInsights(insights),
       error: err => {
         console.error('Failed to load feedback insights', err);
         this.errorMessage = 'Failed to load feedback insights';
       }
     });
+    this.resetDetails();
+  }
+
+  private showFeedbackInsights(insights: any): void {
+    this.feedbackInsights = insights;
+    setTimeout(() => {
+      this.renderCategoryChart();
+      this.renderStrengthsChart();
+      this.renderImprovementsChart();
+    }, 0);
+  }
+
+  private resetDetails(): void {
+    this.detailedFeedback = [];
+    this.detailsCursor = null;
+    this.loadMoreDetails();
+  }
+
+  loadMoreDetails(): void {
+    this.analyticsService.getFeedbackInsightDetails(
+      this.selectedRole || undefined,
+      this.detailsCursor || undefined
+    ).subscribe({
+      next: page => {
+        this.detailedFeedback = this.detailedFeedback.concat(page.items);
+        this.detailsCursor = page.next_cursor;
+      },
+      error: err => {
+        console.error('Failed to load detailed feedback', err);
+        this.errorMessage = 'Failed to load detailed feedback';
+      }
+    });
   }
 
 
@@ -184,16 +216,39 @@ export class FeedbackInsightsComponent implements OnInit {
   }
 
   exportData(): void {
+    this.collectDetails(this.selectedRole || undefined, undefined, []);
+  }
+
+  // Follows the details cursor to the last page, so the CSV is not limited to the rows loaded so far.
+  private collectDetails(role: string | undefined, cursor: string | undefined, entries: any[]): void {
+    this.analyticsService.getFeedbackInsightDetails(role, cursor, EXPORT_PAGE_SIZE).subscribe({
+      next: page => {
+        const collected = entries.concat(page.items);
+        if (page.next_cursor) {
+          this.collectDetails(role, page.next_cursor, collected);
+        } else {
+          this.saveDetailsCsv(collected);
+        }
+      },
+      error: err => {
+        console.error('Failed to export detailed feedback', err);
+        this.errorMessage = 'Couldn’t export detailed feedback';
+      }
+    });
+  }
+
+  private saveDetailsCsv(entries: any[]): void {
+    const quote = (value: string) => `"${(value ?? '').replace(/"/g, '""')}"`;
     const csvRows: string[] = [];
     const headers = ['Job Title', 'Company', 'Status', 'Feedback Summary', 'Detailed Feedback', 'Created At'];
     csvRows.push(headers.join(','));
-    (this.feedbackInsights.detailed_feedback || []).forEach((entry: any) => {
+    entries.forEach((entry: any) => {
       const row = [
-        `"${entry.job_title}"`,
-        `"${entry.company}"`,
+        quote(entry.job_title),
+        quote(entry.company),
         entry.status,
-        `"${this.getDisplayText(entry.notes, 'No summary')}"`,
-        `"${this.getDisplayText(entry.detailed_feedback, 'No details')}"`,
+        quote(this.getDisplayText(entry.notes, 'No summary')),
+        quote(this.getDisplayText(entry.detailed_feedback, 'No details')),
         entry.created_at
       ];
       csvRows.push(row.join(','));
@@ -203,6 +258,16 @@ export class FeedbackInsightsComponent implements OnInit {
     saveAs(blob, 'FeedbackInsights.csv');
   }
 
+  exportApplications(): void {
+    this.jobService.exportJobs('csv').subscribe({
+      next: (blob: Blob) => saveAs(blob, 'JobApplications.csv'),
+      error: err => {
+        console.error('Failed to export applications', err);
+        this.errorMessage = 'Couldn’t export your applications';
+      }
+    });
+  }
+
   isValidText(value: string | null | undefined): boolean {
     if (!value) return false;
     const trimmed = value.trim();
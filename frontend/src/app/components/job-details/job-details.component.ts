@@ -31,14 +31,14 @@ export class JobDetailsComponent {
   loadJobDetails(): void {
     const jobId = this.route.snapshot.paramMap.get('id');
     if (jobId) {
-      this.jobService.getJobById(+jobId).subscribe({
+      this.jobService.getJobDetails(+jobId).subscribe({
         next: (res) => {
           res.applied_date = res.applied_date ? this.formatDate(res.applied_date) : 'N/A';
           this.job = res;
-          this.loadFeedbackStrengths(+jobId);
-          this.loadFeedbackImprovements(+jobId);
-          this.loadInterviewQuestions(+jobId);
-          this.loadJobStatusHistory(+jobId);
+          this.feedbackStrengths = res.strengths;
+          this.feedbackImprovements = res.improvements;
+          this.interviewQuestions = res.interview_questions;
+          this.jobStatusHistory = res.status_history;
         },
         error: err => {
           console.error(err);
@@ -48,54 +48,6 @@ export class JobDetailsComponent {
     }
   }
 
-  loadFeedbackStrengths(jobId: number): void {
-    this.jobService.getFeedbackStrengths(jobId).subscribe({
-      next: (res) => {
-        this.feedbackStrengths = res;
-      },
-      error: err => {
-        console.error(err);
-        this.errorMessage = 'Error fetching feedback strengths';
-      }
-    });
-  }
-
-  loadFeedbackImprovements(jobId: number): void {
-    this.jobService.getFeedbackImprovements(jobId).subscribe({
-      next: (res) => {
-        this.feedbackImprovements = res;
-      },
-      error: err => {
-        console.error(err);
-        this.errorMessage = 'Error fetching feedback improvements';
-      }
-    });
-  }
-
-  loadInterviewQuestions(jobId: number): void {
-    this.jobService.getInterviewQAs(jobId).subscribe({
-      next: (res) => {
-        this.interviewQuestions = res;
-      },
-      error: err => {
-        console.error(err);
-        this.errorMessage = 'Error fetching interview questions';
-      }
-    });
-  }
-
-  loadJobStatusHistory(jobId: number): void {
-    this.jobService.getJobStatusHistory(jobId).subscribe({
-      next: (res) => {
-        this.jobStatusHistory = res;
-      },
-      error: err => {
-        console.error(err);
-        this.errorMessage = 'Error fetching job status history';
-      }
-    });
-  }
-
   getStatusDate(status: string): string {
     if (status === 'applied') {
       return this.job.applied_date ? this.job.applied_date : 'N/A';
@@ -21,8 +21,23 @@ export class AnalyticsService {
     return this.http.get(`${this.baseUrl}/dashboard`, { headers: this.getAuthHeaders() });
   }
 
-  getStatusTrends(): Observable<any> {
-    return this.http.get(`${this.baseUrl}/status-trends`, { headers: this.getAuthHeaders() });
+  getAnalyticsOverview(sections: string[], params: { [key: string]: string } = {}): Observable<any> {
+    let httpParams = new HttpParams().set('sections', sections.join(','));
+    Object.keys(params).forEach(key => {
+      httpParams = httpParams.set(key, params[key]);
+    });
+    return this.http.get(`${this.baseUrl}/overview`, { headers: this.getAuthHeaders(), params: httpParams });
+  }
+
+  getStatusTrends(bucket: 'day' | 'week' | 'month' = 'week', from?: string, to?: string): Observable<any> {
+    let params = new HttpParams().set('bucket', bucket);
+    if (from) {
+      params = params.set('from', from);
+    }
+    if (to) {
+      params = params.set('to', to);
+    }
+    return this.http.get(`${this.baseUrl}/status-trends`, { headers: this.getAuthHeaders(), params });
   }
 
   getFeedbackInsights(params?: any): Observable<any> {
@@ -51,6 +66,33 @@ export class AnalyticsService {
     );
   }
 
+  getFeedbackInsightDetails(role?: string, cursor?: string, limit?: number): Observable<any> {
+    const headers = this.getAuthHeaders();
+    let params = new HttpParams();
+    if (role) {
+      params = params.set('role', role);
+    }
+    if (cursor) {
+      params = params.set('cursor', cursor);
+    }
+    if (limit) {
+      params = params.set('limit', limit.toString());
+    }
+    return this.http.get(
+      `${this.baseUrl}/feedback-insights/details`,
+      { headers, params }
+    );
+  }
+
+  getFunnel(role?: string): Observable<any> {
+    const headers = this.getAuthHeaders();
+    let params = new HttpParams();
+    if (role) {
+      params = params.set('role', role);
+    }
+    return this.http.get(`${this.baseUrl}/funnel`, { headers, params });
+  }
+
   getAvailableRoles(): Observable<string[]> {
     const headers = this.getAuthHeaders();
     return this.http.get<string[]>(
@@ -59,6 +59,19 @@ describe('JobService', () => {
     req.flush({ id: 42 });
   });
 
+  it('should get a job with expanded sub-resources', () => {
+    service.getJobDetails(42, ['strengths', 'history']).subscribe();
+    const req = expectAuthHeader(`${baseUrl}/42?include=strengths%2Chistory`, 'GET');
+    req.flush({ id: 42, strengths: { priority: null, additional: [] }, status_history: [] });
+  });
+
+  it('should download the full export', () => {
+    service.exportJobs('ndjson').subscribe();
+    const req = expectAuthHeader(`${baseUrl}/export?format=ndjson`, 'GET');
+    expect(req.request.responseType).toBe('blob');
+    req.flush(new Blob(['{}\n']));
+  });
+
   it('should create a new job', () => {
     const payload = { job_title: 'T', company: 'C' };
     service.createJob(payload).subscribe();
@@ -47,6 +47,20 @@ export class JobService {
     return this.http.get<any>(`${this.baseUrl}/${jobId}`, { headers });
   }
 
+  getJobDetails(
+    jobId: number,
+    include: string[] = ['feedback', 'strengths', 'improvements', 'questions', 'history']
+  ): Observable<any> {
+    const headers = this.getAuthHeaders();
+    const params = include.length ? `?include=${encodeURIComponent(include.join(','))}` : '';
+    return this.http.get<any>(`${this.baseUrl}/${jobId}${params}`, { headers });
+  }
+
+  exportJobs(format: 'csv' | 'ndjson' = 'csv'): Observable<Blob> {
+    const headers = this.getAuthHeaders();
+    return this.http.get(`${this.baseUrl}/export?format=${format}`, { headers, responseType: 'blob' });
+  }
+
   createJob(jobData: any): Observable<any> {
     const headers = this.getAuthHeaders();
     return this.http.post<any>(`${this.baseUrl}`, jobData, { headers });